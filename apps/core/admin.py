@@ -1,7 +1,28 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from .models import User, InvestorProfile, StartupProfile, IndividualProfile, Deal
+from .jobs import notify_workers
+from .models import User, InvestorProfile, StartupProfile, IndividualProfile, Deal, Job
+from .search import search_ids
+
+
+class SearchIndexAdminMixin:
+    """Answer admin searches from the full-text index instead of ``icontains`` scans.
+
+    Index hits (public or not) are combined with the matches of the
+    admin's ``search_fields``, which cover the columns the index doesn't,
+    such as the owner's email and the location.
+    """
+    search_kind = ''
+    search_limit = 1000
+
+    def get_search_results(self, request, queryset, search_term):
+        matched, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            hits = search_ids(search_term, [self.search_kind], public_only=False, limit=self.search_limit)
+            matched = matched | queryset.filter(pk__in=[pk for _, pk, _ in hits])
+        return matched, may_have_duplicates
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
@@ -24,10 +45,11 @@ class InvestorProfileAdmin(admin.ModelAdmin):
     search_fields = ('company_name', 'user__email', 'location')
 
 @admin.register(StartupProfile)
-class StartupProfileAdmin(admin.ModelAdmin):
+class StartupProfileAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
     list_display = ('company_name', 'user', 'industry', 'stage', 'location', 'revenue_range', 'verified')
     list_filter = ('stage', 'verified', 'industry', 'revenue_range', 'location')
-    search_fields = ('company_name', 'user__email', 'industry', 'location')
+    search_fields = ('user__email', 'location')
+    search_kind = 'startup'
 
 @admin.register(IndividualProfile)
 class IndividualProfileAdmin(admin.ModelAdmin):
@@ -40,8 +62,21 @@ class IndividualProfileAdmin(admin.ModelAdmin):
     get_full_name.short_description = _('Full Name')
 
 @admin.register(Deal)
-class DealAdmin(admin.ModelAdmin):
+class DealAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'startup', 'deal_type', 'amount', 'status', 'created_at')
     list_filter = ('status', 'deal_type', 'created_at')
-    search_fields = ('title', 'startup__company_name', 'industry')
-    readonly_fields = ('amount_raised', 'number_of_investors', 'created_at', 'updated_at') 
\ No newline at end of file
+    search_fields = ('startup__company_name',)
+    search_kind = 'deal'
+    readonly_fields = ('amount_raised', 'number_of_investors', 'created_at', 'updated_at') 
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'created_at')
+    list_filter = ('status', 'name')
+    readonly_fields = ('locked_at', 'locked_by', 'last_error', 'created_at')
+    actions = ['retry_jobs']
+
+    @admin.action(description=_('Retry selected jobs now'))
+    def retry_jobs(self, request, queryset):
+        queryset.update(status='queued', attempts=0, run_at=timezone.now(), locked_at=None, locked_by='')
+        notify_workers()
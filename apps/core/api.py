@@ -0,0 +1,192 @@
+import hashlib
+from django.urls import path
+from django.db.models import QuerySet
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+from rest_framework import permissions, routers, views, viewsets
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from typing import Any, Optional
+from .models import Deal, InvestorProfile, StartupProfile
+from .page_cache import get_group_version
+from .pagination import InvalidCursor, KeysetPaginator
+from .search import KINDS, search
+from .serializers import DealSerializer, InvestorSerializer, StartupSerializer
+from .tags import filter_by_tags
+
+
+class KeysetCursorPagination(BasePagination):
+    """DRF pagination backed by ``KeysetPaginator``.
+
+    Pages are addressed with the same signed ``?cursor=`` tokens as the
+    HTML listings; ``?page_size=`` is honoured up to ``max_page_size``.
+
+    Attributes:
+        page_size (int): Default number of results per page
+        max_page_size (int): Upper bound for ``?page_size=``
+    """
+    page_size: int = 20
+    max_page_size: int = 100
+    cursor_query_param: str = 'cursor'
+    page_size_query_param: str = 'page_size'
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> list:
+        self.request = request
+        paginator = KeysetPaginator(queryset, self.get_page_size(request), view.ordering)
+        try:
+            self.page = paginator.page(request.query_params.get(self.cursor_query_param))
+        except InvalidCursor:
+            raise NotFound('Invalid cursor.')
+        return self.page.object_list
+
+    def get_link(self, cursor: Optional[str]) -> Optional[str]:
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response({
+            'next': self.get_link(self.page.next_cursor),
+            'previous': self.get_link(self.page.previous_cursor),
+            'results': data,
+        })
+
+
+class PublicReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
+    """Read-only, public endpoint over one of the listings.
+
+    Querysets load only the columns the selected serializer fields need.
+    Responses carry an ``ETag`` derived from the listing's page-cache
+    group version, so ``If-None-Match`` polls are answered with ``304``
+    before any database query runs.
+
+    Attributes:
+        ordering (str): Keyset ordering field, optionally prefixed with ``-``
+        page_cache_group (str): Page cache group whose version the ETag tracks
+        tag_filters (tuple): Query parameters filtered through the profile tags
+    """
+    permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetCursorPagination
+    ordering: str = '-id'
+    page_cache_group: str = ''
+    tag_filters: tuple = ()
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        # The ordering column is always loaded: the pagination cursors encode it.
+        columns = self.get_serializer_class().get_columns(self.request) + [self.ordering.lstrip('-')]
+        related = {column.split('__')[0] for column in columns if '__' in column}
+        if related:
+            queryset = queryset.select_related(*related)
+        queryset = queryset.only(*columns)
+        if self.tag_filters:
+            tags = {name: self.request.query_params.get(name, '') for name in self.tag_filters}
+            queryset = filter_by_tags(queryset, **tags)
+        return queryset
+
+    def get_etag(self, request: Request) -> str:
+        """Build the ETag for this request from the group version and the full URL."""
+        version = get_group_version(self.page_cache_group)
+        key = f'{self.page_cache_group}:{version}:{request.accepted_media_type}:{request.get_full_path()}'
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    def conditional(self, request: Request, handler, *args: Any, **kwargs: Any):
+        etag = self.get_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        patch_vary_headers(response, ('Accept',))
+        return response
+
+    def list(self, request: Request, *args: Any, **kwargs: Any):
+        return self.conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any):
+        return self.conditional(request, super().retrieve, *args, **kwargs)
+
+
+class DealViewSet(PublicReadOnlyViewSet):
+    """Active deals, newest first."""
+    queryset = Deal.objects.filter(status='active')
+    serializer_class = DealSerializer
+    ordering = '-created_at'
+    page_cache_group = 'deals'
+
+
+class StartupViewSet(PublicReadOnlyViewSet):
+    """Verified startups, newest first; filterable by ``?industry=`` and ``?stage=``."""
+    queryset = StartupProfile.objects.filter(verified=True)
+    serializer_class = StartupSerializer
+    ordering = '-founding_date'
+    page_cache_group = 'startups'
+    tag_filters = ('industry', 'stage')
+
+
+class InvestorViewSet(PublicReadOnlyViewSet):
+    """Verified investors, most active first; filterable by ``?industry=`` and ``?stage=``."""
+    queryset = InvestorProfile.objects.filter(verified=True)
+    serializer_class = InvestorSerializer
+    ordering = '-total_investments'
+    page_cache_group = 'investors'
+    tag_filters = ('industry', 'stage')
+
+
+class SearchAPIView(views.APIView):
+    """Ranked full-text search over verified startups and active deals.
+
+    ``?q=`` is the query, ``?type=startup|deal`` narrows it and
+    ``?limit=`` caps the results (at most 50).
+    """
+    permission_classes = [permissions.AllowAny]
+    max_limit: int = 50
+
+    def get(self, request: Request) -> Response:
+        query = request.query_params.get('q', '').strip()[:200]
+        kind = request.query_params.get('type', '')
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), self.max_limit)
+        except ValueError:
+            limit = 20
+        results = search(query, [kind] if kind in KINDS else None, limit=limit) if query else []
+        return Response({
+            'query': query,
+            'results': [
+                {
+                    'type': kind,
+                    'id': obj.pk,
+                    'title': obj.company_name if kind == 'startup' else obj.title,
+                    'url': request.build_absolute_uri(f'/api/{kind}s/{obj.pk}/'),
+                }
+                for kind, obj in results
+            ],
+        })
+
+
+class APIRootView(routers.APIRootView):
+    """Index of the public API endpoints."""
+    permission_classes = [permissions.AllowAny]
+
+
+router = routers.DefaultRouter()
+router.APIRootView = APIRootView
+router.register('deals', DealViewSet, basename='deal')
+router.register('startups', StartupViewSet, basename='startup')
+router.register('investors', InvestorViewSet, basename='investor')
+
+app_name = 'api'
+urlpatterns = router.urls + [
+    path('search/', SearchAPIView.as_view(), name='search'),
+]
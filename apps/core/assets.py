@@ -0,0 +1,247 @@
+"""Self-hosted front-end assets.
+
+``VENDOR_ASSETS`` pins the third-party files the templates use.
+``manage.py build_assets`` downloads them into ``static/vendor/``. It also
+self-hosts the Tajawal webfont and cuts Font Awesome down to the icons
+the templates and views reference. ``collectstatic`` then fingerprints and
+precompresses everything. Until the build has run, ``{% vendor_asset %}``
+falls back to the CDN copy, so a fresh checkout still renders.
+"""
+import mimetypes
+import os
+import re
+import urllib.parse
+import urllib.request
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import HttpRequest, HttpResponse
+from django.templatetags.static import static
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+from .serving import IMMUTABLE_CACHE_CONTROL, resolve_file, serve_file
+
+
+class VendorAsset(NamedTuple):
+    path: str
+    cdn_url: str
+
+
+FONTAWESOME_VERSION = '6.0.0'
+FONTAWESOME_URL = f'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/{FONTAWESOME_VERSION}'
+
+VENDOR_ASSETS = {
+    'bootstrap.css': VendorAsset(
+        'vendor/bootstrap/bootstrap.min.css',
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css',
+    ),
+    'bootstrap.rtl.css': VendorAsset(
+        'vendor/bootstrap/bootstrap.rtl.min.css',
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.rtl.min.css',
+    ),
+    'bootstrap.js': VendorAsset(
+        'vendor/bootstrap/bootstrap.bundle.min.js',
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js',
+    ),
+    'fontawesome.css': VendorAsset('vendor/fontawesome/css/icons.css', f'{FONTAWESOME_URL}/css/all.min.css'),
+    'tajawal.css': VendorAsset(
+        'vendor/tajawal/tajawal.css',
+        'https://fonts.googleapis.com/css2?family=Tajawal:wght@400;500;700&display=swap',
+    ),
+}
+
+# Google Fonts picks the font format from the User-Agent; this one gets WOFF2.
+WOFF2_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+)
+SOURCE_MAP_RE = re.compile(r'\n?/[*/]# sourceMappingURL=\S+(?: \*/)?')
+CSS_URL_RE = re.compile(r'url\((["\']?)([^)"\']+)\1\)')
+ICON_RULE_RE = re.compile(r'([^{}]+)\{content:"\\([0-9a-f]+)"\}')
+ICON_SELECTOR_RE = re.compile(r'^\.fa-([a-z0-9-]+):{1,2}before$')
+ICON_CLASS_RE = re.compile(r'\bfa-([a-z0-9-]+)')
+ICON_SOURCE_SUFFIXES = ('.html', '.py')
+
+
+@lru_cache(maxsize=None)
+def vendor_url(name: str) -> str:
+    """Return the URL of a vendored asset: local if built, else its CDN copy.
+
+    Args:
+        name (str): Key in ``VENDOR_ASSETS``
+
+    Returns:
+        str: The fingerprinted static URL, or the CDN URL
+    """
+    asset = VENDOR_ASSETS[name]
+    if finders.find(asset.path):
+        return static(asset.path)
+    return asset.cdn_url
+
+
+def fetch(url: str, user_agent: str = 'raya-build-assets') -> bytes:
+    request = urllib.request.Request(url, headers={'User-Agent': user_agent})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def write(root: str, path: str, content: bytes) -> None:
+    target = os.path.join(root, path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as handle:
+        handle.write(content)
+
+
+def strip_source_maps(content: bytes) -> bytes:
+    """Drop ``sourceMappingURL`` comments: the maps aren't vendored and the manifest storage would fail on them."""
+    return SOURCE_MAP_RE.sub('', content.decode()).encode()
+
+
+def vendor_bootstrap(root: str) -> None:
+    for name in ('bootstrap.css', 'bootstrap.rtl.css', 'bootstrap.js'):
+        asset = VENDOR_ASSETS[name]
+        write(root, asset.path, strip_source_maps(fetch(asset.cdn_url)))
+
+
+def vendor_tajawal(root: str) -> None:
+    """Download the Tajawal WOFF2 files and a stylesheet pointing at them."""
+    asset = VENDOR_ASSETS['tajawal.css']
+    css = fetch(asset.cdn_url, WOFF2_USER_AGENT).decode()
+    directory = os.path.dirname(asset.path)
+    local = {}
+    for _, url in CSS_URL_RE.findall(css):
+        if url not in local:
+            local[url] = f'tajawal-{len(local)}.woff2'
+            write(root, f'{directory}/{local[url]}', fetch(url))
+    css = CSS_URL_RE.sub(lambda match: f'url({local[match.group(2)]})', css)
+    write(root, asset.path, css.encode())
+
+
+def used_icons(source_dirs: Iterable[str]) -> set[str]:
+    """Return the ``fa-*`` class names used in templates and Python code, without the prefix.
+
+    Views pass some icon classes to the templates as strings, e.g. the
+    home page's features, so the Python sources are searched too.
+
+    Args:
+        source_dirs (Iterable[str]): Directories searched recursively for
+            ``.html`` and ``.py`` files
+
+    Returns:
+        set[str]: Icon names, e.g. ``'search-dollar'``
+    """
+    names = set()
+    for directory in source_dirs:
+        for base, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(ICON_SOURCE_SUFFIXES):
+                    with open(os.path.join(base, filename), encoding='utf-8') as handle:
+                        names.update(ICON_CLASS_RE.findall(handle.read()))
+    return names
+
+
+def subset_icon_css(css: str, icons: set[str]) -> tuple[str, set[int]]:
+    """Drop the rules of unused icons from the Font Awesome stylesheet.
+
+    Args:
+        css (str): ``all.min.css``
+        icons (set): Icon names in use
+
+    Returns:
+        tuple: The reduced stylesheet and the code points it still needs
+    """
+    codepoints = set()
+
+    def keep(match: re.Match) -> str:
+        selectors = [selector.strip() for selector in match.group(1).split(',')]
+        names = [ICON_SELECTOR_RE.match(selector) for selector in selectors]
+        if not all(names):
+            return match.group(0)
+        used = [selector for selector, name in zip(selectors, names) if name.group(1) in icons]
+        if not used:
+            return ''
+        codepoints.add(int(match.group(2), 16))
+        return f'{",".join(used)}{{content:"\\{match.group(2)}"}}'
+
+    css = ICON_RULE_RE.sub(keep, css)
+    # WOFF2 is supported everywhere Bootstrap 5 is; the TrueType fallbacks aren't vendored.
+    css = re.sub(r',\s*url\([^)]*\.ttf\)\s*format\("truetype"\)', '', css)
+    return css, codepoints
+
+
+def subset_font(content: bytes, codepoints: set[int]) -> bytes:
+    """Keep only ``codepoints`` in a WOFF2 font (needs ``fonttools`` and ``brotli``)."""
+    import io
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(io.BytesIO(content))
+    subsetter = subset.Subsetter(subset.Options(flavor='woff2', layout_features=['*']))
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    buffer = io.BytesIO()
+    font.flavor = 'woff2'
+    font.save(buffer)
+    return buffer.getvalue()
+
+
+def vendor_fontawesome(root: str, source_dirs: Iterable[str], subset_fonts: bool = True) -> dict:
+    """Write a Font Awesome stylesheet and webfonts limited to the icons in use.
+
+    Args:
+        root (str): Static directory to write into
+        source_dirs (Iterable[str]): Template and code directories searched by ``used_icons``
+        subset_fonts (bool): Cut the webfonts down to the glyphs in use
+
+    Returns:
+        dict: ``icons`` used, and whether the ``fonts`` were subset
+    """
+    asset = VENDOR_ASSETS['fontawesome.css']
+    icons = used_icons(source_dirs)
+    css, codepoints = subset_icon_css(fetch(asset.cdn_url).decode(), icons)
+    css_dir = os.path.dirname(asset.path)
+    for _, url in set(CSS_URL_RE.findall(css)):
+        font = fetch(urllib.parse.urljoin(asset.cdn_url, url))
+        if subset_fonts:
+            font = subset_font(font, codepoints)
+        write(root, os.path.normpath(f'{css_dir}/{url}'), font)
+    write(root, asset.path, strip_source_maps(css.encode()))
+    return {'icons': len(codepoints), 'fonts': subset_fonts}
+
+
+def serve_static(request: HttpRequest, path: str) -> HttpResponse:
+    """Serve a collected static file, preferring a precompressed sibling.
+
+    For deployments without a front-end server (``SERVE_STATIC``).
+    Fingerprinted names are cached for a year.
+
+    Args:
+        request (HttpRequest): The HTTP request object
+        path (str): Path of the file relative to ``STATIC_ROOT``
+
+    Returns:
+        HttpResponse: See ``serve_file``
+    """
+    full_path = resolve_file(settings.STATIC_ROOT, path)
+    content_type = mimetypes.guess_type(full_path)[0]
+    encoding = None
+    accepted = request.headers.get('Accept-Encoding', '')
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if candidate in accepted and os.path.isfile(full_path + suffix):
+            full_path, encoding = full_path + suffix, candidate
+            break
+    response = serve_file(request, full_path, content_type=content_type)
+    if encoding and response.status_code in (200, 206):
+        response['Content-Encoding'] = encoding
+    response['Vary'] = 'Accept-Encoding'
+    if path in fingerprinted_names():
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        response['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+
+@lru_cache(maxsize=None)
+def fingerprinted_names() -> frozenset:
+    """Return the content-hashed names listed in the static files manifest."""
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
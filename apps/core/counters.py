@@ -0,0 +1,115 @@
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Now
+from typing import Iterable
+from .models import Deal, InvestorProfile
+
+
+# Commitments carry no amount of their own, so each one counts as a ticket
+# of the deal's ``min_investment``.
+Commitment = Deal.committed_investors.through
+
+MONEY = DecimalField(max_digits=15, decimal_places=2)
+
+
+def lock_deals(deal_ids: Iterable[int], using: str = DEFAULT_DB_ALIAS) -> None:
+    """Lock deal rows until the current transaction ends.
+
+    Changes to a deal's commitments queue up on the deal's row: commitment
+    rows can't be locked before they exist. Whoever holds the lock re-reads
+    the commitments and sees exactly the rows its own insert or delete
+    changes. Rows are locked in primary key order, so transactions locking
+    overlapping deals can't deadlock.
+
+    Args:
+        deal_ids (Iterable[int]): Deals whose commitments are about to change
+        using (str): Database alias
+    """
+    deal_ids = sorted(set(deal_ids))
+    if deal_ids:
+        list(Deal.objects.using(using).select_for_update().filter(pk__in=deal_ids).order_by('pk').values_list('pk', flat=True))
+
+
+def apply_commitments(deal_ids: Iterable[int], investor_ids: Iterable[int], sign: int) -> None:
+    """Add (``sign=1``) or remove (``sign=-1``) commitments from the progress counters.
+
+    Every pair of ``deal_ids`` × ``investor_ids`` is one commitment. The
+    counters are updated in place with ``F()`` expressions, so concurrent
+    commitments never overwrite each other. ``updated_at`` is bumped too,
+    since ``update()`` bypasses ``auto_now`` and the cached cards key on it.
+
+    Args:
+        deal_ids (Iterable[int]): Deals gaining or losing the commitments
+        investor_ids (Iterable[int]): Investors gaining or losing the commitments
+        sign (int): ``1`` for new commitments, ``-1`` for withdrawn ones
+    """
+    deal_ids, investor_ids = list(deal_ids), list(investor_ids)
+    if not deal_ids or not investor_ids:
+        return
+    investors = len(investor_ids)
+    deals = len(deal_ids)
+    with transaction.atomic():
+        tickets = Deal.objects.filter(pk__in=deal_ids).aggregate(total=Sum('min_investment'))['total'] or 0
+        Deal.objects.filter(pk__in=deal_ids).update(
+            number_of_investors=F('number_of_investors') + sign * investors,
+            amount_raised=F('amount_raised') + sign * investors * F('min_investment'),
+            updated_at=Now(),
+        )
+        InvestorProfile.objects.filter(pk__in=investor_ids).update(
+            total_investments=F('total_investments') + sign * deals,
+            total_capital_deployed=F('total_capital_deployed') + sign * tickets,
+            updated_at=Now(),
+        )
+
+
+def _deal_totals() -> dict:
+    count = Commitment.objects.filter(deal=OuterRef('pk')).order_by().values('deal').annotate(
+        n=Count('*')).values('n')
+    number = Coalesce(Subquery(count), 0)
+    return {
+        'number_of_investors': number,
+        'amount_raised': number * F('min_investment'),
+    }
+
+
+def _investor_totals() -> dict:
+    commitments = Commitment.objects.filter(investorprofile=OuterRef('pk')).order_by().values('investorprofile')
+    return {
+        'total_investments': Coalesce(Subquery(commitments.annotate(n=Count('*')).values('n')), 0),
+        'total_capital_deployed': Coalesce(
+            Subquery(commitments.annotate(s=Sum('deal__min_investment')).values('s'), output_field=MONEY),
+            Value(0, output_field=MONEY),
+        ),
+    }
+
+
+def count_drift() -> dict[str, int]:
+    """Count the deals and investors whose counters disagree with their commitments.
+
+    Returns:
+        dict[str, int]: Drifted row counts keyed ``'deals'`` and ``'investors'``
+    """
+    deal_totals, investor_totals = _deal_totals(), _investor_totals()
+    deals = Deal.objects.annotate(
+        expected_investors=deal_totals['number_of_investors'],
+        expected_raised=deal_totals['amount_raised'],
+    ).filter(~Q(number_of_investors=F('expected_investors')) | ~Q(amount_raised=F('expected_raised')))
+    investors = InvestorProfile.objects.annotate(
+        expected_investments=investor_totals['total_investments'],
+        expected_capital=investor_totals['total_capital_deployed'],
+    ).filter(~Q(total_investments=F('expected_investments')) | ~Q(total_capital_deployed=F('expected_capital')))
+    return {'deals': deals.count(), 'investors': investors.count()}
+
+
+def reconcile_counters() -> dict[str, int]:
+    """Recompute every deal and investor counter from the commitments table.
+
+    Runs one set-based ``UPDATE`` per table inside a single transaction.
+
+    Returns:
+        dict[str, int]: Updated row counts keyed ``'deals'`` and ``'investors'``
+    """
+    with transaction.atomic():
+        deals = Deal.objects.update(**_deal_totals(), updated_at=Now())
+        investors = InvestorProfile.objects.update(**_investor_totals(), updated_at=Now())
+    return {'deals': deals, 'investors': investors}
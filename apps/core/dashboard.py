@@ -0,0 +1,177 @@
+"""Per-user dashboard data.
+
+``load_dashboard`` fetches everything the dashboard shows in a fixed
+number of queries, whatever the number of deals: the user with both
+profiles, the startup's deals, and the investor's interested and
+committed deals. The result is cached per user and dropped by the
+receivers in ``apps.core.signals`` whenever one of those rows changes.
+``load_recommended_deals`` adds the investor's best-matching deals, ranked
+and cached by ``apps.core.matching``.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Prefetch
+from typing import Any, Dict, Iterable
+from .matching import rank_deals_for_investor
+from .models import Deal, InvestorProfile, User
+from .routers import use_primary
+
+
+DASHBOARD_CACHE_PREFIX = 'core:dashboard'
+
+# Columns the dashboard's deal rows display
+DEAL_FIELDS = (
+    'title', 'status', 'amount', 'amount_raised', 'number_of_investors', 'target_close_date',
+    'created_at', 'startup_id',
+)
+
+
+def _cache_key(user_id: int) -> str:
+    return f'{DASHBOARD_CACHE_PREFIX}:{user_id}'
+
+
+def compute_dashboard(user_id: int) -> Dict[str, Any]:
+    """Run the dashboard queries for one user.
+
+    At most four queries: the user with both profiles, then one per deal
+    list of the profiles the user has.
+
+    Args:
+        user_id (int): Primary key of the user
+
+    Returns:
+        Dict[str, Any]: ``startup`` and ``investor`` profiles (or ``None``),
+        the startup's ``deals`` with an ``interested_count``, and the
+        investor's ``interested_deals`` and ``committed_deals``
+    """
+    limit = settings.DASHBOARD_LIST_LIMIT
+    startup_deals = (
+        Deal.objects.only(*DEAL_FIELDS)
+        .annotate(interested_count=Count('interested_investors'))
+        .order_by('-created_at', '-id')
+    )
+    investor_deals = (
+        Deal.objects.select_related('startup')
+        .only(*DEAL_FIELDS, 'startup__company_name')
+        .order_by('-created_at', '-id')
+    )
+    user = (
+        User.objects.select_related('startup_profile', 'investor_profile')
+        .prefetch_related(
+            Prefetch('startup_profile__deals', queryset=startup_deals[:limit], to_attr='dashboard_deals'),
+            Prefetch('investor_profile__interested_deals', queryset=investor_deals[:limit],
+                     to_attr='dashboard_interested'),
+            Prefetch('investor_profile__committed_deals', queryset=investor_deals[:limit],
+                     to_attr='dashboard_committed'),
+        )
+        .get(pk=user_id)
+    )
+    startup = getattr(user, 'startup_profile', None)
+    investor = getattr(user, 'investor_profile', None)
+    return {
+        'startup': startup,
+        'investor': investor,
+        'deals': startup.dashboard_deals if startup else [],
+        'interested_deals': investor.dashboard_interested if investor else [],
+        'committed_deals': investor.dashboard_committed if investor else [],
+    }
+
+
+def load_dashboard(user: User) -> Dict[str, Any]:
+    """Return the user's dashboard data from cache, computing it on a miss.
+
+    A miss reads from the primary: the entry was usually just invalidated
+    by a write that the replicas may not have yet.
+
+    Args:
+        user (User): The logged-in user
+
+    Returns:
+        Dict[str, Any]: See ``compute_dashboard``
+    """
+    key = _cache_key(user.pk)
+    data = cache.get(key)
+    if data is None:
+        with use_primary():
+            data = compute_dashboard(user.pk)
+        cache.set(key, data, timeout=settings.DASHBOARD_CACHE_TIMEOUT)
+    return data
+
+
+def load_recommended_deals(investor: InvestorProfile) -> list[Deal]:
+    """Return the active deals matching an investor's preferences best.
+
+    The ranking is cached by ``apps.core.matching``, so this is at most one
+    query for the deals shown.
+
+    Args:
+        investor (InvestorProfile): The logged-in user's investor profile
+
+    Returns:
+        list[Deal]: Up to ``DASHBOARD_LIST_LIMIT`` deals, best first, each
+        with its ``match_score`` between 0 and 1
+    """
+    ranking = rank_deals_for_investor(investor.pk, settings.DASHBOARD_LIST_LIMIT)
+    if not ranking:
+        return []
+    deals = (
+        Deal.objects.select_related('startup')
+        .only(*DEAL_FIELDS, 'startup__company_name')
+        .in_bulk([deal_id for deal_id, _ in ranking])
+    )
+    recommended = []
+    for deal_id, score in ranking:
+        if deal_id in deals:
+            deals[deal_id].match_score = score
+            recommended.append(deals[deal_id])
+    return recommended
+
+
+def users_showing_deals(deal_ids: Iterable[int]) -> set[int]:
+    """Return the users whose dashboards list any of the deals.
+
+    That is each deal's startup owner plus its interested and committed
+    investors, in one query.
+
+    Args:
+        deal_ids (Iterable[int]): Primary keys of the deals
+
+    Returns:
+        set[int]: User primary keys
+    """
+    deal_ids = list(deal_ids)
+    if not deal_ids:
+        return set()
+    owners = Deal.objects.filter(pk__in=deal_ids).values_list('startup__user_id', flat=True)
+    interested = Deal.interested_investors.through.objects.filter(deal_id__in=deal_ids)
+    committed = Deal.committed_investors.through.objects.filter(deal_id__in=deal_ids)
+    return set(owners.union(
+        interested.values_list('investorprofile__user_id', flat=True),
+        committed.values_list('investorprofile__user_id', flat=True),
+    ))
+
+
+def invalidate_dashboards(user_ids: Iterable[int]) -> None:
+    """Drop the cached dashboards of the given users.
+
+    Args:
+        user_ids (Iterable[int]): Primary keys of the users
+    """
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids])
+
+
+def schedule_dashboard_invalidation(user_ids: Iterable[int]) -> None:
+    """Invalidate the users' dashboards now and again once the transaction commits.
+
+    The second pass drops anything cached from the old rows while the
+    transaction was still open.
+
+    Args:
+        user_ids (Iterable[int]): Primary keys of the users
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    invalidate_dashboards(user_ids)
+    transaction.on_commit(lambda: invalidate_dashboards(user_ids))
@@ -1,6 +1,40 @@
 from django import forms
+from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
-from .models import IndividualProfile, InvestorProfile, StartupProfile, Deal, User
+from .models import IndividualProfile, InvestorProfile, StartupProfile, Deal, UploadSession, User
+
+
+class ChunkedUploadFormMixin:
+    """Let document fields take a finished chunked upload instead of a posted file.
+
+    Each field in ``chunked_upload_fields`` gets a hidden ``<field>_upload``
+    companion holding an upload id from ``/uploads/``; the file input stays
+    as a fallback for browsers without JavaScript.
+    """
+    chunked_upload_fields: tuple = ()
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user = user
+        self.uploads = {}
+        for name in self.chunked_upload_fields:
+            self.fields[name].widget.attrs['data-chunked-upload'] = reverse_lazy('uploads:create')
+            self.fields[f'{name}_upload'] = forms.UUIDField(required=False, widget=forms.HiddenInput)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for name in self.chunked_upload_fields:
+            upload_id = cleaned_data.get(f'{name}_upload')
+            if not upload_id:
+                continue
+            upload = UploadSession.objects.filter(pk=upload_id, user=self.user).exclude(name='').first()
+            if upload is None:
+                self.add_error(name, _('The upload is missing or unfinished. Please upload the file again.'))
+                continue
+            self.uploads[name] = upload
+            cleaned_data[name] = upload.name
+        return cleaned_data
+
 
 class SignupForm(forms.ModelForm):
     password1 = forms.CharField(
@@ -45,7 +79,9 @@ class InvestorForm(forms.ModelForm):
             'sectors_of_interest', 'linkedin_url', 'crunchbase_url'
         ]
 
-class StartupForm(forms.ModelForm):
+class StartupForm(ChunkedUploadFormMixin, forms.ModelForm):
+    chunked_upload_fields = ('pitch_deck',)
+
     class Meta:
         model = StartupProfile
         fields = [
@@ -95,7 +131,9 @@ class StartupForm(forms.ModelForm):
             'pitch_deck': forms.FileInput(attrs={'accept': '.pdf'})
         }
 
-class DealForm(forms.ModelForm):
+class DealForm(ChunkedUploadFormMixin, forms.ModelForm):
+    chunked_upload_fields = ('deal_documents',)
+
     class Meta:
         model = Deal
         fields = [
@@ -0,0 +1,34 @@
+"""Password hashers whose cost parameters come from settings.
+
+``PASSWORD_HASHER_PARAMS`` maps an algorithm to the hasher attributes to
+override, e.g. ``{'scrypt': {'work_factor': 2 ** 14}}``. Django rehashes a
+stored password on the next successful login when its algorithm isn't
+the first of ``PASSWORD_HASHERS`` or its parameters differ from the
+configured ones (``must_update``), so changing either migrates users
+transparently.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.exceptions import ImproperlyConfigured
+
+
+class TunedHasherMixin:
+    """Apply ``PASSWORD_HASHER_PARAMS[algorithm]`` to the hasher."""
+
+    def __init__(self) -> None:
+        for name, value in getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get(self.algorithm, {}).items():
+            if not hasattr(self, name):
+                raise ImproperlyConfigured(f'{self.algorithm} password hasher has no parameter {name!r}')
+            setattr(self, name, value)
+
+
+class Argon2PasswordHasher(TunedHasherMixin, hashers.Argon2PasswordHasher):
+    """Argon2id; needs ``argon2-cffi``."""
+
+
+class ScryptPasswordHasher(TunedHasherMixin, hashers.ScryptPasswordHasher):
+    """scrypt from the standard library."""
+
+
+class PBKDF2PasswordHasher(TunedHasherMixin, hashers.PBKDF2PasswordHasher):
+    """Django's default PBKDF2-SHA256, kept to verify and migrate older hashes."""
@@ -0,0 +1,82 @@
+"""Language resolution and per-language templates.
+
+The URL decides the language: ``/ar/...`` is Arabic, unprefixed paths
+are ``LANGUAGE_CODE`` (``i18n_patterns`` with
+``prefix_default_language=False``). ``LanguageMiddleware`` reads it once
+per request from the path, activates it and stores it on
+``request.LANGUAGE_CODE``; nothing redirects to add or change a prefix.
+The language switcher links straight to the current page's URL in the
+other language (``{% translated_url %}``).
+
+Templates are named once, in the default language. ``VariantLoader``
+returns ``name_<language>.html`` in its place when the active language
+has such a variant, e.g. ``core/deals_list_ar.html`` for
+``core/deals_list.html``, and falls back to the named template.
+"""
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.template import TemplateDoesNotExist
+from django.template.loaders import cached
+from django.utils import translation
+from django.utils.deprecation import MiddlewareMixin
+from typing import Any, Dict, Optional
+
+
+def variant_name(template_name: str, language: Optional[str]) -> Optional[str]:
+    """Return the name of the ``language`` variant of a template, if it could have one.
+
+    Args:
+        template_name (str): Template name, e.g. ``'core/deals_list.html'``
+        language (str, optional): Language code, e.g. ``'ar'``
+
+    Returns:
+        str: e.g. ``'core/deals_list_ar.html'``, or ``None`` for the default
+        language and non-HTML templates
+    """
+    if not language or language == settings.LANGUAGE_CODE or not template_name.endswith('.html'):
+        return None
+    return f'{template_name[:-len(".html")]}_{language}.html'
+
+
+class VariantLoader(cached.Loader):
+    """Cached template loader that prefers the active language's variant of each template.
+
+    Lookups of both names are cached, so a missing variant costs a dict
+    lookup after the first request.
+    """
+
+    def get_template(self, template_name: str, skip: Optional[list] = None):
+        variant = variant_name(template_name, translation.get_language())
+        if variant is not None:
+            try:
+                return super().get_template(variant, skip)
+            except TemplateDoesNotExist:
+                pass
+        return super().get_template(template_name, skip)
+
+
+class LanguageMiddleware(MiddlewareMixin):
+    """Activate the language named by the URL prefix, or ``LANGUAGE_CODE`` without one."""
+
+    def process_request(self, request: HttpRequest) -> None:
+        language = translation.get_language_from_path(request.path_info) or settings.LANGUAGE_CODE
+        translation.activate(language)
+        request.LANGUAGE_CODE = language
+
+    def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        response.headers.setdefault('Content-Language', translation.get_language())
+        return response
+
+
+def language(request: HttpRequest) -> Dict[str, Any]:
+    """Context processor: the request's language and the languages to switch to.
+
+    Returns:
+        Dict[str, Any]: ``current_language`` (also as ``LANGUAGE_CODE``) and ``languages``
+    """
+    current = getattr(request, 'LANGUAGE_CODE', None) or translation.get_language()
+    return {
+        'current_language': current,
+        'LANGUAGE_CODE': current,
+        'languages': settings.LANGUAGES,
+    }
@@ -0,0 +1,79 @@
+"""Responsive variants of uploaded profile images.
+
+Each upload is decoded once, in a background job, and re-encoded as WebP
+and JPEG at the fixed widths in ``VARIANT_WIDTHS``. The files are written
+to the content-addressed image store, so their names change whenever
+their bytes do and can be cached forever. The resulting names and sizes
+are kept on ``User.profile_image_variants`` and rendered with the
+``responsive_image`` template tag.
+"""
+import io
+from django.core.files.base import ContentFile
+from typing import Any, Optional
+from .storage import image_storage
+
+# Variant name -> width in pixels. Heights keep the original aspect ratio,
+# so every variant can serve the same <img> through ``srcset``.
+VARIANT_WIDTHS = {
+    'thumb': 160,
+    'card': 480,
+    'hero': 1200,
+}
+# Pillow format -> (file extension, encoder options)
+VARIANT_FORMATS = {
+    'WEBP': ('webp', {'quality': 80, 'method': 6}),
+    'JPEG': ('jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def build_variants(source: Any, name: str) -> dict:
+    """Encode every variant of an image and store them.
+
+    Widths larger than the original are capped to it, so small uploads are
+    never upscaled.
+
+    Args:
+        source: An open image file
+        name (str): Storage name of the original, recorded as ``source``
+
+    Returns:
+        dict: ``{'source', 'width', 'height', 'variants': {name: {'width', 'height', 'webp', 'jpg'}}}``
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        image = image.convert('RGB')
+    variants = {}
+    for variant, width in VARIANT_WIDTHS.items():
+        width = min(width, image.width)
+        height = max(round(image.height * width / image.width), 1)
+        resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+        entry = {'width': width, 'height': height}
+        for format, (extension, options) in VARIANT_FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, format, **options)
+            entry[extension] = image_storage.save(f'{variant}.{extension}', ContentFile(buffer.getvalue()))
+        variants[variant] = entry
+    return {'source': name, 'width': image.width, 'height': image.height, 'variants': variants}
+
+
+def variant_srcset(variants: dict, extension: str) -> str:
+    """Return a ``srcset`` listing each distinct width of one format.
+
+    Args:
+        variants (dict): The ``variants`` mapping built by ``build_variants``
+        extension (str): ``'webp'`` or ``'jpg'``
+
+    Returns:
+        str: ``"<url> <width>w, ..."`` from narrowest to widest
+    """
+    widths = {entry['width']: entry[extension] for entry in variants.values()}
+    return ', '.join(f'{image_storage.url(name)} {width}w' for width, name in sorted(widths.items()))
+
+
+def pick_variant(data: Optional[dict], variant: str) -> Optional[dict]:
+    """Return one variant of a ``profile_image_variants`` value, or ``None`` if there are none yet."""
+    if not data:
+        return None
+    return data.get('variants', {}).get(variant)
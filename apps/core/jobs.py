@@ -0,0 +1,363 @@
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+import weakref
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from typing import Any, Callable, Optional
+from .models import Job
+from .routers import use_primary
+
+
+logger = logging.getLogger(__name__)
+
+TASKS: dict[str, 'Task'] = {}
+
+# The JobBatch of each database alias waiting for its commit hook, per thread.
+_pending = threading.local()
+
+
+class Task:
+    """A function registered to run in the background.
+
+    Attributes:
+        func (Callable): The function, called with the job's keyword arguments
+        name (str): Registry name stored on queued jobs
+        max_attempts (int): Runs before the job is marked failed
+    """
+
+    def __init__(self, func: Callable, name: str, max_attempts: Optional[int] = None) -> None:
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts or settings.JOBS_MAX_ATTEMPTS
+
+    def __call__(self, **kwargs: Any) -> Any:
+        return self.func(**kwargs)
+
+    def delay(self, dedupe: bool = False, **kwargs: Any) -> Optional[Job]:
+        """Queue the task with JSON-serialisable keyword arguments.
+
+        Args:
+            dedupe (bool): Skip queueing if an identical job is already waiting
+            **kwargs: Arguments for the task
+
+        Returns:
+            Job: The queued job, or ``None`` when run immediately or deduplicated
+        """
+        return enqueue(self, kwargs, dedupe=dedupe)
+
+    def defer(self, **kwargs: Any) -> None:
+        """Queue the task in the current transaction's batch, stored as one job after commit.
+
+        List arguments of calls that agree on everything else are merged,
+        e.g. ``investor_ids`` of several saves.
+
+        Args:
+            **kwargs: Arguments for the task
+        """
+        defer(self, kwargs)
+
+
+def task(name: Optional[str] = None, max_attempts: Optional[int] = None) -> Callable[[Callable], Task]:
+    """Register a function as a background task.
+
+    Args:
+        name (str, optional): Registry name; defaults to the function's qualified name
+        max_attempts (int, optional): Runs before giving up; defaults to ``JOBS_MAX_ATTEMPTS``
+
+    Returns:
+        Callable: Decorator returning the ``Task``
+    """
+    def register(func: Callable) -> Task:
+        registered = Task(func, name or f'{func.__module__}.{func.__qualname__}', max_attempts)
+        TASKS[registered.name] = registered
+        return registered
+    return register
+
+
+def _dedupe_key(kwargs: dict) -> str:
+    return repr(sorted(kwargs.items()))
+
+
+def enqueue(task: Task, kwargs: dict, dedupe: bool = False) -> Optional[Job]:
+    """Queue a task to run after the current transaction commits.
+
+    The job row is written in the caller's transaction, so it is only
+    visible to workers if the work that triggered it commits. In
+    ``immediate`` mode nothing is stored and the task runs inline once
+    the transaction commits.
+
+    Args:
+        task (Task): The registered task
+        kwargs (dict): Arguments for the task
+        dedupe (bool): Skip queueing if an identical job is already waiting
+
+    Returns:
+        Job: The queued job, or ``None`` when run immediately or deduplicated
+    """
+    if settings.JOBS_MODE == 'immediate':
+        def run_inline() -> None:
+            with use_primary():
+                task(**kwargs)
+
+        transaction.on_commit(run_inline)
+        return None
+
+    key = _dedupe_key(kwargs) if dedupe else ''
+    if dedupe and Job.objects.filter(name=task.name, dedupe_key=key, status='queued').exists():
+        return None
+    job = Job.objects.create(name=task.name, kwargs=kwargs, dedupe_key=key, max_attempts=task.max_attempts)
+    notify_workers()
+    return job
+
+
+class JobBatch:
+    """Task calls deferred in one transaction, queued together once it commits.
+
+    Attributes:
+        using (str): Alias of the database whose transaction the batch follows
+        calls (dict): Keyword arguments per task name and non-list arguments
+    """
+
+    def __init__(self, using: str) -> None:
+        self.using = using
+        self.calls: dict[tuple[str, str], dict] = {}
+
+    def add(self, task: Task, kwargs: dict) -> None:
+        """Add a call, merging its list arguments into an earlier call that matches otherwise."""
+        scalars = {name: value for name, value in kwargs.items() if not isinstance(value, (list, tuple))}
+        merged = self.calls.setdefault((task.name, _dedupe_key(scalars)), dict(scalars))
+        for name, values in kwargs.items():
+            if name not in scalars:
+                merged[name] = list(dict.fromkeys([*merged.get(name, ()), *values]))
+
+    def flush(self) -> None:
+        """Run the calls inline (``immediate`` mode) or store them as a single job."""
+        pending = _pending_batches()
+        if pending.get(self.using) is self:
+            del pending[self.using]
+        calls = [[name, kwargs] for (name, _), kwargs in self.calls.items()]
+        self.calls = {}
+        if not calls:
+            return
+        if settings.JOBS_MODE == 'immediate':
+            with use_primary():
+                run_batch(calls=calls)
+            return
+        if len(calls) == 1:
+            name, kwargs = calls[0]
+        else:
+            name, kwargs = run_batch.name, {'calls': calls}
+        Job.objects.create(name=name, kwargs=kwargs, max_attempts=TASKS[name].max_attempts)
+        notify_workers()
+
+
+def _pending_batches() -> weakref.WeakValueDictionary:
+    if not hasattr(_pending, 'batches'):
+        _pending.batches = weakref.WeakValueDictionary()
+    return _pending.batches
+
+
+def defer(task: Task, kwargs: dict, using: Optional[str] = None) -> None:
+    """Add a task call to the current transaction's ``JobBatch``.
+
+    The batch is written by a single ``INSERT`` once the outermost
+    transaction commits, so the follow-up work of every save in it costs
+    the request one query. Outside a transaction the call is queued at
+    once, as its own job.
+
+    Only the batch's commit hook holds on to it. When a rollback discards
+    the hook, the batch and its calls go with it, and the next call starts
+    a new batch.
+
+    Args:
+        task (Task): The registered task
+        kwargs (dict): Arguments for the task
+        using (str, optional): Database alias; defaults to the default database
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        batch = JobBatch(connection.alias)
+        batch.add(task, kwargs)
+        batch.flush()
+        return
+    pending = _pending_batches()
+    batch = pending.get(connection.alias)
+    if batch is None:
+        batch = pending[connection.alias] = JobBatch(connection.alias)
+        transaction.on_commit(batch.flush, using=connection.alias)
+    batch.add(task, kwargs)
+
+
+@task(name='run_batch')
+def run_batch(calls: list) -> None:
+    """Run the task calls of a ``JobBatch`` in order; a retry runs them all again.
+
+    Args:
+        calls (list): ``[task name, keyword arguments]`` pairs
+    """
+    for name, kwargs in calls:
+        TASKS[name](**kwargs)
+
+
+def notify_workers() -> None:
+    """Wake the in-process worker once the current transaction commits (``thread`` mode)."""
+    if settings.JOBS_MODE == 'thread':
+        transaction.on_commit(thread_worker.wake)
+
+
+def retry_delay(attempts: int) -> float:
+    """Return the backoff before retry number ``attempts``, with jitter.
+
+    Args:
+        attempts (int): Runs so far
+
+    Returns:
+        float: Seconds to wait
+    """
+    delay = min(settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1), settings.JOBS_MAX_RETRY_DELAY)
+    return delay * random.uniform(0.5, 1.5)
+
+
+def release_stale_jobs() -> int:
+    """Requeue jobs whose worker died mid-run.
+
+    Returns:
+        int: Number of jobs requeued
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT)
+    return Job.objects.filter(status='running', locked_at__lt=cutoff).update(
+        status='queued', locked_at=None, locked_by='',
+    )
+
+
+def claim_next(worker_id: str) -> Optional[Job]:
+    """Claim the next due job for this worker.
+
+    Claiming is a conditional ``UPDATE`` on the job's status, so two
+    workers racing for the same row can't both win it.
+
+    Args:
+        worker_id (str): Identifies the claiming worker
+
+    Returns:
+        Job: The claimed job, or ``None`` if nothing is due
+    """
+    while True:
+        job = Job.objects.filter(status='queued', run_at__lte=timezone.now()).order_by('run_at', 'pk').first()
+        if job is None:
+            return None
+        claimed = Job.objects.filter(pk=job.pk, status='queued').update(
+            status='running', locked_at=timezone.now(), locked_by=worker_id, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def run_job(job: Job) -> bool:
+    """Run a claimed job, then delete it or schedule its retry.
+
+    Args:
+        job (Job): A job claimed by ``claim_next``
+
+    Returns:
+        bool: True if the task succeeded
+    """
+    registered = TASKS.get(job.name)
+    try:
+        if registered is None:
+            raise LookupError(f'Unknown task {job.name}')
+        # Jobs follow writes, so they read from the primary rather than a lagging replica.
+        with use_primary():
+            registered(**job.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts or registered is None:
+            logger.error('Job %s (%s) failed permanently:\n%s', job.pk, job.name, error)
+            Job.objects.filter(pk=job.pk).update(status='failed', last_error=error, locked_at=None)
+        else:
+            run_at = timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+            logger.warning('Job %s (%s) failed, retrying at %s', job.pk, job.name, run_at)
+            Job.objects.filter(pk=job.pk).update(
+                status='queued', run_at=run_at, last_error=error, locked_at=None, locked_by='',
+            )
+        return False
+    Job.objects.filter(pk=job.pk).delete()
+    return True
+
+
+def run_pending(worker_id: Optional[str] = None, limit: Optional[int] = None) -> int:
+    """Run due jobs until none are left or ``limit`` is reached.
+
+    Args:
+        worker_id (str, optional): Identifies this worker; defaults to host and pid
+        limit (int, optional): Maximum number of jobs to run
+
+    Returns:
+        int: Number of jobs run
+    """
+    worker_id = worker_id or default_worker_id()
+    release_stale_jobs()
+    count = 0
+    while limit is None or count < limit:
+        job = claim_next(worker_id)
+        if job is None:
+            break
+        run_job(job)
+        count += 1
+    return count
+
+
+def next_due_in() -> Optional[float]:
+    """Return seconds until the next queued job is due, or ``None`` if the queue is empty."""
+    run_at = Job.objects.filter(status='queued').order_by('run_at').values_list('run_at', flat=True).first()
+    if run_at is None:
+        return None
+    return max((run_at - timezone.now()).total_seconds(), 0.0)
+
+
+def default_worker_id() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+
+
+class ThreadWorker:
+    """Drain the queue from a daemon thread inside the web process (``thread`` mode).
+
+    Jobs stay durable in the database, so anything this thread doesn't
+    finish is picked up by the next wake-up or by ``run_jobs``.
+    """
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+
+    def wake(self) -> None:
+        """Start the thread if needed and have it look for due jobs."""
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.loop, name='raya-jobs', daemon=True)
+                self.thread.start()
+        self.event.set()
+
+    def loop(self) -> None:
+        while True:
+            self.event.clear()
+            close_old_connections()
+            try:
+                run_pending()
+                timeout = next_due_in()
+            except Exception:
+                logger.exception('Background job thread failed')
+                timeout = settings.JOBS_POLL_INTERVAL
+            self.event.wait(timeout)
+
+
+thread_worker = ThreadWorker()
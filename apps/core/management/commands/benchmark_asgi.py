@@ -0,0 +1,135 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+DEFAULT_PATHS = ['/', '/deals/', '/startups/', '/investors/']
+
+
+def summarize(mode, latencies, elapsed):
+    latencies = sorted(latencies)
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'mode': mode,
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'rps': len(latencies) / elapsed,
+        'p50': quantiles[49] * 1000,
+        'p95': quantiles[94] * 1000,
+        'p99': quantiles[98] * 1000,
+    }
+
+
+def check(path, response):
+    if response.status_code != 200:
+        raise CommandError(f'GET {path} returned {response.status_code}')
+
+
+def run_sync(paths, total, concurrency):
+    """Drive the WSGI handler from a thread pool, like a threaded WSGI server."""
+    local = threading.local()
+
+    def request(i):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = Client()
+        path = paths[i % len(paths)]
+        started = time.perf_counter()
+        response = client.get(path)
+        elapsed = time.perf_counter() - started
+        check(path, response)
+        return elapsed
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(request, range(len(paths) * concurrency)))  # warm up
+        started = time.perf_counter()
+        latencies = list(pool.map(request, range(total)))
+    return summarize('sync', latencies, time.perf_counter() - started)
+
+
+def run_async(paths, total, concurrency):
+    """Drive the ASGI handler with ``concurrency`` requests in flight."""
+    client = AsyncClient()
+
+    async def request(i, slots):
+        path = paths[i % len(paths)]
+        async with slots:
+            started = time.perf_counter()
+            response = await client.get(path)
+            elapsed = time.perf_counter() - started
+        check(path, response)
+        return elapsed
+
+    async def run(count):
+        slots = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(request(i, slots) for i in range(count)))
+
+    async def main():
+        await run(len(paths) * concurrency)  # warm up
+        started = time.perf_counter()
+        latencies = await run(total)
+        return summarize('async', latencies, time.perf_counter() - started)
+
+    return asyncio.run(main())
+
+
+class Command(BaseCommand):
+    help = 'Compares sync WSGI and async ASGI throughput of the public pages on the current dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Timed requests per mode')
+        parser.add_argument('--concurrency', type=int, default=16, help='Requests in flight')
+        parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS)
+        parser.add_argument('--page-cache', action='store_true',
+                            help='Keep the anonymous page cache on (measures cache hits only)')
+        parser.add_argument('--mode', choices=['sync', 'async'],
+                            help='Run one mode in this process and print JSON (used internally)')
+
+    def run_mode(self, mode, options):
+        # Each mode runs in a fresh process: the URLconf picks sync or async
+        # views from ASYNC_VIEWS at import time.
+        command = [
+            sys.executable, '-m', 'django', 'benchmark_asgi', '--mode', mode,
+            '--requests', str(options['requests']), '--concurrency', str(options['concurrency']),
+            '--paths', *options['paths'],
+        ]
+        if options['page_cache']:
+            command.append('--page-cache')
+        env = dict(os.environ, ASYNC_VIEWS='1' if mode == 'async' else '0')
+        env.setdefault('DJANGO_SETTINGS_MODULE', os.environ.get('DJANGO_SETTINGS_MODULE', 'raya.settings'))
+        result = subprocess.run(command, env=env, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        if result.returncode:
+            raise CommandError(f'{mode} run failed:\n{result.stderr}')
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        if options['mode']:
+            settings.DEBUG = False
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+            settings.PAGE_CACHE_ENABLED = options['page_cache']
+            run = run_sync if options['mode'] == 'sync' else run_async
+            result = run(options['paths'], options['requests'], options['concurrency'])
+            self.stdout.write(json.dumps(result))
+            return
+
+        self.stdout.write(
+            f"{options['requests']} requests over {', '.join(options['paths'])} "
+            f"at concurrency {options['concurrency']}"
+        )
+        results = [self.run_mode(mode, options) for mode in ('sync', 'async')]
+        self.stdout.write(f"{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:<8}{result['rps']:>10.1f}{result['p50']:>10.1f}"
+                f"{result['p95']:>10.1f}{result['p99']:>10.1f}"
+            )
+        sync, async_ = results
+        self.stdout.write(f"async/sync throughput: {async_['rps'] / sync['rps']:.2f}x")
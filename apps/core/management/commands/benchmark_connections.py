@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from apps.core.profiling import percentiles
+import time
+
+
+class Command(BaseCommand):
+    help = 'Measures per-request database connection overhead with and without persistent connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Simulated requests per mode')
+        parser.add_argument('--database', default='default', help='Database alias to measure')
+        parser.add_argument('--max-age', type=int, default=60, help='CONN_MAX_AGE of the persistent mode')
+
+    def run_mode(self, connection, max_age, requests):
+        """Simulate ``requests`` request cycles that each run one query."""
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        opened = 0
+
+        def count(sender, connection, **kwargs):
+            nonlocal opened
+            opened += 1
+
+        connection_created.connect(count, weak=False)
+        latencies = []
+        try:
+            for _ in range(requests):
+                started = time.perf_counter()
+                # The signals Django sends around each request: close_old_connections()
+                # runs on both and closes the connection unless it may persist.
+                request_started.send(sender=self.__class__)
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+                request_finished.send(sender=self.__class__)
+                latencies.append(time.perf_counter() - started)
+        finally:
+            connection_created.disconnect(count)
+            connection.close()
+        return {'opened': opened, 'total': sum(latencies), **percentiles(latencies)}
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        original = connection.settings_dict['CONN_MAX_AGE']
+        requests = options['requests']
+        self.stdout.write(f'{requests:,} simulated requests on {connection.vendor} ({options["database"]})')
+        try:
+            results = {
+                'per-request': self.run_mode(connection, 0, requests),
+                'persistent': self.run_mode(connection, options['max_age'], requests),
+            }
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'] = original
+
+        self.stdout.write(f"{'mode':<14}{'connects':>10}{'mean us':>10}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}")
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode:<14}{result['opened']:>10,}{result['total'] / requests * 1e6:>10.1f}"
+                f"{result['p50'] * 1000:>10.1f}{result['p95'] * 1000:>10.1f}{result['p99'] * 1000:>10.1f}"
+            )
+        saved = (results['per-request']['total'] - results['persistent']['total']) / requests
+        self.stdout.write(self.style.SUCCESS(f'Connection setup removed: {saved * 1e6:.1f} us per request'))
@@ -0,0 +1,34 @@
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+from apps.core.profiling import percentiles
+import time
+
+
+class Command(BaseCommand):
+    help = 'Times each configured password hasher with its PASSWORD_HASHER_PARAMS, to tune the costs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=10, help='Hashes timed per hasher')
+
+    def handle(self, *args, **options):
+        rounds = options['rounds']
+        self.stdout.write(f"{'hasher':<16}{'p50 ms':>9}{'p95 ms':>9}  parameters")
+        for index, hasher in enumerate(get_hashers()):
+            try:
+                hasher.encode('warm-up', hasher.salt())
+            except ValueError as error:
+                # A hasher whose library isn't installed
+                self.stdout.write(f'{hasher.algorithm:<16}  skipped: {error}')
+                continue
+            durations = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                hasher.encode('correct horse battery staple', hasher.salt())
+                durations.append(time.perf_counter() - started)
+            result = percentiles(durations)
+            summary = hasher.safe_summary(hasher.encode('x', hasher.salt()))
+            parameters = ', '.join(f'{key}={value}' for key, value in summary.items()
+                                   if key not in ('algorithm', 'salt', 'hash'))
+            label = f'{hasher.algorithm}{" *" if index == 0 else ""}'
+            self.stdout.write(f"{label:<16}{result['p50']:>9.1f}{result['p95']:>9.1f}  {parameters}")
+        self.stdout.write('* hashes new passwords; the others are rehashed with it on the next login')
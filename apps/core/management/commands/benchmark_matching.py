@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from apps.core.matching import ANY_STAGE_MASK, STAGE_BITS, MatchIndex
+import numpy as np
+import time
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks investor/deal match scoring on a synthetic index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--investors', type=int, default=10_000)
+        parser.add_argument('--deals', type=int, default=100_000)
+        parser.add_argument('--industries', type=int, default=40)
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--chunk-size', type=int, default=256)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        investors, deals = options['investors'], options['deals']
+
+        index = MatchIndex()
+        for i in range(options['industries']):
+            index.industry_bit(f'industry-{i}')
+        words = index.investor_industries.shape[1]
+        vocabulary = len(index.industries)
+
+        index.investor_ids = np.arange(1, investors + 1, dtype=np.int64)
+        index.investor_industries = np.zeros((investors, words), dtype=np.uint64)
+        for _ in range(3):
+            bits = rng.integers(1, vocabulary, size=investors)
+            np.bitwise_or.at(
+                index.investor_industries,
+                (np.arange(investors), bits // 64),
+                np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64)),
+            )
+        stage_bits = rng.integers(1, len(STAGE_BITS), size=(investors, 2)).astype(np.uint64)
+        index.investor_stages = (np.uint64(1) << stage_bits[:, 0]) | (np.uint64(1) << stage_bits[:, 1])
+        index.investor_stages[rng.random(investors) < 0.05] = ANY_STAGE_MASK
+        index.investor_min = rng.uniform(5e4, 5e5, size=investors)
+        index.investor_max = index.investor_min + rng.uniform(5e5, 5e6, size=investors)
+
+        index.deal_ids = np.arange(1, deals + 1, dtype=np.int64)
+        index.deal_industries = rng.integers(1, vocabulary, size=deals)
+        index.deal_stages = rng.integers(1, len(STAGE_BITS), size=deals)
+        index.deal_min = rng.uniform(2.5e4, 1e5, size=deals)
+        index.deal_max = rng.uniform(5e5, 5e6, size=deals)
+        index._reindex()
+
+        started = time.perf_counter()
+        index.deals_for_investor(1, options['limit'])
+        single_investor = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index.investors_for_deal(1, options['limit'])
+        single_deal = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index.top_deals_for_all(options['limit'], chunk_size=options['chunk_size'])
+        full = time.perf_counter() - started
+
+        self.stdout.write(f'Deals for one investor ({deals:,} deals): {single_investor * 1000:.1f} ms')
+        self.stdout.write(f'Investors for one deal ({investors:,} investors): {single_deal * 1000:.1f} ms')
+        self.stdout.write(self.style.SUCCESS(
+            f'Top {options["limit"]} deals for every investor ({investors:,} x {deals:,}): {full:.2f} s'
+        ))
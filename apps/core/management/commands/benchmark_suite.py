@@ -0,0 +1,309 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import translation
+from apps.core.models import StartupProfile
+from apps.core.profiling import percentiles
+import json
+import logging
+import os
+import platform
+import re
+import socket
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.error
+import urllib.request
+import django
+
+# URL name -> who requests it: None for anonymous visitors, or a user type
+# whose first generated user is logged in.
+ENDPOINTS = {
+    'core:home': None,
+    'core:deals_list': None,
+    'core:startups_list': None,
+    'core:investors_list': None,
+    'core:dashboard': 'startup',
+    'core:signup': None,
+    'core:create_deal': 'startup',
+}
+
+# populate_db row counts at scale 1
+BASE_COUNTS = {'investors': 10, 'startups': 20, 'individuals': 15}
+
+QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+# Requests traced with tracemalloc per endpoint; tracing slows requests
+# down, so it runs apart from the timed requests.
+MEMORY_SAMPLES = 5
+
+
+class ClientDriver:
+    """Requests through the Django test client, in this thread."""
+
+    def __init__(self):
+        self.clients = {}
+
+    def login(self, role, user):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        self.clients[role] = client
+
+    def get(self, role, path):
+        response = self.clients[role].get(path)
+        return response.status_code, response.get('Server-Timing', '')
+
+    def close(self):
+        pass
+
+
+class ServerDriver:
+    """Requests over HTTP to a WSGI or ASGI server running in a thread of this process."""
+
+    def __init__(self, kind):
+        self.cookies = {}
+        self.server = None
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            self.port = probe.getsockname()[1]
+        if kind == 'wsgi':
+            self.start_wsgi()
+        else:
+            self.start_asgi()
+        self.wait_until_listening()
+
+    def start_wsgi(self):
+        from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+        from django.core.wsgi import get_wsgi_application
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadedWSGIServer(('127.0.0.1', self.port), QuietHandler, allow_reuse_address=False)
+        self.server.set_app(get_wsgi_application())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def start_asgi(self):
+        try:
+            import uvicorn
+        except ImportError:
+            raise CommandError('--server asgi needs uvicorn (pip install uvicorn)')
+        from django.core.asgi import get_asgi_application
+
+        config = uvicorn.Config(get_asgi_application(), host='127.0.0.1', port=self.port, log_level='warning')
+        self.server = uvicorn.Server(config)
+        threading.Thread(target=self.server.run, daemon=True).start()
+
+    def wait_until_listening(self):
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.05)
+        raise CommandError('The benchmark server did not start')
+
+    def login(self, role, user):
+        client = Client()
+        if user is None:
+            self.cookies[role] = ''
+            return
+        client.force_login(user)
+        self.cookies[role] = '; '.join(f'{key}={morsel.value}' for key, morsel in client.cookies.items())
+
+    def get(self, role, path):
+        request = urllib.request.Request(f'http://127.0.0.1:{self.port}{path}', headers={'Cookie': self.cookies[role]})
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                return response.status, response.headers.get('Server-Timing', '')
+        except urllib.error.HTTPError as error:
+            return error.code, ''
+
+    def close(self):
+        if hasattr(self.server, 'should_exit'):
+            self.server.should_exit = True
+        else:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def measure(driver, role, path, requests, warmup, concurrency):
+    """Time ``requests`` GETs of one page and return its row of results."""
+    def request(_):
+        started = time.perf_counter()
+        status, timing = driver.get(role, path)
+        elapsed = time.perf_counter() - started
+        if status != 200:
+            raise CommandError(f'GET {path} returned {status}')
+        match = QUERIES_RE.search(timing)
+        return elapsed, int(match.group(1)) if match else 0
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(request, range(warmup)))
+        started = time.perf_counter()
+        samples = list(pool.map(request, range(requests)))
+        elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    for i in range(MEMORY_SAMPLES):
+        request(i)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'rps': requests / elapsed,
+        **percentiles([latency for latency, _ in samples]),
+        'queries': max(queries for _, queries in samples),
+        'peak_kib': peak / 1024,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return a line per metric that regressed against the baseline by more than ``threshold``.
+
+    Query counts are deterministic, so any increase counts.
+    """
+    regressions = []
+    for key, row in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        checks = (
+            ('p95', row['p95'] > base['p95'] * (1 + threshold)),
+            ('rps', row['rps'] < base['rps'] * (1 - threshold)),
+            ('peak_kib', row['peak_kib'] > base['peak_kib'] * (1 + threshold)),
+            ('queries', row['queries'] > base['queries']),
+        )
+        for metric, regressed in checks:
+            if regressed:
+                regressions.append(f'{key}: {metric} {base[metric]:.1f} -> {row[metric]:.1f}')
+    return regressions
+
+
+class Command(BaseCommand):
+    help = ('Seeds scaled datasets into a throwaway database and benchmarks the core pages in every language, '
+            'optionally against a stored baseline')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', type=int, nargs='+', default=[10],
+                            help='Dataset sizes as multiples of the populate_db defaults, e.g. 10 100 1000')
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per page and language')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests before each measurement')
+        parser.add_argument('--concurrency', type=int, default=1, help='Requests in flight')
+        parser.add_argument('--server', choices=['client', 'wsgi', 'asgi'], default='client',
+                            help='Drive the test client in-process, or a local WSGI/ASGI server over HTTP')
+        parser.add_argument('--endpoints', nargs='+', choices=list(ENDPOINTS), default=list(ENDPOINTS))
+        parser.add_argument('--languages', nargs='+', default=[code for code, _ in settings.LANGUAGES])
+        parser.add_argument('--page-cache', action='store_true',
+                            help='Keep the anonymous page cache on (measures cache hits)')
+        parser.add_argument('--seed', type=int, default=0, help='populate_db seed')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--baseline', help='Compare against the results in this JSON file')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Relative regression that fails the run (0.25 = 25%%)')
+
+    def handle(self, *args, **options):
+        if options['server'] != 'client' and connection.vendor == 'sqlite':
+            # Server threads need their own connections to a file database.
+            test_settings = connection.settings_dict.setdefault('TEST', {})
+            test_settings['NAME'] = os.path.join(tempfile.gettempdir(), f'raya-benchmark-{os.getpid()}.sqlite3')
+
+        settings.DEBUG = False
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver', '127.0.0.1']
+        settings.PAGE_CACHE_ENABLED = options['page_cache']
+        # The Server-Timing header carries each request's query count.
+        settings.PROFILING_ENABLED = True
+
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as handle:
+                baseline = json.load(handle)['results']
+
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        driver = None
+        try:
+            driver = ClientDriver() if options['server'] == 'client' else ServerDriver(options['server'])
+            # Loading the server application reconfigures logging, so silence the per-request lines afterwards.
+            logging.getLogger('apps.core.profiling').setLevel(logging.WARNING)
+            results = {}
+            for scale in options['scales']:
+                results.update(self.run_scale(driver, scale, options))
+        finally:
+            if driver is not None:
+                driver.close()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'meta': {
+                'server': options['server'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'page_cache': options['page_cache'],
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2, sort_keys=True)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if baseline is not None:
+            regressions = compare(results, baseline, options['threshold'])
+            if regressions:
+                raise CommandError(
+                    f"{len(regressions)} regression(s) over {options['threshold']:.0%}:\n" + '\n'.join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS(f"No regressions over {options['threshold']:.0%} against the baseline"))
+
+    def seed(self, scale, seed):
+        call_command('flush', interactive=False, verbosity=0)
+        counts = {name: count * scale for name, count in BASE_COUNTS.items()}
+        call_command('populate_db', seed=seed, stdout=open(os.devnull, 'w'), **counts)
+        for alias in settings.CACHES:
+            caches[alias].clear()
+
+    def run_scale(self, driver, scale, options):
+        started = time.perf_counter()
+        self.seed(scale, options['seed'])
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Scale {scale}x: {BASE_COUNTS["startups"] * scale:,} startups, '
+            f'{BASE_COUNTS["investors"] * scale:,} investors (seeded in {time.perf_counter() - started:.1f} s)'
+        ))
+        startup_user = StartupProfile.objects.order_by('pk').select_related('user').first().user
+        for role in set(ENDPOINTS.values()):
+            driver.login(role, startup_user if role == 'startup' else None)
+
+        self.stdout.write(
+            f"{'endpoint':<22}{'lang':<6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'queries':>9}{'peak KiB':>10}"
+        )
+        results = {}
+        for name in options['endpoints']:
+            for language in options['languages']:
+                with translation.override(language):
+                    path = reverse(name)
+                row = measure(driver, ENDPOINTS[name], path, options['requests'], options['warmup'],
+                              options['concurrency'])
+                results[f'{scale}x {language} {name}'] = row
+                self.stdout.write(
+                    f"{name:<22}{language:<6}{row['rps']:>9.1f}{row['p50']:>9.1f}{row['p95']:>9.1f}"
+                    f"{row['p99']:>9.1f}{row['queries']:>9}{row['peak_kib']:>10.0f}"
+                )
+        return results
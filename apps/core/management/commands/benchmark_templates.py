@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import InvalidCacheBackendError, caches
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Page
+from django.db.models import QuerySet
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils import translation
+import statistics
+import time
+
+DEFAULT_PATHS = ['/', '/deals/', '/startups/', '/investors/']
+
+# Each scenario: (reset compiled templates?, reset card fragments?)
+SCENARIOS = {
+    'uncached': (True, True),
+    'compiled': (False, True),
+    'fragments': (False, False),
+}
+
+
+def reset_template_cache():
+    for loader in engines['django'].engine.template_loaders:
+        if isinstance(loader, CachedLoader):
+            loader.reset()
+
+
+def fragment_cache():
+    try:
+        return caches['template_fragments']
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def prepare(path, language, factory):
+    """Run the view for ``path`` and return its unrendered response, queries already done."""
+    prefix = '' if language == settings.LANGUAGE_CODE else f'/{language}'
+    request = factory.get(prefix + path)
+    request.user = AnonymousUser()
+    # What LanguageMiddleware would set
+    request.LANGUAGE_CODE = language
+    match = resolve(request.path_info)
+    response = match.func(request, *match.args, **match.kwargs)
+    if not hasattr(response, 'render'):
+        raise CommandError(f'GET {path} did not return a template response')
+    # Querysets are lazy: evaluate them now so only rendering is timed.
+    for value in (response.context_data or {}).values():
+        if isinstance(value, (QuerySet, Page)):
+            len(value)
+    return response
+
+
+def render_time(path, language, factory, reset_templates, reset_fragments):
+    with translation.override(language):
+        response = prepare(path, language, factory)
+        if reset_templates:
+            reset_template_cache()
+        if reset_fragments:
+            fragment_cache().clear()
+        started = time.perf_counter()
+        response.render()
+        return time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = 'Measures template render time of the public pages, with and without template and fragment caching'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Timed renders per page and scenario')
+        parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS)
+        parser.add_argument('--languages', nargs='+', default=[code for code, _ in settings.LANGUAGES])
+
+    def handle(self, *args, **options):
+        settings.PAGE_CACHE_ENABLED = False
+        factory = RequestFactory()
+        self.stdout.write(f"Median render time over {options['iterations']} renders, in ms")
+        self.stdout.write(f"{'page':<16}{'lang':<6}" + ''.join(f'{name:>12}' for name in SCENARIOS) + f"{'speedup':>10}")
+        for path in options['paths']:
+            for language in options['languages']:
+                medians = {}
+                for name, (reset_templates, reset_fragments) in SCENARIOS.items():
+                    render_time(path, language, factory, False, False)  # warm up
+                    timings = [
+                        render_time(path, language, factory, reset_templates, reset_fragments)
+                        for _ in range(options['iterations'])
+                    ]
+                    medians[name] = statistics.median(timings) * 1000
+                speedup = medians['uncached'] / medians['fragments'] if medians['fragments'] else 0
+                self.stdout.write(
+                    f'{path:<16}{language:<6}' + ''.join(f'{medians[name]:>12.2f}' for name in SCENARIOS)
+                    + f'{speedup:>9.1f}x'
+                )
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.assets import vendor_bootstrap, vendor_fontawesome, vendor_tajawal
+from urllib.error import URLError
+
+
+class Command(BaseCommand):
+    help = 'Downloads the vendored CSS/JS/fonts into static/vendor and subsets the icon font'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--collect', action='store_true',
+                            help='Run collectstatic afterwards to fingerprint and compress the files')
+
+    def handle(self, *args, **options):
+        root = str(settings.STATICFILES_DIRS[0])
+        try:
+            import fontTools  # noqa: F401
+            import brotli  # noqa: F401
+            subset_fonts = True
+        except ImportError:
+            subset_fonts = False
+            self.stderr.write(self.style.WARNING(
+                'fonttools/brotli not installed: shipping the full Font Awesome fonts'
+            ))
+
+        try:
+            vendor_bootstrap(root)
+            vendor_tajawal(root)
+            # Icon classes appear in templates and in views (e.g. the home page features).
+            source_dirs = [*(str(path) for path in settings.TEMPLATES[0]['DIRS']), str(settings.BASE_DIR / 'apps')]
+            result = vendor_fontawesome(root, source_dirs, subset_fonts)
+        except URLError as error:
+            raise CommandError(f'Download failed: {error}')
+        self.stdout.write(f"Font Awesome: {result['icons']} icons kept")
+
+        if options['collect']:
+            call_command('collectstatic', interactive=False, verbosity=options['verbosity'])
+        self.stdout.write(self.style.SUCCESS(f'Vendored assets written to {root}/vendor'))
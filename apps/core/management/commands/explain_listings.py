@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from apps.core.models import Deal, InvestorProfile, StartupProfile
+import time
+
+
+class Command(BaseCommand):
+    help = 'Shows query plans and timings of the hot listing queries with and without their indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Timing runs per query (best is reported)')
+
+    def hot_queries(self):
+        return [
+            ('Active deals, newest first',
+             Deal.objects.filter(status='active').order_by('-created_at', '-id')[:10]),
+            ('Closed deals total',
+             Deal.objects.filter(status='closed').values_list('amount_raised')),
+            ('Verified startups, newest first',
+             StartupProfile.objects.filter(verified=True).order_by('-founding_date', '-id')[:10]),
+            ('Verified startups, best funded',
+             StartupProfile.objects.filter(verified=True).order_by('-total_funding_raised')[:3]),
+            ('Verified investors, most active',
+             InvestorProfile.objects.filter(verified=True).order_by('-total_investments', '-id')[:10]),
+            ('Admin: startups by industry',
+             StartupProfile.objects.filter(industry='Fintech').order_by('-id')[:100]),
+            ('Admin: investors by location',
+             InvestorProfile.objects.filter(location='Dubai').order_by('-id')[:100]),
+        ]
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                for model in (Deal, StartupProfile, InvestorProfile):
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+            else:
+                cursor.execute('ANALYZE')
+
+    def measure(self, repeat):
+        results = {}
+        for label, queryset in self.hot_queries():
+            plan = queryset.explain()
+            best = float('inf')
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                best = min(best, time.perf_counter() - started)
+            results[label] = (plan, best)
+        return results
+
+    def drop_indexes(self):
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model in (Deal, StartupProfile, InvestorProfile):
+                for index in model._meta.indexes:
+                    cursor.execute(str(index.remove_sql(model, editor)))
+
+    def handle(self, *args, **options):
+        counts = ', '.join(
+            f'{model.__name__}: {model.objects.count():,}'
+            for model in (Deal, StartupProfile, InvestorProfile)
+        )
+        self.stdout.write(f'Dataset - {counts}')
+
+        with transaction.atomic():
+            # Measure without the indexes inside a savepoint that is rolled back.
+            with transaction.atomic():
+                self.drop_indexes()
+                self.analyze()
+                without = self.measure(options['repeat'])
+                transaction.set_rollback(True)
+            self.analyze()
+            with_indexes = self.measure(options['repeat'])
+
+        for label, (plan, elapsed) in with_indexes.items():
+            old_plan, old_elapsed = without[label]
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(f'  without indexes ({old_elapsed * 1000:.2f} ms):')
+            for line in old_plan.splitlines():
+                self.stdout.write(f'    {line}')
+            self.stdout.write(f'  with indexes ({elapsed * 1000:.2f} ms):')
+            for line in plan.splitlines():
+                self.stdout.write(self.style.SUCCESS(f'    {line}'))
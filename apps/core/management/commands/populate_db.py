@@ -1,150 +1,249 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection, connections, transaction
 from apps.core.models import InvestorProfile, StartupProfile, IndividualProfile, Deal
+from apps.core.counters import reconcile_counters
+from apps.core.matching import INDEX_CACHE_KEY
+from apps.core.page_cache import INVALIDATION_GROUPS, invalidate_page_groups
+from apps.core.search import rebuild_search_index
+from apps.core.stats import refresh_platform_stats
+from apps.core.tags import rebuild_tags
 from django.utils import timezone
 from datetime import timedelta
+import multiprocessing
 import random
 import decimal
 
 User = get_user_model()
 
+INDUSTRIES = ['Fintech', 'Healthtech', 'E-commerce', 'SaaS', 'AI/ML', 'Cleantech', 'Edtech']
+LOCATIONS = ['San Francisco', 'New York', 'London', 'Berlin', 'Singapore', 'Dubai', 'Tokyo']
+
+
+def rng_for(seed, kind, chunk):
+    """Return a generator seeded per (kind, chunk), so output doesn't depend on worker count."""
+    return random.Random(f'{seed}:{kind}:{chunk}')
+
+
+def build_users(kind, start, stop, password_hash):
+    return [
+        User(
+            username=f'{kind}{i}',
+            email=f'{kind}{i}@example.com',
+            password=password_hash,
+            user_type=kind,
+        )
+        for i in range(start, stop)
+    ]
+
+
+def build_investor(rng, user, i):
+    return InvestorProfile(
+        user=user,
+        company_name=f'Investment Firm {i}',
+        description=f'A leading investment firm specializing in {rng.choice(INDUSTRIES)}',
+        website=f'https://investor{i}.com',
+        location=rng.choice(LOCATIONS),
+        founded_year=rng.randint(1990, 2020),
+        team_size=rng.randint(5, 100),
+        preferred_industries=[rng.choice(INDUSTRIES) for _ in range(3)],
+        preferred_stages=['seed', 'series_a', 'series_b'],
+        investment_range_min=decimal.Decimal(rng.randint(50000, 500000)),
+        investment_range_max=decimal.Decimal(rng.randint(1000000, 5000000)),
+        sectors_of_interest=[rng.choice(INDUSTRIES) for _ in range(3)],
+        verified=rng.choice([True, False]),
+        linkedin_url=f'https://linkedin.com/company/investor{i}',
+        crunchbase_url=f'https://crunchbase.com/company/investor{i}'
+    )
+
+
+def build_startup(rng, user, i):
+    return StartupProfile(
+        user=user,
+        company_name=f'Startup {i}',
+        tagline=f'Revolutionizing {rng.choice(INDUSTRIES)}',
+        description=f'An innovative startup in the {rng.choice(INDUSTRIES)} space',
+        industry=rng.choice(INDUSTRIES),
+        stage=rng.choice(['seed', 'series_a', 'series_b']),
+        founding_date=(timezone.now() - timedelta(days=rng.randint(365, 1825))).date(),
+        location=rng.choice(LOCATIONS),
+        team_size=rng.randint(2, 50),
+        revenue_range=rng.choice(['pre_revenue', '0-100k', '100k-500k', '500k-1m']),
+        website=f'https://startup{i}.com',
+        linkedin_url=f'https://linkedin.com/company/startup{i}',
+        crunchbase_url=f'https://crunchbase.com/company/startup{i}',
+        total_funding_raised=decimal.Decimal(rng.randint(0, 5000000)),
+        current_funding_target=decimal.Decimal(rng.randint(1000000, 10000000)),
+        min_ticket_size=decimal.Decimal(rng.randint(50000, 250000)),
+        equity_offering=decimal.Decimal(rng.randint(5, 20)),
+        key_metrics={
+            'mrr': rng.randint(0, 100000),
+            'users': rng.randint(100, 10000),
+            'growth_rate': rng.randint(10, 100)
+        },
+        verified=rng.choice([True, False])
+    )
+
+
+def build_individual(rng, user, i):
+    return IndividualProfile(
+        user=user,
+        first_name=f'First{i}',
+        last_name=f'Last{i}',
+        title=f'Professional Title {i}',
+        company=f'Company {i}',
+        interests=[rng.choice(INDUSTRIES) for _ in range(3)],
+        linkedin_url=f'https://linkedin.com/in/individual{i}',
+        verified=rng.choice([True, False])
+    )
+
+
+PROFILE_BUILDERS = {
+    'investor': (InvestorProfile, build_investor),
+    'startup': (StartupProfile, build_startup),
+    'individual': (IndividualProfile, build_individual),
+}
+
+
+def create_profiles(job):
+    """Insert one chunk of users and their profiles (run in a worker or inline)."""
+    kind, chunk, start, stop, seed, password_hash, batch_size = job
+    rng = rng_for(seed, kind, chunk)
+    model, build = PROFILE_BUILDERS[kind]
+    with transaction.atomic():
+        users = User.objects.bulk_create(build_users(kind, start, stop, password_hash), batch_size=batch_size)
+        profiles = model.objects.bulk_create(
+            [build(rng, user, i) for i, user in zip(range(start, stop), users)],
+            batch_size=batch_size,
+        )
+        rebuild_tags(model, profiles, batch_size=batch_size)
+    return len(profiles)
+
+
+def create_deals(job):
+    """Insert one chunk of deals with their interested/committed investors."""
+    chunk, start, stop, seed, startups, investor_ids, batch_size = job
+    rng = rng_for(seed, 'deal', chunk)
+    deals, picks = [], []
+    for _ in range(start, stop):
+        startup_id, company_name, industry, stage = rng.choice(startups)
+        interested = rng.sample(investor_ids, min(len(investor_ids), rng.randint(1, 5)))
+        committed = interested[:rng.randint(1, 3)]
+        picks.append((interested, committed))
+        deals.append(Deal(
+            title=f'Investment Round for {company_name}',
+            description=f'Seeking investment to scale {rng.choice(["operations", "product development", "market expansion"])}',
+            startup_id=startup_id,
+            deal_type=rng.choice(['equity', 'convertible_note', 'safe']),
+            status=rng.choice(['draft', 'active', 'in_discussion', 'due_diligence', 'closed']),
+            amount=decimal.Decimal(rng.randint(500000, 5000000)),
+            equity_offered=decimal.Decimal(rng.randint(5, 25)),
+            min_investment=decimal.Decimal(rng.randint(25000, 100000)),
+            target_close_date=(timezone.now() + timedelta(days=rng.randint(30, 180))).date(),
+            industry=industry,
+            terms_and_conditions=f'Standard terms for {stage} investment',
+        ))
+
+    interested_through = Deal.interested_investors.through
+    committed_through = Deal.committed_investors.through
+    with transaction.atomic():
+        deals = Deal.objects.bulk_create(deals, batch_size=batch_size)
+        interested_through.objects.bulk_create([
+            interested_through(deal_id=deal.pk, investorprofile_id=investor_id)
+            for deal, (interested, _) in zip(deals, picks) for investor_id in interested
+        ], batch_size=batch_size, ignore_conflicts=True)
+        committed_through.objects.bulk_create([
+            committed_through(deal_id=deal.pk, investorprofile_id=investor_id)
+            for deal, (_, committed) in zip(deals, picks) for investor_id in committed
+        ], batch_size=batch_size, ignore_conflicts=True)
+    return len(deals)
+
+
+def _init_worker():
+    # Forked workers must not share the parent's database connection.
+    connections.close_all()
+
+
 class Command(BaseCommand):
-    help = 'Populates the database with dummy data'
+    help = 'Populates the database with dummy data, in bulk and at any scale'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--investors', type=int, default=10)
+        parser.add_argument('--startups', type=int, default=20)
+        parser.add_argument('--individuals', type=int, default=15)
+        parser.add_argument('--deals', type=int, default=None,
+                            help='Number of deals (default: two per startup)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows per bulk insert and per work chunk')
+        parser.add_argument('--seed', type=int, default=None,
+                            help='Seed for reproducible data')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Worker processes (PostgreSQL only; SQLite allows a single writer)')
+        parser.add_argument('--password', default='password123',
+                            help='Password for every generated user (hashed once)')
+
+    def run_jobs(self, func, jobs, workers):
+        if workers <= 1:
+            return sum(func(job) for job in jobs)
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(workers, initializer=_init_worker) as pool:
+            return sum(pool.imap_unordered(func, jobs))
+
+    def chunks(self, total, offset, batch_size):
+        for chunk, start in enumerate(range(0, total, batch_size)):
+            yield chunk, offset + start, offset + min(start + batch_size, total)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        seed = options['seed'] if options['seed'] is not None else random.randrange(2 ** 32)
+        workers = options['workers']
+        if workers > 1 and connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING('SQLite allows a single writer; using one worker'))
+            workers = 1
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+
+        self.stdout.write(f'Creating dummy data (seed {seed})...')
 
-    def handle(self, *args, **kwargs):
-        self.stdout.write('Creating dummy data...')
-        
         # Create superuser
         if not User.objects.filter(username='admin').exists():
             User.objects.create_superuser('admin', 'admin@example.com', 'admin')
             self.stdout.write('Superuser created')
 
-        # Sample data
-        INDUSTRIES = ['Fintech', 'Healthtech', 'E-commerce', 'SaaS', 'AI/ML', 'Cleantech', 'Edtech']
-        LOCATIONS = ['San Francisco', 'New York', 'London', 'Berlin', 'Singapore', 'Dubai', 'Tokyo']
-        
-        # Create Investors
-        investor_users = []
-        for i in range(10):
-            user = User.objects.create_user(
-                username=f'investor{i}',
-                email=f'investor{i}@example.com',
-                password='password123',
-                user_type='investor'
-            )
-            investor_users.append(user)
-            
-            InvestorProfile.objects.create(
-                user=user,
-                company_name=f'Investment Firm {i}',
-                description=f'A leading investment firm specializing in {random.choice(INDUSTRIES)}',
-                website=f'https://investor{i}.com',
-                location=random.choice(LOCATIONS),
-                founded_year=random.randint(1990, 2020),
-                team_size=random.randint(5, 100),
-                preferred_industries=[random.choice(INDUSTRIES) for _ in range(3)],
-                preferred_stages=['seed', 'series_a', 'series_b'],
-                investment_range_min=decimal.Decimal(random.randint(50000, 500000)),
-                investment_range_max=decimal.Decimal(random.randint(1000000, 5000000)),
-                sectors_of_interest=[random.choice(INDUSTRIES) for _ in range(3)],
-                total_investments=random.randint(10, 50),
-                total_capital_deployed=decimal.Decimal(random.randint(5000000, 50000000)),
-                verified=random.choice([True, False]),
-                linkedin_url=f'https://linkedin.com/company/investor{i}',
-                crunchbase_url=f'https://crunchbase.com/company/investor{i}'
-            )
-        self.stdout.write('Created investors')
-
-        # Create Startups
-        startup_users = []
-        for i in range(20):
-            user = User.objects.create_user(
-                username=f'startup{i}',
-                email=f'startup{i}@example.com',
-                password='password123',
-                user_type='startup'
-            )
-            startup_users.append(user)
-            
-            StartupProfile.objects.create(
-                user=user,
-                company_name=f'Startup {i}',
-                tagline=f'Revolutionizing {random.choice(INDUSTRIES)}',
-                description=f'An innovative startup in the {random.choice(INDUSTRIES)} space',
-                industry=random.choice(INDUSTRIES),
-                stage=random.choice(['seed', 'series_a', 'series_b']),
-                founding_date=timezone.now() - timedelta(days=random.randint(365, 1825)),
-                location=random.choice(LOCATIONS),
-                team_size=random.randint(2, 50),
-                revenue_range=random.choice(['pre_revenue', '0-100k', '100k-500k', '500k-1m']),
-                website=f'https://startup{i}.com',
-                linkedin_url=f'https://linkedin.com/company/startup{i}',
-                crunchbase_url=f'https://crunchbase.com/company/startup{i}',
-                total_funding_raised=decimal.Decimal(random.randint(0, 5000000)),
-                current_funding_target=decimal.Decimal(random.randint(1000000, 10000000)),
-                min_ticket_size=decimal.Decimal(random.randint(50000, 250000)),
-                equity_offering=decimal.Decimal(random.randint(5, 20)),
-                key_metrics={
-                    'mrr': random.randint(0, 100000),
-                    'users': random.randint(100, 10000),
-                    'growth_rate': random.randint(10, 100)
-                },
-                verified=random.choice([True, False])
-            )
-        self.stdout.write('Created startups')
-
-        # Create Individuals
-        for i in range(15):
-            user = User.objects.create_user(
-                username=f'individual{i}',
-                email=f'individual{i}@example.com',
-                password='password123',
-                user_type='individual'
-            )
-            
-            IndividualProfile.objects.create(
-                user=user,
-                first_name=f'First{i}',
-                last_name=f'Last{i}',
-                title=f'Professional Title {i}',
-                company=f'Company {i}',
-                interests=[random.choice(INDUSTRIES) for _ in range(3)],
-                linkedin_url=f'https://linkedin.com/in/individual{i}',
-                verified=random.choice([True, False])
-            )
-        self.stdout.write('Created individuals')
-
-        # Create Deals
-        startups = StartupProfile.objects.all()
-        for startup in startups:
-            num_deals = random.randint(1, 3)
-            for _ in range(num_deals):
-                deal = Deal.objects.create(
-                    title=f'Investment Round for {startup.company_name}',
-                    description=f'Seeking investment to scale {random.choice(["operations", "product development", "market expansion"])}',
-                    startup=startup,
-                    deal_type=random.choice(['equity', 'convertible_note', 'safe']),
-                    status=random.choice(['draft', 'active', 'in_discussion', 'due_diligence', 'closed']),
-                    amount=decimal.Decimal(random.randint(500000, 5000000)),
-                    equity_offered=decimal.Decimal(random.randint(5, 25)),
-                    min_investment=decimal.Decimal(random.randint(25000, 100000)),
-                    target_close_date=timezone.now() + timedelta(days=random.randint(30, 180)),
-                    industry=startup.industry,
-                    terms_and_conditions=f'Standard terms for {startup.stage} investment'
-                )
-                
-                # Add some interested and committed investors
-                investors = list(InvestorProfile.objects.all())
-                random.shuffle(investors)
-                deal.interested_investors.add(*investors[:random.randint(1, 5)])
-                deal.committed_investors.add(*investors[:random.randint(1, 3)])
-                
-                # Update deal progress
-                committed_investors = deal.committed_investors.all()
-                deal.number_of_investors = len(committed_investors)
-                deal.amount_raised = decimal.Decimal(sum(random.randint(100000, 500000) for _ in range(deal.number_of_investors)))
-                deal.save()
-                
-        self.stdout.write('Created deals')
-        
-        self.stdout.write(self.style.SUCCESS('Successfully populated database with dummy data')) 
\ No newline at end of file
+        # Hash once: every generated user shares the same password.
+        password_hash = make_password(options['password'])
+
+        for kind, count in (('investor', options['investors']), ('startup', options['startups']),
+                            ('individual', options['individuals'])):
+            model = PROFILE_BUILDERS[kind][0]
+            # Continue numbering after earlier runs so usernames stay unique.
+            offset = model.objects.count()
+            jobs = [
+                (kind, chunk, start, stop, seed, password_hash, batch_size)
+                for chunk, start, stop in self.chunks(count, offset, batch_size)
+            ]
+            created = self.run_jobs(create_profiles, jobs, workers)
+            self.stdout.write(f'Created {created} {kind}s')
+
+        startups = list(StartupProfile.objects.values_list('pk', 'company_name', 'industry', 'stage'))
+        investor_ids = list(InvestorProfile.objects.values_list('pk', flat=True))
+        deal_count = options['deals'] if options['deals'] is not None else 2 * options['startups']
+        if startups and investor_ids and deal_count:
+            jobs = [
+                (chunk, start, stop, seed, startups, investor_ids, batch_size)
+                for chunk, start, stop in self.chunks(deal_count, 0, batch_size)
+            ]
+            created = self.run_jobs(create_deals, jobs, workers)
+            self.stdout.write(f'Created {created} deals')
+
+        # Bulk inserts skip post_save and m2m_changed, so derive the progress
+        # counters, search index and caches explicitly.
+        reconcile_counters()
+        rebuild_search_index(batch_size=batch_size)
+        refresh_platform_stats()
+        cache.delete(INDEX_CACHE_KEY)
+        invalidate_page_groups({group for groups in INVALIDATION_GROUPS.values() for group in groups})
+
+        self.stdout.write(self.style.SUCCESS('Successfully populated database with dummy data'))
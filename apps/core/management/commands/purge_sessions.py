@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from importlib import import_module
+import time
+
+
+class Command(BaseCommand):
+    help = ('Deletes expired sessions from the session store in small batches; run it periodically, '
+            'or keep it running with --interval')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows deleted per statement, keeping each lock on the session table short')
+        parser.add_argument('--interval', type=float, help='Keep purging every this many seconds')
+
+    def purge(self, store):
+        """Delete the expired sessions and return how many rows went, or None without a session table."""
+        if not hasattr(store, 'get_model_class'):
+            # Cache and signed-cookie sessions expire on their own.
+            store.clear_expired()
+            return None
+        sessions = store.get_model_class().objects
+        now = timezone.now()
+        deleted = 0
+        while True:
+            keys = list(sessions.filter(expire_date__lt=now).values_list('pk', flat=True)[:self.batch_size])
+            if not keys:
+                return deleted
+            deleted += sessions.filter(pk__in=keys).delete()[0]
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        while True:
+            deleted = self.purge(store)
+            if deleted is None:
+                self.stdout.write(f'{settings.SESSION_ENGINE} sessions expire on their own; nothing to purge')
+                return
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired sessions'))
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
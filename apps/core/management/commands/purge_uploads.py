@@ -0,0 +1,16 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from apps.core.uploads import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = 'Deletes chunked uploads that were abandoned or never attached to a startup or deal'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float,
+                            help='Age after which an upload is stale (default: UPLOAD_SESSION_TTL)')
+
+    def handle(self, *args, **options):
+        max_age = timedelta(hours=options['hours']) if options['hours'] is not None else None
+        count = purge_stale_uploads(max_age)
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} uploads'))
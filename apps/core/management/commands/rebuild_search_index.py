@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from apps.core.search import rebuild_search_index
+import time
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index over startups and deals'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = rebuild_search_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {total} objects in {time.perf_counter() - started:.1f}s'
+        ))
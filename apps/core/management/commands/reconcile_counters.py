@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from apps.core.counters import count_drift, reconcile_counters
+from apps.core.page_cache import INVALIDATION_GROUPS, invalidate_page_groups
+from apps.core.stats import refresh_platform_stats
+
+
+class Command(BaseCommand):
+    help = 'Recomputes deal progress and investor totals from the committed investors'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many rows have drifted')
+
+    def handle(self, *args, **options):
+        drift = count_drift()
+        self.stdout.write(f"Drifted: {drift['deals']} deals, {drift['investors']} investors")
+        if options['dry_run']:
+            return
+
+        updated = reconcile_counters()
+        refresh_platform_stats()
+        invalidate_page_groups({group for groups in INVALIDATION_GROUPS.values() for group in groups})
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled {updated['deals']} deals and {updated['investors']} investors"
+        ))
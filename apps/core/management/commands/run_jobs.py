@@ -0,0 +1,36 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from apps.core.jobs import default_worker_id, next_due_in, run_pending
+
+
+class Command(BaseCommand):
+    help = 'Runs queued background jobs until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Run the jobs that are due, then exit')
+        parser.add_argument('--max-jobs', type=int,
+                            help='Exit after running this many jobs')
+        parser.add_argument('--sleep', type=float, default=settings.JOBS_POLL_INTERVAL,
+                            help='Seconds to wait between polls of an idle queue')
+        parser.add_argument('--worker-id', default=default_worker_id(),
+                            help='Name recorded on claimed jobs')
+
+    def handle(self, *args, **options):
+        remaining = options['max_jobs']
+        total = 0
+        while remaining is None or remaining > 0:
+            # Recycle the connection past CONN_MAX_AGE or after an error, as a request would.
+            close_old_connections()
+            count = run_pending(options['worker_id'], limit=remaining)
+            total += count
+            if remaining is not None:
+                remaining -= count
+            if options['once']:
+                break
+            if not count:
+                due = next_due_in()
+                time.sleep(options['sleep'] if due is None else min(due, options['sleep']))
+        self.stdout.write(self.style.SUCCESS(f'Ran {total} jobs'))
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+import sqlite3
+import time
+
+
+class Command(BaseCommand):
+    help = ('Copies the SQLite primary database onto the SQLite replicas, standing in for replication '
+            'when trying the read-replica setup locally')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float,
+                            help='Keep copying every this many seconds, simulating replication lag')
+
+    def sync(self, replicas):
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        for alias in replicas:
+            connections[alias].close()
+            target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+
+    def handle(self, *args, **options):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            raise CommandError('No replicas configured; set DATABASE_REPLICA_URLS')
+        for alias in (DEFAULT_DB_ALIAS, *replicas):
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(f'{alias} is not SQLite; real replicas are kept in sync by the database server')
+
+        while True:
+            self.sync(replicas)
+            self.stdout.write(f"Copied {DEFAULT_DB_ALIAS} to {', '.join(replicas)}")
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
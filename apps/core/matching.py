@@ -0,0 +1,519 @@
+"""Investor/deal matching on precomputed preference bitsets.
+
+Every investor's preferences are encoded once into fixed-width integer
+vectors: a bitset of preferred industries (``preferred_industries`` and
+``sectors_of_interest``), a bitset of preferred stages and their ticket
+range. Every active deal is encoded as an industry bit position, its
+startup's stage bit position and its ticket range. Scoring is then a
+handful of NumPy gathers, shifts and comparisons over whole arrays, so
+ranking all deals for an investor (or all investors for a deal) never
+touches a JSON field or loops in Python.
+
+The encoded ``MatchIndex`` is kept in the cache and patched in place when a
+profile or deal changes. Ranked results are cached per investor and per
+deal, and a change only drops the cached results it can actually affect.
+While no index is cached there is nothing to patch: a change then starts
+a new generation of cached results instead, which orphans them all at once.
+The dashboard shows investors their ``rank_deals_for_investor`` results.
+"""
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from typing import Iterable, Optional
+from .models import Deal, InvestorProfile
+
+
+INDEX_CACHE_KEY = 'core:matching:index'
+INDEX_LOCK_KEY = 'core:matching:index:lock'
+GENERATION_KEY = 'core:matching:generation'
+INVESTOR_RESULTS_KEY = 'core:matching:investor:{}:{}'
+DEAL_RESULTS_KEY = 'core:matching:deal:{}:{}'
+
+# Scores are small integers so the full investor x deal matrix fits in uint8.
+INDUSTRY_POINTS = np.uint8(5)
+STAGE_POINTS = np.uint8(3)
+TICKET_POINTS = np.uint8(2)
+MAX_POINTS = int(INDUSTRY_POINTS + STAGE_POINTS + TICKET_POINTS)
+
+INVESTOR_COLUMNS = (
+    'pk', 'preferred_industries', 'sectors_of_interest', 'preferred_stages',
+    'investment_range_min', 'investment_range_max',
+)
+DEAL_COLUMNS = ('pk', 'industry', 'startup__stage', 'min_investment', 'amount')
+
+# Bit 0 is reserved for "unknown" so empty or unseen values never match.
+STAGE_BITS = {code: bit for bit, code in enumerate(
+    ['', 'idea', 'mvp', 'seed', 'series_a', 'series_b', 'series_c', 'growth']
+)}
+ANY_STAGE_MASK = np.uint64((1 << len(STAGE_BITS)) - 2)
+
+
+def normalize_industry(value: str) -> str:
+    """Normalize a free-text industry name for vocabulary lookup."""
+    return str(value).strip().casefold()
+
+
+class MatchIndex:
+    """Columnar, bit-packed encoding of investor preferences and active deals.
+
+    Attributes:
+        industries (dict): Normalized industry name -> bit position
+        investor_ids (np.ndarray): Investor primary keys, one row per investor
+        investor_industries (np.ndarray): ``(investors, words)`` uint64 industry bitsets
+        investor_stages (np.ndarray): uint64 stage bitsets
+        investor_min (np.ndarray): Lower bound of each investor's ticket range
+        investor_max (np.ndarray): Upper bound of each investor's ticket range
+        deal_ids (np.ndarray): Deal primary keys, one entry per active deal
+        deal_industries (np.ndarray): Industry bit position of each deal
+        deal_stages (np.ndarray): Stage bit position of each deal's startup
+        deal_min (np.ndarray): Minimum investment of each deal
+        deal_max (np.ndarray): Total amount sought by each deal
+    """
+
+    def __init__(self) -> None:
+        self.industries: dict[str, int] = {'': 0}
+        self.investor_ids = np.empty(0, dtype=np.int64)
+        self.investor_industries = np.zeros((0, 1), dtype=np.uint64)
+        self.investor_stages = np.empty(0, dtype=np.uint64)
+        self.investor_min = np.empty(0, dtype=np.float32)
+        self.investor_max = np.empty(0, dtype=np.float32)
+        self.deal_ids = np.empty(0, dtype=np.int64)
+        self.deal_industries = np.empty(0, dtype=np.int64)
+        self.deal_stages = np.empty(0, dtype=np.int64)
+        self.deal_min = np.empty(0, dtype=np.float32)
+        self.deal_max = np.empty(0, dtype=np.float32)
+        self._investor_pos: dict[int, int] = {}
+        self._deal_pos: dict[int, int] = {}
+
+    # Encoding -----------------------------------------------------------
+
+    def industry_bit(self, name: str) -> int:
+        """Return the bit position of an industry, growing the vocabulary if needed."""
+        key = normalize_industry(name)
+        if key not in self.industries:
+            self.industries[key] = len(self.industries)
+            words = len(self.industries) // 64 + 1
+            if words > self.investor_industries.shape[1]:
+                padding = np.zeros((len(self.investor_ids), words - self.investor_industries.shape[1]), dtype=np.uint64)
+                self.investor_industries = np.hstack([self.investor_industries, padding])
+        return self.industries[key]
+
+    def encode_industries(self, names: Iterable[str]) -> np.ndarray:
+        """Encode a list of industry names into a bitset row."""
+        bits = [self.industry_bit(name) for name in names if normalize_industry(name)]
+        row = np.zeros(self.investor_industries.shape[1], dtype=np.uint64)
+        for bit in bits:
+            row[bit // 64] |= np.uint64(1 << (bit % 64))
+        return row
+
+    @staticmethod
+    def encode_stages(stages: Iterable[str]) -> np.uint64:
+        """Encode a list of stage codes into a bitset; ``'any'`` sets every stage."""
+        mask = 0
+        for stage in stages or ():
+            if stage == 'any':
+                return ANY_STAGE_MASK
+            if stage in STAGE_BITS:
+                mask |= 1 << STAGE_BITS[stage]
+        return np.uint64(mask)
+
+    # Building -----------------------------------------------------------
+
+    @classmethod
+    def build(cls) -> 'MatchIndex':
+        """Encode every investor and active deal straight from ``values_list`` rows.
+
+        Returns:
+            MatchIndex: A freshly built index
+        """
+        index = cls()
+        investors = list(InvestorProfile.objects.values_list(*INVESTOR_COLUMNS).order_by('pk'))
+        deals = list(Deal.objects.filter(status='active').values_list(*DEAL_COLUMNS).order_by('pk'))
+
+        for _, industries, sectors, _, _, _ in investors:
+            for name in list(industries or ()) + list(sectors or ()):
+                index.industry_bit(name)
+        for _, industry, _, _, _ in deals:
+            index.industry_bit(industry)
+
+        words = index.investor_industries.shape[1]
+        index.investor_ids = np.fromiter((row[0] for row in investors), dtype=np.int64, count=len(investors))
+        index.investor_industries = np.zeros((len(investors), words), dtype=np.uint64)
+        for pos, (_, industries, sectors, _, _, _) in enumerate(investors):
+            index.investor_industries[pos] = index.encode_industries(list(industries or ()) + list(sectors or ()))
+        index.investor_stages = np.fromiter(
+            (cls.encode_stages(row[3]) for row in investors), dtype=np.uint64, count=len(investors)
+        )
+        index.investor_min = np.fromiter((row[4] or 0 for row in investors), dtype=np.float32, count=len(investors))
+        index.investor_max = np.fromiter((row[5] or 0 for row in investors), dtype=np.float32, count=len(investors))
+
+        index.deal_ids = np.fromiter((row[0] for row in deals), dtype=np.int64, count=len(deals))
+        index.deal_industries = np.fromiter(
+            (index.industries[normalize_industry(row[1])] for row in deals), dtype=np.int64, count=len(deals)
+        )
+        index.deal_stages = np.fromiter(
+            (STAGE_BITS.get(row[2] or '', 0) for row in deals), dtype=np.int64, count=len(deals)
+        )
+        index.deal_min = np.fromiter((row[3] or 0 for row in deals), dtype=np.float32, count=len(deals))
+        index.deal_max = np.fromiter((row[4] or 0 for row in deals), dtype=np.float32, count=len(deals))
+        index._reindex()
+        return index
+
+    def _reindex(self) -> None:
+        self._investor_pos = {int(pk): pos for pos, pk in enumerate(self.investor_ids)}
+        self._deal_pos = {int(pk): pos for pos, pk in enumerate(self.deal_ids)}
+
+    # Incremental updates ------------------------------------------------
+
+    def upsert_investor(self, investor_id: int, industries: list, sectors: list, stages: list,
+                        range_min, range_max) -> None:
+        """Add or re-encode one investor from its ``INVESTOR_COLUMNS`` values."""
+        row = self.encode_industries(list(industries or ()) + list(sectors or ()))
+        stages = self.encode_stages(stages)
+        low, high = float(range_min or 0), float(range_max or 0)
+        pos = self._investor_pos.get(investor_id)
+        if pos is None:
+            self.investor_ids = np.append(self.investor_ids, np.int64(investor_id))
+            self.investor_industries = np.vstack([self.investor_industries, row[None, :]])
+            self.investor_stages = np.append(self.investor_stages, stages)
+            self.investor_min = np.append(self.investor_min, low)
+            self.investor_max = np.append(self.investor_max, high)
+            self._investor_pos[investor_id] = len(self.investor_ids) - 1
+        else:
+            self.investor_industries[pos] = row
+            self.investor_stages[pos] = stages
+            self.investor_min[pos] = low
+            self.investor_max[pos] = high
+
+    def remove_investor(self, investor_id: int) -> None:
+        """Drop one investor from the index."""
+        pos = self._investor_pos.get(investor_id)
+        if pos is None:
+            return
+        self.investor_ids = np.delete(self.investor_ids, pos)
+        self.investor_industries = np.delete(self.investor_industries, pos, axis=0)
+        self.investor_stages = np.delete(self.investor_stages, pos)
+        self.investor_min = np.delete(self.investor_min, pos)
+        self.investor_max = np.delete(self.investor_max, pos)
+        self._reindex()
+
+    def upsert_deal(self, deal_id: int, industry: str, stage: str, min_investment, amount) -> None:
+        """Add or re-encode one active deal from its ``DEAL_COLUMNS`` values."""
+        industry_bit = self.industry_bit(industry)
+        stage_bit = STAGE_BITS.get(stage or '', 0)
+        pos = self._deal_pos.get(deal_id)
+        if pos is None:
+            self.deal_ids = np.append(self.deal_ids, np.int64(deal_id))
+            self.deal_industries = np.append(self.deal_industries, industry_bit)
+            self.deal_stages = np.append(self.deal_stages, stage_bit)
+            self.deal_min = np.append(self.deal_min, float(min_investment or 0))
+            self.deal_max = np.append(self.deal_max, float(amount or 0))
+            self._deal_pos[deal_id] = len(self.deal_ids) - 1
+        else:
+            self.deal_industries[pos] = industry_bit
+            self.deal_stages[pos] = stage_bit
+            self.deal_min[pos] = float(min_investment or 0)
+            self.deal_max[pos] = float(amount or 0)
+
+    def remove_deal(self, deal_id: int) -> None:
+        """Drop one deal from the index."""
+        pos = self._deal_pos.get(deal_id)
+        if pos is None:
+            return
+        self.deal_ids = np.delete(self.deal_ids, pos)
+        self.deal_industries = np.delete(self.deal_industries, pos)
+        self.deal_stages = np.delete(self.deal_stages, pos)
+        self.deal_min = np.delete(self.deal_min, pos)
+        self.deal_max = np.delete(self.deal_max, pos)
+        self._reindex()
+
+    # Scoring ------------------------------------------------------------
+
+    def preference_table(self, investors: np.ndarray) -> np.ndarray:
+        """Expand investors' bitsets into points for every (industry, stage) pair.
+
+        Args:
+            investors (np.ndarray): Investor row positions
+
+        Returns:
+            np.ndarray: ``(len(investors), industries * stages)`` uint8 points
+        """
+        vocabulary = np.arange(len(self.industries))
+        words = self.investor_industries[investors][:, vocabulary // 64]
+        industry = ((words >> (vocabulary % 64).astype(np.uint64)) & np.uint64(1)).astype(np.uint8)
+        stage_bits = np.arange(len(STAGE_BITS), dtype=np.uint64)
+        stage = ((self.investor_stages[investors][:, None] >> stage_bits) & np.uint64(1)).astype(np.uint8)
+        table = industry[:, :, None] * INDUSTRY_POINTS + stage[:, None, :] * STAGE_POINTS
+        return table.reshape(len(investors), -1)
+
+    def score(self, investors: np.ndarray, deals: np.ndarray) -> np.ndarray:
+        """Score every (investor, deal) pair of the given positions.
+
+        A pair only scores when the deal's industry or stage is one the
+        investor prefers; a fitting ticket range then adds to the score.
+        The industry/stage part is a single gather from each investor's
+        ``preference_table`` row, keyed by the deal's (industry, stage).
+
+        Args:
+            investors (np.ndarray): Investor row positions
+            deals (np.ndarray): Deal positions
+
+        Returns:
+            np.ndarray: ``(len(investors), len(deals))`` uint8 points out of ``MAX_POINTS``
+        """
+        keys = self.deal_industries[deals] * len(STAGE_BITS) + self.deal_stages[deals]
+        points = np.take(self.preference_table(investors), keys, axis=1)
+        ticket = self.deal_min[deals][None, :] <= self.investor_max[investors][:, None]
+        ticket &= self.deal_max[deals][None, :] >= self.investor_min[investors][:, None]
+        ticket &= points > 0
+        points += ticket.view(np.uint8) * TICKET_POINTS
+        return points
+
+    @staticmethod
+    def _top(block: np.ndarray, ids: np.ndarray, limit: int) -> list[list[tuple[int, float]]]:
+        """Return the ``limit`` best ``(id, score)`` pairs of every row, ties broken by id.
+
+        Scores only take a few integer values, so instead of partially
+        sorting every row, find per row the highest score level that still
+        yields ``limit`` candidates and only sort those candidates.
+
+        Args:
+            block (np.ndarray): ``(rows, columns)`` points
+            ids (np.ndarray): Primary key of each column
+            limit (int): Number of results per row
+
+        Returns:
+            list: One ranked ``(id, score)`` list per row, best first
+        """
+        threshold = np.ones(len(block), dtype=np.uint8)
+        settled = np.zeros(len(block), dtype=bool)
+        for level in range(MAX_POINTS, 1, -1):
+            reached = np.count_nonzero(block >= level, axis=1) >= limit
+            threshold[reached & ~settled] = level
+            settled |= reached
+            if settled.all():
+                break
+
+        results = []
+        for row, level in zip(block, threshold):
+            candidates = np.flatnonzero(row >= level)
+            points = row[candidates]
+            order = np.lexsort((ids[candidates], -points.astype(np.int16)))[:limit]
+            results.append([(int(ids[candidates[i]]), int(points[i]) / MAX_POINTS) for i in order])
+        return results
+
+    def deals_for_investor(self, investor_id: int, limit: int) -> list[tuple[int, float]]:
+        """Rank active deals for one investor.
+
+        Returns:
+            list: ``(deal_id, score)`` pairs, best first
+        """
+        pos = self._investor_pos.get(investor_id)
+        if pos is None:
+            return []
+        return self._top(self.score(np.array([pos]), np.arange(len(self.deal_ids))), self.deal_ids, limit)[0]
+
+    def investors_for_deal(self, deal_id: int, limit: int) -> list[tuple[int, float]]:
+        """Rank investors for one active deal.
+
+        Returns:
+            list: ``(investor_id, score)`` pairs, best first
+        """
+        pos = self._deal_pos.get(deal_id)
+        if pos is None:
+            return []
+        scores = self.score(np.arange(len(self.investor_ids)), np.array([pos]))
+        return self._top(scores.T, self.investor_ids, limit)[0]
+
+    def top_deals_for_all(self, limit: int, chunk_size: int = 256) -> dict[int, list[tuple[int, float]]]:
+        """Rank deals for every investor, scoring the full matrix in chunks.
+
+        Args:
+            limit (int): Number of deals to keep per investor
+            chunk_size (int): Investors scored per block, bounding peak memory
+
+        Returns:
+            dict: Investor id -> ``(deal_id, score)`` pairs, best first
+        """
+        results: dict[int, list[tuple[int, float]]] = {}
+        deals = np.arange(len(self.deal_ids))
+        for start in range(0, len(self.investor_ids), chunk_size):
+            rows = np.arange(start, min(start + chunk_size, len(self.investor_ids)))
+            ranked = self._top(self.score(rows, deals), self.deal_ids, limit)
+            results.update(zip(self.investor_ids[rows].tolist(), ranked))
+        return results
+
+    def investors_touching_deal(self, deal_id: int) -> np.ndarray:
+        """Return the ids of investors for whom the deal currently scores above zero."""
+        pos = self._deal_pos.get(deal_id)
+        if pos is None:
+            return np.empty(0, dtype=np.int64)
+        scores = self.score(np.arange(len(self.investor_ids)), np.array([pos]))[:, 0]
+        return self.investor_ids[scores > 0]
+
+    def deals_touching_investor(self, investor_id: int) -> np.ndarray:
+        """Return the ids of deals that currently score above zero for an investor."""
+        pos = self._investor_pos.get(investor_id)
+        if pos is None:
+            return np.empty(0, dtype=np.int64)
+        scores = self.score(np.array([pos]), np.arange(len(self.deal_ids)))[0]
+        return self.deal_ids[scores > 0]
+
+
+# Cached index and results ---------------------------------------------------
+
+def get_match_index() -> MatchIndex:
+    """Return the cached match index, building it if missing.
+
+    Returns:
+        MatchIndex: The current index
+    """
+    index = cache.get(INDEX_CACHE_KEY)
+    if index is None:
+        index = MatchIndex.build()
+        if cache.add(INDEX_LOCK_KEY, 1, timeout=settings.MATCHING_LOCK_TIMEOUT):
+            try:
+                cache.set(INDEX_CACHE_KEY, index, timeout=settings.MATCHING_INDEX_TTL)
+            finally:
+                cache.delete(INDEX_LOCK_KEY)
+    return index
+
+
+def _generation() -> int:
+    return cache.get(GENERATION_KEY, 1)
+
+
+def _next_generation() -> None:
+    """Orphan every cached ranking, which then ages out of the cache on its own."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 2, timeout=None)
+
+
+def _update_index(update) -> Optional[set[int]]:
+    """Apply ``update(index)`` to the cached index under the index lock.
+
+    If another worker holds the lock the cached index is dropped instead, so
+    the next reader rebuilds it from the database rather than losing an update.
+    Either way, if the index isn't patched the cached rankings may be stale
+    and a new generation of them is started.
+
+    Returns:
+        set: Whatever ``update`` returned, or ``None`` if the index was not patched
+    """
+    if not cache.add(INDEX_LOCK_KEY, 1, timeout=settings.MATCHING_LOCK_TIMEOUT):
+        cache.delete(INDEX_CACHE_KEY)
+        _next_generation()
+        return None
+    try:
+        index = cache.get(INDEX_CACHE_KEY)
+        if index is None:
+            _next_generation()
+            return None
+        affected = update(index)
+        cache.set(INDEX_CACHE_KEY, index, timeout=settings.MATCHING_INDEX_TTL)
+        return affected
+    finally:
+        cache.delete(INDEX_LOCK_KEY)
+
+
+def _cached_ranking(key: str, pk: int, limit: Optional[int], rank) -> list[tuple[int, float]]:
+    """Return ``rank(n)`` from cache, recomputing if missing or too short."""
+    limit = limit or settings.MATCHING_RESULTS_LIMIT
+    key = key.format(_generation(), pk)
+    entry = cache.get(key)
+    if entry is None or entry[0] < limit:
+        size = max(limit, settings.MATCHING_RESULTS_LIMIT)
+        entry = (size, rank(size))
+        cache.set(key, entry, timeout=settings.MATCHING_INDEX_TTL)
+    return entry[1][:limit]
+
+
+def rank_deals_for_investor(investor_id: int, limit: Optional[int] = None) -> list[tuple[int, float]]:
+    """Return the best-matching active deals for an investor, cached per investor.
+
+    Args:
+        investor_id (int): The investor profile's primary key
+        limit (int, optional): Number of deals; defaults to ``MATCHING_RESULTS_LIMIT``
+
+    Returns:
+        list: ``(deal_id, score)`` pairs, best first
+    """
+    return _cached_ranking(
+        INVESTOR_RESULTS_KEY, investor_id, limit,
+        lambda size: get_match_index().deals_for_investor(investor_id, size),
+    )
+
+
+def rank_investors_for_deal(deal_id: int, limit: Optional[int] = None) -> list[tuple[int, float]]:
+    """Return the best-matching investors for a deal, cached per deal.
+
+    Args:
+        deal_id (int): The deal's primary key
+        limit (int, optional): Number of investors; defaults to ``MATCHING_RESULTS_LIMIT``
+
+    Returns:
+        list: ``(investor_id, score)`` pairs, best first
+    """
+    return _cached_ranking(
+        DEAL_RESULTS_KEY, deal_id, limit,
+        lambda size: get_match_index().investors_for_deal(deal_id, size),
+    )
+
+
+def _forget_results(key: str, ids: Iterable[int]) -> None:
+    generation = _generation()
+    cache.delete_many([key.format(generation, pk) for pk in ids])
+
+
+def investors_changed(investor_ids: Iterable[int]) -> None:
+    """Re-encode investors and drop only the cached results they can affect.
+
+    The deals affected are those scoring above zero for an investor before
+    or after the change. Investors that no longer exist are removed.
+    """
+    investor_ids = list(investor_ids)
+
+    def update(index: MatchIndex) -> set[int]:
+        rows = {row[0]: row for row in InvestorProfile.objects.filter(pk__in=investor_ids).values_list(*INVESTOR_COLUMNS)}
+        affected: set[int] = set()
+        for investor_id in investor_ids:
+            affected.update(int(pk) for pk in index.deals_touching_investor(investor_id))
+            if investor_id in rows:
+                index.upsert_investor(*rows[investor_id])
+                affected.update(int(pk) for pk in index.deals_touching_investor(investor_id))
+            else:
+                index.remove_investor(investor_id)
+        return affected
+
+    affected = _update_index(update)
+    if affected is not None:
+        _forget_results(INVESTOR_RESULTS_KEY, investor_ids)
+        _forget_results(DEAL_RESULTS_KEY, affected)
+
+
+def deals_changed(deal_ids: Iterable[int]) -> None:
+    """Re-encode deals and drop only the cached results they can affect.
+
+    The investors affected are those for whom a deal scores above zero
+    before or after the change. Deals that are no longer active are removed.
+    """
+    deal_ids = list(deal_ids)
+
+    def update(index: MatchIndex) -> set[int]:
+        rows = {row[0]: row for row in Deal.objects.filter(pk__in=deal_ids, status='active').values_list(*DEAL_COLUMNS)}
+        affected: set[int] = set()
+        for deal_id in deal_ids:
+            affected.update(int(pk) for pk in index.investors_touching_deal(deal_id))
+            if deal_id in rows:
+                index.upsert_deal(*rows[deal_id])
+                affected.update(int(pk) for pk in index.investors_touching_deal(deal_id))
+            else:
+                index.remove_deal(deal_id)
+        return affected
+
+    affected = _update_index(update)
+    if affected is not None:
+        _forget_results(DEAL_RESULTS_KEY, deal_ids)
+        _forget_results(INVESTOR_RESULTS_KEY, affected)
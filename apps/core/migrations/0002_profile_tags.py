@@ -0,0 +1,115 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def _normalize(value):
+    return str(value).strip().casefold()[:100]
+
+
+def backfill_tags(apps, schema_editor):
+    """Mirror existing JSON preferences into the tag tables."""
+    sources = [
+        ('InvestorProfile', 'InvestorTag', 'investor', lambda p: (
+            [('industry', v) for v in list(p.preferred_industries or []) + list(p.sectors_of_interest or [])]
+            + [('stage', v) for v in p.preferred_stages or []]
+        )),
+        ('StartupProfile', 'StartupTag', 'startup', lambda p: [('industry', p.industry), ('stage', p.stage)]),
+        ('IndividualProfile', 'IndividualTag', 'individual', lambda p: [('industry', v) for v in p.interests or []]),
+    ]
+    for profile_name, tag_name, relation, extract in sources:
+        profile_model = apps.get_model('core', profile_name)
+        tag_model = apps.get_model('core', tag_name)
+        rows = []
+        for profile in profile_model.objects.iterator(chunk_size=2000):
+            tags = {(kind, _normalize(value)) for kind, value in extract(profile)}
+            rows.extend(
+                tag_model(kind=kind, value=value, **{f'{relation}_id': profile.pk})
+                for kind, value in tags if value
+            )
+            if len(rows) >= 5000:
+                tag_model.objects.bulk_create(rows, ignore_conflicts=True)
+                rows = []
+        tag_model.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='startupprofile',
+            name='revenue_range',
+            field=models.CharField(choices=[('pre_revenue', 'ما قبل الإيرادات'), ('0-100k', '0 - 100 ألف دولار'), ('100k-500k', '100 - 500 ألف دولار'), ('500k-1m', '500 ألف - مليون دولار'), ('1m-5m', 'مليون - 5 مليون دولار'), ('5m+', 'أكثر من 5 مليون دولار')], default='pre_revenue', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='startupprofile',
+            name='stage',
+            field=models.CharField(choices=[('idea', 'مرحلة الفكرة'), ('mvp', 'النموذج الأولي'), ('seed', 'مرحلة التأسيس'), ('series_a', 'الجولة الأولى'), ('series_b', 'الجولة الثانية'), ('series_c', 'الجولة الثالثة'), ('growth', 'مرحلة النمو')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='InvestorTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('industry', 'Industry'), ('stage', 'Stage')], max_length=10)),
+                ('value', models.CharField(max_length=100)),
+                ('investor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='core.investorprofile')),
+            ],
+            options={
+                'verbose_name': 'Investor Tag',
+                'verbose_name_plural': 'Investor Tags',
+            },
+        ),
+        migrations.CreateModel(
+            name='IndividualTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('industry', 'Industry'), ('stage', 'Stage')], max_length=10)),
+                ('value', models.CharField(max_length=100)),
+                ('individual', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='core.individualprofile')),
+            ],
+            options={
+                'verbose_name': 'Individual Tag',
+                'verbose_name_plural': 'Individual Tags',
+            },
+        ),
+        migrations.CreateModel(
+            name='StartupTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('industry', 'Industry'), ('stage', 'Stage')], max_length=10)),
+                ('value', models.CharField(max_length=100)),
+                ('startup', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='core.startupprofile')),
+            ],
+            options={
+                'verbose_name': 'Startup Tag',
+                'verbose_name_plural': 'Startup Tags',
+                'indexes': [models.Index(fields=['kind', 'value', 'startup'], name='startup_tag_lookup')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='startuptag',
+            constraint=models.UniqueConstraint(fields=('startup', 'kind', 'value'), name='unique_startup_tag'),
+        ),
+        migrations.AddIndex(
+            model_name='investortag',
+            index=models.Index(fields=['kind', 'value', 'investor'], name='investor_tag_lookup'),
+        ),
+        migrations.AddConstraint(
+            model_name='investortag',
+            constraint=models.UniqueConstraint(fields=('investor', 'kind', 'value'), name='unique_investor_tag'),
+        ),
+        migrations.AddIndex(
+            model_name='individualtag',
+            index=models.Index(fields=['kind', 'value', 'individual'], name='individual_tag_lookup'),
+        ),
+        migrations.AddConstraint(
+            model_name='individualtag',
+            constraint=models.UniqueConstraint(fields=('individual', 'kind', 'value'), name='unique_individual_tag'),
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_profile_tags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='deal',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['-created_at', '-id'], name='deal_active_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='deal',
+            index=models.Index(fields=['status', 'amount_raised'], name='deal_status_raised'),
+        ),
+        migrations.AddIndex(
+            model_name='investorprofile',
+            index=models.Index(condition=models.Q(('verified', True)), fields=['-total_investments', '-id'], name='investor_verified_active'),
+        ),
+        migrations.AddIndex(
+            model_name='investorprofile',
+            index=models.Index(fields=['location'], name='investor_location'),
+        ),
+        migrations.AddIndex(
+            model_name='startupprofile',
+            index=models.Index(condition=models.Q(('verified', True)), fields=['-founding_date', '-id'], name='startup_verified_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='startupprofile',
+            index=models.Index(condition=models.Q(('verified', True)), fields=['-total_funding_raised'], name='startup_verified_funded'),
+        ),
+        migrations.AddIndex(
+            model_name='startupprofile',
+            index=models.Index(fields=['industry'], name='startup_industry'),
+        ),
+        migrations.AddIndex(
+            model_name='startupprofile',
+            index=models.Index(fields=['stage'], name='startup_stage'),
+        ),
+        migrations.AddIndex(
+            model_name='startupprofile',
+            index=models.Index(fields=['location'], name='startup_location'),
+        ),
+        migrations.AddIndex(
+            model_name='startupprofile',
+            index=models.Index(fields=['revenue_range'], name='startup_revenue_range'),
+        ),
+    ]
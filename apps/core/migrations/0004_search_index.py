@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:05
+
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    """Create the backend-specific search table and index the existing rows."""
+    from apps.core.search import get_search_backend, rebuild_search_index
+
+    using = schema_editor.connection.alias
+    get_search_backend(using).install()
+    rebuild_search_index(using=using, models={
+        'startup': apps.get_model('core', 'StartupProfile'),
+        'deal': apps.get_model('core', 'Deal'),
+    })
+
+
+def uninstall_search_index(apps, schema_editor):
+    from apps.core.search import get_search_backend
+
+    get_search_backend(schema_editor.connection.alias).uninstall()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:42
+
+import apps.core.storage
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='deal',
+            name='deal_documents',
+            field=models.FileField(blank=True, null=True, storage=apps.core.storage.ContentAddressedStorage(), upload_to='deal_documents/'),
+        ),
+        migrations.AlterField(
+            model_name='startupprofile',
+            name='pitch_deck',
+            field=models.FileField(blank=True, null=True, storage=apps.core.storage.ContentAddressedStorage(), upload_to='pitch_decks/'),
+        ),
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.PositiveBigIntegerField()),
+                ('received', models.PositiveBigIntegerField(default=0)),
+                ('sha256', models.CharField(blank=True, max_length=64)),
+                ('name', models.CharField(blank=True, help_text='Storage name once complete', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Upload',
+                'verbose_name_plural': 'Uploads',
+            },
+        ),
+    ]
@@ -0,0 +1,267 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db.models import QuerySet
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils.translation import gettext_lazy as _
+from typing import Any, Dict, Optional
+from .pagination import InvalidCursor, KeysetPaginator
+from .tags import filter_by_tags
+
+
+class QueryShapingMixin:
+    """Declaratively shape a list view's queryset for the template it renders.
+
+    Each view declares the relations its template follows and the exact
+    columns it reads, so a page is loaded with a fixed number of queries
+    instead of one extra query per card.
+
+    Attributes:
+        select_related (tuple): Forward relations joined into the main query
+        prefetch_related (tuple): Reverse/M2M relations (or ``Prefetch`` objects) loaded in bulk
+        only_fields (tuple): Columns the template reads; everything else is deferred
+        query_budget (int): Maximum number of queries an anonymous page render may issue in
+            cursor pagination mode (see ``get_query_budget``)
+    """
+    select_related: tuple = ()
+    prefetch_related: tuple = ()
+    only_fields: tuple = ()
+    query_budget: Optional[int] = None
+
+    def shape_queryset(self, queryset: QuerySet) -> QuerySet:
+        """Apply the declared relations and column list to a queryset.
+
+        Args:
+            queryset (QuerySet): The queryset to shape
+
+        Returns:
+            QuerySet: The shaped queryset
+        """
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only_fields:
+            queryset = queryset.only(*self.only_fields)
+        return queryset
+
+    def get_query_budget(self) -> Optional[int]:
+        """Return the most queries an anonymous render of this page may issue.
+
+        Returns:
+            int: ``query_budget``, plus whatever the pagination mode adds
+        """
+        return self.query_budget
+
+    def get_queryset(self) -> QuerySet:
+        """Return the parent queryset shaped for the template.
+
+        Returns:
+            QuerySet: The shaped queryset
+        """
+        return self.shape_queryset(super().get_queryset())
+
+
+class CursorPaginationMixin:
+    """Paginate a ``ListView`` with opaque keyset cursors instead of page numbers.
+
+    The view's first ``ordering`` field is used as the keyset, with the
+    primary key as tiebreaker. Set ``LIST_PAGINATION_MODE = 'offset'`` to
+    fall back to Django's numbered ``Paginator``.
+
+    Attributes:
+        cursor_kwarg (str): Query string parameter carrying the cursor
+    """
+    cursor_kwarg: str = 'cursor'
+
+    def get_pagination_mode(self) -> str:
+        """Return ``'cursor'`` or ``'offset'`` according to settings.
+
+        Returns:
+            str: The active pagination mode
+        """
+        return getattr(settings, 'LIST_PAGINATION_MODE', 'cursor')
+
+    def get_query_budget(self) -> Optional[int]:
+        """Add the ``COUNT(*)`` that numbered pages issue to the declared budget.
+
+        Returns:
+            int: The budget for the active pagination mode
+        """
+        budget = super().get_query_budget()
+        if budget is not None and self.get_pagination_mode() != 'cursor':
+            budget += 1
+        return budget
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple:
+        """Paginate the queryset with a ``KeysetPaginator`` in cursor mode.
+
+        Args:
+            queryset (QuerySet): The queryset to paginate
+            page_size (int): Number of objects per page
+
+        Returns:
+            tuple: ``(paginator, page, object_list, is_paginated)``
+
+        Raises:
+            Http404: If the cursor is invalid
+        """
+        if self.get_pagination_mode() != 'cursor':
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size, self.get_ordering()[0])
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404(_('Invalid cursor.'))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    async def apaginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple:
+        """Async variant of ``paginate_queryset`` that loads the page with the async ORM.
+
+        Args:
+            queryset (QuerySet): The queryset to paginate
+            page_size (int): Number of objects per page
+
+        Returns:
+            tuple: ``(paginator, page, object_list, is_paginated)``, with the page loaded
+
+        Raises:
+            Http404: If the cursor or page number is invalid
+        """
+        if self.get_pagination_mode() == 'cursor':
+            paginator = KeysetPaginator(queryset, page_size, self.get_ordering()[0])
+            try:
+                page = await paginator.apage(self.request.GET.get(self.cursor_kwarg))
+            except InvalidCursor:
+                raise Http404(_('Invalid cursor.'))
+            return (paginator, page, page.object_list, page.has_other_pages())
+
+        paginator = self.get_paginator(
+            queryset, page_size, orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        # Prime the paginator's cached count so page lookups stay off the sync ORM.
+        paginator.count = await queryset.acount()
+        page_number = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+        try:
+            page_number = paginator.num_pages if page_number == 'last' else int(page_number)
+            page = paginator.page(page_number)
+        except (ValueError, InvalidPage):
+            raise Http404(_('Invalid page.'))
+        page.object_list = [obj async for obj in page.object_list]
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
+        """Add the query string to carry over into pagination links.
+
+        Args:
+            **kwargs: Additional keyword arguments from the parent class
+
+        Returns:
+            Dict[str, Any]: The enhanced template context
+        """
+        context = super().get_context_data(**kwargs)
+        params = self.request.GET.copy()
+        params.pop(self.page_kwarg, None)
+        params.pop(self.cursor_kwarg, None)
+        context['pagination_query'] = params.urlencode()
+        return context
+
+
+class TagFilterMixin:
+    """Filter a profile ``ListView`` by ``?industry=`` and ``?stage=`` through the tag index.
+
+    Attributes:
+        tag_filters (tuple): Query string parameters mapped onto tag kinds
+        stage_choices (list): Stage options offered by the filter form
+    """
+    tag_filters: tuple = ('industry', 'stage')
+    stage_choices: list = []
+
+    def get_tag_filters(self) -> Dict[str, str]:
+        """Return the requested tag filters.
+
+        Returns:
+            Dict[str, str]: Tag kind to the raw value from the query string
+        """
+        return {kind: self.request.GET.get(kind, '').strip() for kind in self.tag_filters}
+
+    def get_queryset(self) -> QuerySet:
+        """Return the parent queryset narrowed to the requested tags.
+
+        Returns:
+            QuerySet: The filtered queryset
+        """
+        return filter_by_tags(super().get_queryset(), **self.get_tag_filters())
+
+    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
+        """Add the active filters and stage options for the filter form.
+
+        Args:
+            **kwargs: Additional keyword arguments from the parent class
+
+        Returns:
+            Dict[str, Any]: The enhanced template context
+        """
+        context = super().get_context_data(**kwargs)
+        context['filters'] = self.get_tag_filters()
+        context['stage_choices'] = self.stage_choices
+        return context
+
+
+async def aresolve_user(request: HttpRequest) -> None:
+    """Load ``request.user`` off the event loop.
+
+    The authentication middleware installs a lazy user that reads the
+    session and user tables on first access, which the async views must
+    not do from async code.
+
+    Args:
+        request (HttpRequest): The HTTP request object
+    """
+    await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+class AsyncListMixin:
+    """Serve a ``ListView`` from an ``async def get`` using the async ORM.
+
+    The page is loaded with async iteration before the context is built,
+    so the view's synchronous ``get_context_data`` and its template never
+    touch the database. Combine with ``CursorPaginationMixin``.
+    """
+    paginated: Optional[tuple] = None
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        """Load the page asynchronously, then render it.
+
+        Args:
+            request (HttpRequest): The HTTP request object
+            *args: Positional arguments from the URL
+            **kwargs: Keyword arguments from the URL
+
+        Returns:
+            HttpResponse: The rendered list page
+        """
+        await aresolve_user(request)
+        self.object_list = self.get_queryset()
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            self.paginated = await self.apaginate_queryset(self.object_list, page_size)
+        else:
+            self.object_list = [obj async for obj in self.object_list]
+        return self.render_to_response(self.get_context_data())
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple:
+        """Return the page loaded by ``get``.
+
+        Args:
+            queryset (QuerySet): The queryset to paginate
+            page_size (int): Number of objects per page
+
+        Returns:
+            tuple: ``(paginator, page, object_list, is_paginated)``
+        """
+        if self.paginated is not None:
+            return self.paginated
+        return super().paginate_queryset(queryset, page_size)
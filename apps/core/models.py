@@ -1,6 +1,9 @@
+import uuid
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
+from .storage import document_storage
 
 class User(AbstractUser):
     USER_TYPES = [
@@ -17,6 +20,8 @@ class User(AbstractUser):
     email = models.EmailField(unique=True)
     bio = models.TextField(blank=True)
     profile_image = models.ImageField(upload_to='profiles/', blank=True, null=True)
+    profile_image_variants = models.JSONField(default=dict, blank=True, editable=False,
+                                              help_text='Resized copies built by apps.core.images')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -59,9 +64,21 @@ class InvestorProfile(models.Model):
     linkedin_url = models.URLField(blank=True)
     crunchbase_url = models.URLField(blank=True)
 
+    # Versions the cached investor card
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         verbose_name = _('Investor Profile')
         verbose_name_plural = _('Investor Profiles')
+        indexes = [
+            # Public investors list: verified only, most active first
+            models.Index(
+                fields=['-total_investments', '-id'],
+                condition=models.Q(verified=True),
+                name='investor_verified_active',
+            ),
+            models.Index(fields=['location'], name='investor_location'),
+        ]
 
     def __str__(self):
         return f"{self.company_name} - {self.user.email}"
@@ -105,7 +122,7 @@ class StartupProfile(models.Model):
     crunchbase_url = models.URLField(blank=True)
     
     # Fundraising
-    pitch_deck = models.FileField(upload_to='pitch_decks/', blank=True, null=True)
+    pitch_deck = models.FileField(upload_to='pitch_decks/', storage=document_storage, blank=True, null=True)
     total_funding_raised = models.DecimalField(max_digits=15, decimal_places=2, default=0)
     current_funding_target = models.DecimalField(max_digits=15, decimal_places=2)
     min_ticket_size = models.DecimalField(max_digits=15, decimal_places=2)
@@ -117,9 +134,31 @@ class StartupProfile(models.Model):
     # Verification
     verified = models.BooleanField(default=False)
 
+    # Versions the cached startup and deal cards
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         verbose_name = _('Startup Profile')
         verbose_name_plural = _('Startup Profiles')
+        indexes = [
+            # Public startups list: verified only, newest first
+            models.Index(
+                fields=['-founding_date', '-id'],
+                condition=models.Q(verified=True),
+                name='startup_verified_recent',
+            ),
+            # Homepage featured startups: verified only, best funded first
+            models.Index(
+                fields=['-total_funding_raised'],
+                condition=models.Q(verified=True),
+                name='startup_verified_funded',
+            ),
+            # Admin changelist filters
+            models.Index(fields=['industry'], name='startup_industry'),
+            models.Index(fields=['stage'], name='startup_stage'),
+            models.Index(fields=['location'], name='startup_location'),
+            models.Index(fields=['revenue_range'], name='startup_revenue_range'),
+        ]
 
     def __str__(self):
         return f"{self.company_name} - {self.user.email}"
@@ -163,13 +202,25 @@ class Deal(models.Model):
     
     # Additional Info
     industry = models.CharField(max_length=100)
-    deal_documents = models.FileField(upload_to='deal_documents/', blank=True, null=True)
+    deal_documents = models.FileField(upload_to='deal_documents/', storage=document_storage, blank=True, null=True)
     terms_and_conditions = models.TextField(blank=True)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Public deals list: active only, newest first
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(status='active'),
+                name='deal_active_recent',
+            ),
+            # Status counts and the closed-deals total, answered from the index alone
+            models.Index(fields=['status', 'amount_raised'], name='deal_status_raised'),
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.startup.company_name}"
 
@@ -188,4 +239,129 @@ class IndividualProfile(models.Model):
         verbose_name_plural = _('Individual Profiles')
 
     def __str__(self):
-        return f"{self.first_name} {self.last_name} - {self.user.email}" 
\ No newline at end of file
+        return f"{self.first_name} {self.last_name} - {self.user.email}" 
+
+class ProfileTag(models.Model):
+    """Normalized, indexed copy of a profile's industry/stage preferences.
+
+    The JSON preference lists can't be indexed, so every value is mirrored
+    into a row of ``(kind, value, profile)`` that list filters can join on.
+    Rows are kept in sync on save by ``apps.core.tags``.
+    """
+    INDUSTRY = 'industry'
+    STAGE = 'stage'
+    KINDS = [
+        (INDUSTRY, _('Industry')),
+        (STAGE, _('Stage')),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KINDS)
+    value = models.CharField(max_length=100)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.kind}: {self.value}"
+
+class InvestorTag(ProfileTag):
+    investor = models.ForeignKey(InvestorProfile, on_delete=models.CASCADE, related_name='tags')
+
+    class Meta:
+        verbose_name = _('Investor Tag')
+        verbose_name_plural = _('Investor Tags')
+        constraints = [
+            models.UniqueConstraint(fields=['investor', 'kind', 'value'], name='unique_investor_tag'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'value', 'investor'], name='investor_tag_lookup'),
+        ]
+
+class StartupTag(ProfileTag):
+    startup = models.ForeignKey(StartupProfile, on_delete=models.CASCADE, related_name='tags')
+
+    class Meta:
+        verbose_name = _('Startup Tag')
+        verbose_name_plural = _('Startup Tags')
+        constraints = [
+            models.UniqueConstraint(fields=['startup', 'kind', 'value'], name='unique_startup_tag'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'value', 'startup'], name='startup_tag_lookup'),
+        ]
+
+class IndividualTag(ProfileTag):
+    individual = models.ForeignKey(IndividualProfile, on_delete=models.CASCADE, related_name='tags')
+
+    class Meta:
+        verbose_name = _('Individual Tag')
+        verbose_name_plural = _('Individual Tags')
+        constraints = [
+            models.UniqueConstraint(fields=['individual', 'kind', 'value'], name='unique_individual_tag'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'value', 'individual'], name='individual_tag_lookup'),
+        ]
+
+
+class Job(models.Model):
+    """A unit of background work, run by ``apps.core.jobs`` outside the request."""
+    STATUSES = [
+        ('queued', _('Queued')),
+        ('running', _('Running')),
+        ('failed', _('Failed')),
+    ]
+
+    name = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict, blank=True)
+    dedupe_key = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=STATUSES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Job')
+        verbose_name_plural = _('Jobs')
+        indexes = [
+            # Workers poll for the next due job
+            models.Index(fields=['run_at'], condition=models.Q(status='queued'), name='job_queued_due'),
+            # Deduplicated enqueues look for an identical queued job
+            models.Index(fields=['name', 'dedupe_key'], condition=models.Q(status='queued'), name='job_queued_dedupe'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
+class UploadSession(models.Model):
+    """A resumable upload of one document, sent to ``/uploads/`` in chunks.
+
+    Chunks are appended to a partial file outside ``MEDIA_ROOT``. Once
+    ``received`` reaches ``size`` the file is moved into the
+    content-addressed document store and ``name`` is set.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)
+    name = models.CharField(max_length=255, blank=True, help_text='Storage name once complete')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Upload')
+        verbose_name_plural = _('Uploads')
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.name)
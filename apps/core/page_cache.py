@@ -0,0 +1,205 @@
+import hashlib
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from typing import Any, Iterable, Optional
+from .profiling import render_response
+from .routers import pinned_to_primary
+
+
+PAGE_CACHE_PREFIX = 'core:page'
+
+# Which cached page groups a change to each model makes stale. The home page
+# shows stats and top-N lists of all three models; deal cards show the
+# startup's name; startup and investor cards show the user's profile image.
+INVALIDATION_GROUPS = {
+    'deal': ('home', 'deals'),
+    'startupprofile': ('home', 'startups', 'deals'),
+    'investorprofile': ('home', 'investors'),
+    'user': ('startups', 'investors'),
+}
+
+
+def _version_key(group: str) -> str:
+    return f'{PAGE_CACHE_PREFIX}:{group}:version'
+
+
+def get_group_version(group: str) -> int:
+    """Return the current version of a page group, initialising it if needed.
+
+    Args:
+        group (str): The page group name
+
+    Returns:
+        int: The group's version number
+    """
+    key = _version_key(group)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def invalidate_page_groups(groups: Iterable[str]) -> None:
+    """Invalidate every cached page in the given groups.
+
+    Bumping the group version orphans the old entries, which then age out
+    of the cache on their own.
+
+    Args:
+        groups (Iterable[str]): Page group names to invalidate
+    """
+    for group in groups:
+        key = _version_key(group)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 2, timeout=None)
+
+
+def schedule_page_invalidation(model_name: str) -> None:
+    """Invalidate the pages showing ``model_name`` once the transaction commits.
+
+    Args:
+        model_name (str): Lower-case model name, e.g. ``'deal'``
+    """
+    groups = INVALIDATION_GROUPS.get(model_name, ())
+    if groups:
+        transaction.on_commit(lambda: invalidate_page_groups(groups))
+
+
+class PageCacheMixin:
+    """Cache the rendered page for anonymous visitors.
+
+    Entries are keyed on the page group's version, the active language,
+    the path and the normalised query string, so the Arabic and English
+    variants and each page of a listing are cached separately. Cached
+    responses carry an ``ETag`` and ``Last-Modified`` and answer matching
+    conditional requests with ``304 Not Modified``.
+
+    Attributes:
+        page_cache_group (str): Group name used for targeted invalidation
+        page_cache_timeout (int): Seconds to keep a page; defaults to ``PAGE_CACHE_TIMEOUT``
+    """
+    page_cache_group: str = ''
+    page_cache_timeout: Optional[int] = None
+
+    def can_cache_page(self, request: HttpRequest) -> bool:
+        """Return whether this request may be served from and stored in the page cache.
+
+        Args:
+            request (HttpRequest): The HTTP request object
+
+        Returns:
+            bool: True for anonymous GET/HEAD requests without pending messages
+            that aren't pinned to the primary database after a write
+        """
+        return (
+            getattr(settings, 'PAGE_CACHE_ENABLED', True)
+            and request.method in ('GET', 'HEAD')
+            and not request.user.is_authenticated
+            and 'messages' not in request.COOKIES
+            and not pinned_to_primary()
+        )
+
+    def get_page_cache_key(self, request: HttpRequest) -> str:
+        """Build the cache key for this request.
+
+        Args:
+            request (HttpRequest): The HTTP request object
+
+        Returns:
+            str: The cache key
+        """
+        query = '&'.join(sorted(request.GET.urlencode().split('&')))
+        digest = hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest()
+        version = get_group_version(self.page_cache_group)
+        return f'{PAGE_CACHE_PREFIX}:{self.page_cache_group}:{version}:{translation.get_language()}:{digest}'
+
+    def make_cache_entry(self, response: HttpResponse) -> dict:
+        """Capture a rendered ``200`` response for the cache."""
+        return {
+            'content': response.content,
+            'content_type': response['Content-Type'],
+            'etag': quote_etag(hashlib.md5(response.content).hexdigest()),
+            'last_modified': int(time.time()),
+        }
+
+    def finalize_cached_response(self, request: HttpRequest, entry: dict,
+                                 response: Optional[HttpResponse] = None) -> HttpResponse:
+        """Add the validators and answer conditional requests."""
+        if response is None:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        patch_vary_headers(response, ('Cookie', 'Accept-Language'))
+        return get_conditional_response(
+            request,
+            etag=entry['etag'],
+            last_modified=entry['last_modified'],
+            response=response,
+        )
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        """Serve the page from cache when possible, otherwise render and store it.
+
+        Args:
+            request (HttpRequest): The HTTP request object
+            *args: Positional arguments from the URL
+            **kwargs: Keyword arguments from the URL
+
+        Returns:
+            HttpResponse: The cached, fresh or ``304`` response
+        """
+        if self.view_is_async:
+            return self.adispatch(request, *args, **kwargs)
+        if not self.can_cache_page(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = self.get_page_cache_key(request)
+        entry = cache.get(key)
+        response = None
+        if entry is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                render_response(response)
+            if response.status_code != 200:
+                return response
+            entry = self.make_cache_entry(response)
+            cache.set(key, entry, timeout=self.page_cache_timeout or settings.PAGE_CACHE_TIMEOUT)
+        return self.finalize_cached_response(request, entry, response)
+
+    async def adispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        """Async variant of ``dispatch`` for views with async handlers.
+
+        Args:
+            request (HttpRequest): The HTTP request object
+            *args: Positional arguments from the URL
+            **kwargs: Keyword arguments from the URL
+
+        Returns:
+            HttpResponse: The cached, fresh or ``304`` response
+        """
+        # ``can_cache_page`` reads ``request.user``, which may hit the database.
+        if not await sync_to_async(self.can_cache_page)(request):
+            return await super().dispatch(request, *args, **kwargs)
+
+        key = self.get_page_cache_key(request)
+        entry = await cache.aget(key)
+        response = None
+        if entry is None:
+            response = await super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                await sync_to_async(render_response)(response)
+            if response.status_code != 200:
+                return response
+            entry = self.make_cache_entry(response)
+            await cache.aset(key, entry, timeout=self.page_cache_timeout or settings.PAGE_CACHE_TIMEOUT)
+        return self.finalize_cached_response(request, entry, response)
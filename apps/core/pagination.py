@@ -0,0 +1,187 @@
+from django.core import signing
+from django.db.models import Q, QuerySet
+from typing import Any, Optional
+
+
+CURSOR_SALT = 'apps.core.pagination.cursor'
+
+
+class InvalidCursor(Exception):
+    """Raised when a cursor token is malformed, tampered with or stale."""
+
+
+class KeysetPage:
+    """A single page of results produced by ``KeysetPaginator``.
+
+    Mirrors the parts of ``django.core.paginator.Page`` the list templates
+    use, minus anything that needs a total count.
+
+    Attributes:
+        object_list (list): The objects on this page
+        paginator (KeysetPaginator): The paginator that produced this page
+        next_cursor (str): Opaque token for the following page, or ``None``
+        previous_cursor (str): Opaque token for the preceding page, or ``None``
+    """
+    is_cursor: bool = True
+
+    def __init__(self, object_list: list, paginator: 'KeysetPaginator',
+                 next_cursor: Optional[str], previous_cursor: Optional[str]) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self) -> str:
+        return f'<KeysetPage of {len(self.object_list)} objects>'
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Paginate a queryset by seeking past the last row seen instead of using OFFSET.
+
+    Pages are addressed by opaque, signed cursors that encode the ordering
+    value and primary key of the boundary row. Every page is a single
+    indexed range query of ``per_page + 1`` rows, no matter how deep it is,
+    and no ``COUNT(*)`` is ever issued.
+
+    The ordering is a single field (ascending or descending, e.g.
+    ``'-created_at'``) with the primary key as a unique tiebreaker in the
+    same direction.
+
+    Attributes:
+        queryset (QuerySet): The filtered, unordered base queryset
+        per_page (int): Number of objects per page
+        ordering (str): The ordering field, optionally prefixed with ``-``
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int, ordering: str) -> None:
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = ordering
+        self.descending = ordering.startswith('-')
+        self.field_name = ordering.lstrip('-')
+        self.field = queryset.model._meta.get_field(self.field_name)
+
+    def _order_by(self, reverse: bool) -> tuple[str, str]:
+        descending = self.descending != reverse
+        prefix = '-' if descending else ''
+        return (f'{prefix}{self.field_name}', f'{prefix}pk')
+
+    def _seek(self, value: Any, pk: Any, reverse: bool) -> Q:
+        """Build the row-value comparison ``(field, pk) </> (value, pk)``."""
+        descending = self.descending != reverse
+        lookup = 'lt' if descending else 'gt'
+        return (
+            Q(**{f'{self.field_name}__{lookup}': value})
+            | Q(**{self.field_name: value, f'pk__{lookup}': pk})
+        )
+
+    def encode_cursor(self, obj: Any, direction: str) -> str:
+        """Encode the position of ``obj`` into an opaque cursor.
+
+        Args:
+            obj: The boundary object of a page
+            direction (str): ``'n'`` to seek forwards, ``'p'`` to seek backwards
+
+        Returns:
+            str: A signed, URL-safe cursor token
+        """
+        value = self.field.value_to_string(obj)
+        return signing.dumps([self.ordering, value, obj.pk, direction], salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, cursor: str) -> tuple[Any, Any, str]:
+        """Decode a cursor produced by ``encode_cursor``.
+
+        Args:
+            cursor (str): The cursor token from the request
+
+        Returns:
+            tuple: The ordering value, primary key and direction
+
+        Raises:
+            InvalidCursor: If the token is malformed or belongs to another ordering
+        """
+        try:
+            ordering, value, pk, direction = signing.loads(cursor, salt=CURSOR_SALT)
+        except (signing.BadSignature, TypeError, ValueError) as exc:
+            raise InvalidCursor(cursor) from exc
+        if ordering != self.ordering or direction not in ('n', 'p'):
+            raise InvalidCursor(cursor)
+        try:
+            value = self.field.to_python(value)
+        except Exception as exc:
+            raise InvalidCursor(cursor) from exc
+        return value, pk, direction
+
+    def _page_queryset(self, cursor: Optional[str]) -> tuple[QuerySet, bool]:
+        """Return the query for the page at ``cursor`` and whether it seeks backwards."""
+        reverse = False
+        queryset = self.queryset
+        if cursor:
+            value, pk, direction = self.decode_cursor(cursor)
+            reverse = direction == 'p'
+            queryset = queryset.filter(self._seek(value, pk, reverse))
+        return queryset.order_by(*self._order_by(reverse))[:self.per_page + 1], reverse
+
+    def _build_page(self, rows: list, cursor: Optional[str], reverse: bool) -> KeysetPage:
+        """Trim the look-ahead row and work out the neighbouring cursors."""
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            has_next, has_previous = bool(rows), has_more
+        else:
+            has_next, has_previous = has_more, bool(cursor) and bool(rows)
+
+        next_cursor = self.encode_cursor(rows[-1], 'n') if has_next and rows else None
+        previous_cursor = self.encode_cursor(rows[0], 'p') if has_previous and rows else None
+        return KeysetPage(rows, self, next_cursor, previous_cursor)
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        """Return the page addressed by ``cursor`` (the first page when omitted).
+
+        Args:
+            cursor (str, optional): A cursor from a previous page's links
+
+        Returns:
+            KeysetPage: The requested page
+
+        Raises:
+            InvalidCursor: If the cursor cannot be decoded
+        """
+        queryset, reverse = self._page_queryset(cursor)
+        return self._build_page(list(queryset), cursor, reverse)
+
+    async def apage(self, cursor: Optional[str] = None) -> KeysetPage:
+        """Async variant of ``page`` that loads the rows with async iteration.
+
+        Args:
+            cursor (str, optional): A cursor from a previous page's links
+
+        Returns:
+            KeysetPage: The requested page
+
+        Raises:
+            InvalidCursor: If the cursor cannot be decoded
+        """
+        queryset, reverse = self._page_queryset(cursor)
+        return self._build_page([obj async for obj in queryset], cursor, reverse)
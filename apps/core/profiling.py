@@ -0,0 +1,238 @@
+"""Opt-in per-request profiling.
+
+With ``PROFILING_ENABLED`` on, ``ProfilingMiddleware`` records for every
+request the view, the SQL query count and time, repeated queries, the
+template render time and the response size. Each request gets a
+``Server-Timing`` header and one JSON log line on the
+``apps.core.profiling`` logger. Durations are also kept per URL name in an
+in-process ring buffer, whose percentiles are shown on the admin home page
+and served as JSON to staff at ``/profiling/``.
+
+The buffer is per process: with several workers, each reports its own
+share of the traffic.
+"""
+import json
+import logging
+import statistics
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, PermissionDenied
+from django.db import connections
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from typing import Any, Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+UNRESOLVED = '<unresolved>'
+
+current_profile: ContextVar[Optional['RequestProfile']] = ContextVar('current_profile', default=None)
+
+
+class RequestProfile:
+    """Measurements of a single request.
+
+    Attributes:
+        started (float): ``perf_counter`` value when the request came in
+        queries (int): Number of SQL statements executed
+        db_time (float): Seconds spent executing them
+        render_time (float): Seconds spent rendering templates, excluding SQL run meanwhile
+        statements (Counter): Executions per ``(sql, params)``, for spotting repeated queries
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+        """``connection.execute_wrapper`` hook timing each statement."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.statements[(sql, repr(params))] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """Number of executions that repeated an earlier statement with the same parameters."""
+        return sum(count - 1 for count in self.statements.values())
+
+    @property
+    def most_repeated(self) -> Optional[str]:
+        """The SQL run most often with the same parameters, if any ran twice."""
+        if not self.statements:
+            return None
+        (sql, _), count = self.statements.most_common(1)[0]
+        return sql if count > 1 else None
+
+
+def render_response(response: HttpResponse) -> None:
+    """Render a ``TemplateResponse``, charging the time to the current request's profile.
+
+    Views that render their response themselves (such as the page cache)
+    call this instead of ``response.render()`` so the time is attributed
+    to rendering rather than to the view.
+
+    Args:
+        response (HttpResponse): A response with a ``render`` method
+    """
+    profile = current_profile.get()
+    if profile is None or response.is_rendered:
+        response.render()
+        return
+    started, db_time = time.perf_counter(), profile.db_time
+    response.render()
+    profile.render_time += time.perf_counter() - started - (profile.db_time - db_time)
+
+
+def percentiles(durations: list[float]) -> dict[str, float]:
+    """Return the p50, p95 and p99 of durations in seconds, in milliseconds.
+
+    Args:
+        durations (list[float]): At least one duration
+
+    Returns:
+        dict[str, float]: ``{'p50', 'p95', 'p99'}``
+    """
+    durations = sorted(durations)
+    quantiles = statistics.quantiles(durations, n=100) if len(durations) > 1 else durations * 99
+    return {'p50': quantiles[49] * 1000, 'p95': quantiles[94] * 1000, 'p99': quantiles[98] * 1000}
+
+
+class TimingBuffer:
+    """The most recent request timings per URL name.
+
+    Attributes:
+        size (int): Samples kept per URL name
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._samples: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, total: float, db_time: float, render_time: float, queries: int) -> None:
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.size)
+            samples.append((total, db_time, render_time, queries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self) -> list[dict]:
+        """Return percentiles per URL name, slowest p95 first.
+
+        Returns:
+            list[dict]: ``name``, ``requests``, ``p50``/``p95``/``p99`` in ms,
+            and the mean ``db_ms``, ``render_ms`` and ``queries``
+        """
+        with self._lock:
+            snapshot = {name: list(samples) for name, samples in self._samples.items()}
+        rows = []
+        for name, samples in snapshot.items():
+            rows.append({
+                'name': name,
+                'requests': len(samples),
+                **percentiles([sample[0] for sample in samples]),
+                'db_ms': statistics.fmean(sample[1] for sample in samples) * 1000,
+                'render_ms': statistics.fmean(sample[2] for sample in samples) * 1000,
+                'queries': statistics.fmean(sample[3] for sample in samples),
+            })
+        return sorted(rows, key=lambda row: row['p95'], reverse=True)
+
+
+timings = TimingBuffer(getattr(settings, 'PROFILING_WINDOW', 1000))
+
+
+class ProfilingMiddleware:
+    """Profile every request; see the module docstring.
+
+    Goes first in ``MIDDLEWARE`` so the timings cover the rest of the
+    stack. Removed from the stack at startup unless ``PROFILING_ENABLED``.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        self.record(request, response, profile, time.perf_counter() - profile.started)
+        return response
+
+    def process_template_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        # Runs after every other middleware's hook, so rendering here is safe.
+        render_response(response)
+        return response
+
+    def record(self, request: HttpRequest, response: HttpResponse, profile: RequestProfile, total: float) -> None:
+        match = request.resolver_match
+        name = match.view_name if match else UNRESOLVED
+        if response.streaming:
+            size = int(response['Content-Length']) if response.has_header('Content-Length') else None
+        else:
+            size = len(response.content)
+        app_time = max(total - profile.db_time - profile.render_time, 0)
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={profile.db_time * 1000:.1f};desc="{profile.queries} queries"',
+            f'render;dur={profile.render_time * 1000:.1f}',
+            f'app;dur={app_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ))
+        timings.add(name, total, profile.db_time, profile.render_time, profile.queries)
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': name,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'db_ms': round(profile.db_time * 1000, 2),
+            'render_ms': round(profile.render_time * 1000, 2),
+            'queries': profile.queries,
+            'duplicate_queries': profile.duplicates,
+            'most_repeated_sql': profile.most_repeated,
+            'bytes': size,
+        }))
+
+
+def profiling_stats(request: HttpRequest) -> JsonResponse:
+    """Return the per-URL-name percentiles as JSON; staff only.
+
+    ``POST`` empties the buffer.
+
+    Args:
+        request (HttpRequest): The HTTP request object
+
+    Returns:
+        JsonResponse: ``{'enabled': bool, 'window': int, 'views': [...]}``
+    """
+    if not (request.user.is_authenticated and request.user.is_staff):
+        raise PermissionDenied
+    if request.method == 'POST':
+        timings.clear()
+    return JsonResponse({
+        'enabled': getattr(settings, 'PROFILING_ENABLED', False),
+        'window': timings.size,
+        'views': timings.summary(),
+    })
@@ -0,0 +1,101 @@
+"""Read-replica routing.
+
+``ReplicaRouter`` sends every write to ``default``, and reads to the
+databases listed in ``DATABASE_REPLICAS`` only where that was allowed by
+``ReplicaPinningMiddleware``: in requests with a safe method. Management
+commands, migrations and background jobs read from the primary, since
+they usually read back what they just wrote. Models whose reads must see
+the latest write, like sessions and the job queue, always use the primary
+(``PRIMARY_ONLY_MODELS``).
+
+The middleware also provides read-your-writes: after a request with an
+unsafe method, the same client keeps reading from the primary for
+``REPLICA_STICKY_SECONDS``, which covers the redirect after a form post
+and the pages that follow while the replicas catch up.
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpRequest, HttpResponse
+from typing import Callable, Iterator, Optional
+
+PRIMARY_COOKIE = 'raya_primary'
+UNSAFE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+_replica_reads: ContextVar[bool] = ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def _reads_from_replicas(allowed: bool) -> Iterator[None]:
+    token = _replica_reads.set(allowed)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def use_primary():
+    """Route every read in the block to the primary database."""
+    return _reads_from_replicas(False)
+
+
+def use_replicas():
+    """Let reads in the block go to the replicas."""
+    return _reads_from_replicas(True)
+
+
+def pinned_to_primary() -> bool:
+    """Return whether reads in the current context go to the primary."""
+    return not _replica_reads.get()
+
+
+class ReplicaRouter:
+    """Spread reads over the replicas; keep writes and migrations on the primary."""
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        replicas = getattr(settings, 'DATABASE_REPLICAS', ())
+        if not replicas or pinned_to_primary() or model._meta.label_lower in settings.PRIMARY_ONLY_MODELS:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        # Replicas hold the same rows as the primary.
+        databases = {DEFAULT_DB_ALIAS, *getattr(settings, 'DATABASE_REPLICAS', ())}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, model_name: Optional[str] = None, **hints) -> bool:
+        # Replicas receive the schema through replication.
+        return db not in getattr(settings, 'DATABASE_REPLICAS', ())
+
+
+class ReplicaPinningMiddleware:
+    """Allow replica reads in safe requests, except shortly after the client wrote; see the module docstring."""
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        unsafe = request.method in UNSAFE_METHODS
+        try:
+            sticky = float(request.COOKIES.get(PRIMARY_COOKIE, 0)) > time.time()
+        except ValueError:
+            sticky = False
+        if not (unsafe or sticky):
+            with use_replicas():
+                return self.get_response(request)
+
+        response = self.get_response(request)
+        if unsafe:
+            seconds = settings.REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                PRIMARY_COOKIE, str(time.time() + seconds), max_age=seconds, httponly=True, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,348 @@
+import re
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils.module_loading import import_string
+from typing import Any, Iterable, Optional
+from .models import Deal, StartupProfile
+
+
+SEARCH_TABLE = 'core_search_index'
+
+# Arabic letters that are written interchangeably in practice.
+ARABIC_FOLDS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ؤ': 'و', 'ئ': 'ي', 'ى': 'ي',
+    'ة': 'ه',
+    'ـ': None,  # tatweel
+})
+ARABIC_DIACRITICS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed]')
+# The definite article and the prepositions fused to it, stripped from words
+# long enough to keep a three-letter stem.
+ARABIC_ARTICLE = re.compile(r'\b(?:وال|بال|كال|فال|لل|ال)(?=\w{3})')
+WORD = re.compile(r'\w+')
+
+
+def normalize_text(text: str) -> str:
+    """Fold text to its searchable form.
+
+    Arabic loses diacritics, tatweel and the definite article, and
+    alef/hamza variants, alef maqsura and taa marbuta collapse to a single
+    letter each. Everything is case-folded. English stemming is left to the
+    backend.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: The normalized text
+    """
+    text = ARABIC_DIACRITICS.sub('', text or '').translate(ARABIC_FOLDS)
+    return ARABIC_ARTICLE.sub('', text).casefold()
+
+
+def query_terms(query: str) -> list[str]:
+    """Split a user query into normalized words, dropping any operator syntax."""
+    return WORD.findall(normalize_text(query))
+
+
+def startup_document(startup: StartupProfile) -> tuple[str, str]:
+    return startup.company_name, ' '.join((startup.tagline, startup.description, startup.industry))
+
+
+def deal_document(deal: Deal) -> tuple[str, str]:
+    return deal.title, ' '.join((deal.description, deal.industry))
+
+
+# kind -> (model, indexed fields, public filter, document builder). The
+# kind's position doubles as its code in the row ids, so only append.
+SEARCH_SOURCES = {
+    'startup': (StartupProfile, ('company_name', 'tagline', 'description', 'industry', 'verified'),
+                Q(verified=True), startup_document),
+    'deal': (Deal, ('title', 'description', 'industry', 'status'),
+             Q(status='active'), deal_document),
+}
+KINDS = list(SEARCH_SOURCES)
+
+
+def row_id(kind: str, pk: int) -> int:
+    """Pack ``(kind, pk)`` into the index row id, so updates hit the primary key."""
+    return pk * len(KINDS) + KINDS.index(kind)
+
+
+def split_row_id(rowid: int) -> tuple[str, int]:
+    pk, code = divmod(rowid, len(KINDS))
+    return KINDS[code], pk
+
+
+def kind_of(model: type) -> Optional[str]:
+    for kind, (source_model, *_) in SEARCH_SOURCES.items():
+        if source_model is model:
+            return kind
+    return None
+
+
+def is_public(kind: str, obj: Any) -> bool:
+    if kind == 'startup':
+        return bool(obj.verified)
+    return obj.status == 'active'
+
+
+class BaseSearchBackend:
+    """Interface of a search backend.
+
+    Rows are keyed by ``row_id(kind, pk)`` and hold a weighted title, a
+    body and a ``public`` flag; the site only searches public rows while
+    the admin searches all of them.
+
+    Attributes:
+        using (str): Database alias holding the index
+    """
+
+    def __init__(self, using: str = 'default') -> None:
+        self.using = using
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def install(self) -> None:
+        raise NotImplementedError
+
+    def uninstall(self) -> None:
+        raise NotImplementedError
+
+    def upsert(self, rows: Iterable[tuple[int, bool, str, str]]) -> None:
+        """Write ``(rowid, public, title, body)`` rows, replacing existing ones."""
+        raise NotImplementedError
+
+    def delete(self, rowids: Iterable[int]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def query(self, terms: list[str], kinds: list[str], public_only: bool, limit: int) -> list[tuple[int, float]]:
+        """Return ``(rowid, score)`` pairs, best match first."""
+        raise NotImplementedError
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """FTS5 index with the Porter stemmer, ranked by BM25 (title weighted 10×)."""
+
+    def install(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+                "public UNINDEXED, title, body, tokenize='porter unicode61 remove_diacritics 2')"
+            )
+
+    def uninstall(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+    def upsert(self, rows: Iterable[tuple[int, bool, str, str]]) -> None:
+        rows = [(rowid, int(public), title, body) for rowid, public, title, body in rows]
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, public, title, body) VALUES (%s, %s, %s, %s)', rows
+            )
+
+    def delete(self, rowids: Iterable[int]) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [(rowid,) for rowid in rowids])
+
+    def clear(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+
+    def query(self, terms: list[str], kinds: list[str], public_only: bool, limit: int) -> list[tuple[int, float]]:
+        # Quote every term so user input can't inject FTS syntax; the last
+        # one is a prefix so results appear while the user is typing.
+        match = ' '.join(f'"{term}"' for term in terms[:-1])
+        match = f'{match} "{terms[-1]}"*'.strip()
+        codes = ', '.join(str(KINDS.index(kind)) for kind in kinds)
+        sql = (
+            f'SELECT rowid, bm25({SEARCH_TABLE}, 0.0, 10.0, 1.0) AS score FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s AND rowid %% {len(KINDS)} IN ({codes})'
+            + (' AND public = 1' if public_only else '')
+            + ' ORDER BY score LIMIT %s'
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [match, limit])
+            # BM25 is lower-is-better; flip it so higher scores rank first.
+            return [(rowid, -score) for rowid, score in cursor.fetchall()]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """``tsvector`` index with a GIN index, English stemming and ``ts_rank`` (title weight A)."""
+
+    def install(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+                'id bigint PRIMARY KEY, public boolean NOT NULL, document tsvector NOT NULL)'
+            )
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)'
+            )
+
+    def uninstall(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+    def upsert(self, rows: Iterable[tuple[int, bool, str, str]]) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (id, public, document) VALUES (%s, %s, '
+                "setweight(to_tsvector('english', %s), 'A') || setweight(to_tsvector('english', %s), 'B')) "
+                'ON CONFLICT (id) DO UPDATE SET public = EXCLUDED.public, document = EXCLUDED.document',
+                list(rows),
+            )
+
+    def delete(self, rowids: Iterable[int]) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE id = ANY(%s)', [list(rowids)])
+
+    def clear(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {SEARCH_TABLE}')
+
+    def query(self, terms: list[str], kinds: list[str], public_only: bool, limit: int) -> list[tuple[int, float]]:
+        tsquery = ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+        codes = [KINDS.index(kind) for kind in kinds]
+        sql = (
+            f"SELECT id, ts_rank(document, to_tsquery('english', %s)) AS score FROM {SEARCH_TABLE} "
+            f"WHERE document @@ to_tsquery('english', %s) AND id %% {len(KINDS)} = ANY(%s)"
+            + (' AND public' if public_only else '')
+            + ' ORDER BY score DESC LIMIT %s'
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [tsquery, tsquery, codes, limit])
+            return cursor.fetchall()
+
+
+BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend(using: str = 'default') -> BaseSearchBackend:
+    """Return the search backend for a database.
+
+    ``settings.SEARCH_BACKEND`` may name a backend class by dotted path;
+    otherwise one is picked from the database vendor.
+
+    Args:
+        using (str): Database alias
+
+    Returns:
+        BaseSearchBackend: The backend
+
+    Raises:
+        NotImplementedError: If no backend supports the database
+    """
+    path = getattr(settings, 'SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)(using)
+    vendor = connections[using].vendor
+    if vendor not in BACKENDS:
+        raise NotImplementedError(f'No search backend for {vendor}')
+    return BACKENDS[vendor](using)
+
+
+def index_objects(kind: str, objects: Iterable[Any], using: str = 'default') -> None:
+    """Add or refresh objects of one kind in the search index."""
+    build = SEARCH_SOURCES[kind][3]
+    rows = []
+    for obj in objects:
+        title, body = build(obj)
+        rows.append((row_id(kind, obj.pk), is_public(kind, obj), normalize_text(title), normalize_text(body)))
+    if rows:
+        get_search_backend(using).upsert(rows)
+
+
+def reindex(kind: str, pks: Iterable[int]) -> None:
+    """Re-read and reindex objects by primary key, dropping those that no longer exist."""
+    model, fields = SEARCH_SOURCES[kind][:2]
+    pks = set(pks)
+    objects = list(model.objects.filter(pk__in=pks).only(*fields))
+    index_objects(kind, objects)
+    missing = pks - {obj.pk for obj in objects}
+    if missing:
+        get_search_backend().delete(row_id(kind, pk) for pk in missing)
+
+
+def rebuild_search_index(batch_size: int = 2000, using: str = 'default',
+                         models: Optional[dict[str, type]] = None) -> int:
+    """Rebuild the whole index from the database.
+
+    Args:
+        batch_size (int): Rows read and written per batch
+        using (str): Database alias
+        models (dict, optional): Model class per kind, e.g. historical models in a migration
+
+    Returns:
+        int: Number of indexed objects
+    """
+    get_search_backend(using).clear()
+    total = 0
+    for kind, (model, fields, *_) in SEARCH_SOURCES.items():
+        model = (models or {}).get(kind, model)
+        batch = []
+        for obj in model._default_manager.using(using).only(*fields).iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) == batch_size:
+                index_objects(kind, batch, using)
+                total += len(batch)
+                batch = []
+        index_objects(kind, batch, using)
+        total += len(batch)
+    return total
+
+
+def search_ids(query: str, kinds: Optional[Iterable[str]] = None, public_only: bool = True,
+               limit: int = 50) -> list[tuple[str, int, float]]:
+    """Search the index.
+
+    Args:
+        query (str): The user's query, in Arabic or English
+        kinds (Iterable[str], optional): Kinds to search; defaults to all
+        public_only (bool): Only match verified startups and active deals
+        limit (int): Maximum number of results
+
+    Returns:
+        list[tuple[str, int, float]]: ``(kind, pk, score)``, best match first
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+    kinds = list(kinds or KINDS)
+    rows = get_search_backend().query(terms, kinds, public_only, limit)
+    return [(*split_row_id(rowid), score) for rowid, score in rows]
+
+
+def search(query: str, kinds: Optional[Iterable[str]] = None, limit: int = 50) -> list[tuple[str, Any]]:
+    """Search public startups and deals, returning the objects in rank order.
+
+    Loads the matches with one query per kind.
+
+    Args:
+        query (str): The user's query, in Arabic or English
+        kinds (Iterable[str], optional): Kinds to search; defaults to all
+        limit (int): Maximum number of results
+
+    Returns:
+        list[tuple[str, Any]]: ``(kind, object)`` pairs, best match first
+    """
+    hits = search_ids(query, kinds, limit=limit)
+    loaded = {}
+    for kind in {kind for kind, _, _ in hits}:
+        model, _, public, _ = SEARCH_SOURCES[kind]
+        queryset = model.objects.filter(public)
+        if kind == 'deal':
+            queryset = queryset.select_related('startup')
+        loaded[kind] = queryset.in_bulk([pk for hit_kind, pk, _ in hits if hit_kind == kind])
+    return [(kind, loaded[kind][pk]) for kind, pk, _ in hits if pk in loaded[kind]]
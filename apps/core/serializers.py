@@ -0,0 +1,93 @@
+from rest_framework import serializers
+from typing import Optional
+from .models import Deal, InvestorProfile, StartupProfile
+
+
+class FieldSelectionMixin:
+    """Let API clients choose the fields they need with ``?fields=a,b``.
+
+    Only the selected fields are serialized, and ``get_columns`` tells the
+    view which database columns they need so the queryset can load just
+    those.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        selected = self.selected_fields(self.context.get('request'))
+        if selected is not None:
+            for name in set(self.fields) - selected:
+                self.fields.pop(name)
+
+    @classmethod
+    def selected_fields(cls, request) -> Optional[set]:
+        """Return the fields named in ``?fields=``, or ``None`` when absent.
+
+        Args:
+            request (Request): The API request, if any
+
+        Returns:
+            set: The selected field names, or ``None`` for all fields
+
+        Raises:
+            ValidationError: If an unknown field is requested
+        """
+        value = request.query_params.get('fields') if request is not None else None
+        if not value:
+            return None
+        selected = {name.strip() for name in value.split(',') if name.strip()}
+        unknown = selected - set(cls.Meta.fields)
+        if unknown:
+            raise serializers.ValidationError({'fields': f"Unknown fields: {', '.join(sorted(unknown))}"})
+        return selected
+
+    @classmethod
+    def get_columns(cls, request) -> list[str]:
+        """Return the model columns backing the selected fields, for ``only()``.
+
+        Args:
+            request (Request): The API request
+
+        Returns:
+            list[str]: Column lookups such as ``'title'`` or ``'startup__company_name'``
+        """
+        fields = cls(context={'request': request}).fields.values()
+        return [field.source.replace('.', '__') for field in fields if field.source != '*']
+
+
+class DealSerializer(FieldSelectionMixin, serializers.ModelSerializer):
+    startup_name = serializers.CharField(source='startup.company_name', read_only=True)
+
+    class Meta:
+        model = Deal
+        fields = (
+            'id', 'title', 'description', 'deal_type', 'status', 'amount', 'equity_offered',
+            'min_investment', 'target_close_date', 'amount_raised', 'number_of_investors',
+            'industry', 'startup', 'startup_name', 'created_at', 'updated_at',
+        )
+        read_only_fields = fields
+
+
+class StartupSerializer(FieldSelectionMixin, serializers.ModelSerializer):
+    class Meta:
+        model = StartupProfile
+        fields = (
+            'id', 'company_name', 'tagline', 'description', 'industry', 'stage', 'founding_date',
+            'location', 'team_size', 'revenue_range', 'website', 'linkedin_url', 'crunchbase_url',
+            'total_funding_raised', 'current_funding_target', 'min_ticket_size', 'equity_offering',
+            'verified',
+        )
+        read_only_fields = fields
+
+
+class InvestorSerializer(FieldSelectionMixin, serializers.ModelSerializer):
+    preferred_stages = serializers.JSONField(read_only=True)
+
+    class Meta:
+        model = InvestorProfile
+        fields = (
+            'id', 'company_name', 'description', 'website', 'location', 'founded_year', 'team_size',
+            'preferred_industries', 'preferred_stages', 'investment_range_min', 'investment_range_max',
+            'sectors_of_interest', 'total_investments', 'total_capital_deployed', 'verified',
+            'linkedin_url', 'crunchbase_url',
+        )
+        read_only_fields = fields
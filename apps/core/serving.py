@@ -0,0 +1,131 @@
+"""Sending files from disk with ``Range`` and conditional request support.
+
+Shared by media serving in ``uploads`` and static serving in ``assets``.
+"""
+import mimetypes
+import os
+import re
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from typing import Any, Iterator, Optional
+
+READ_BLOCK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """Parse a single-range ``Range`` header into an inclusive byte range.
+
+    Args:
+        header (str): The ``Range`` header value
+        size (int): Size of the file in bytes
+
+    Returns:
+        tuple: ``(first, last)``, or ``None`` if the header is not a single byte range
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        first, last = max(size - int(last), 0), size - 1
+    else:
+        first, last = int(first), min(int(last), size - 1) if last else size - 1
+    if first >= size or first > last:
+        raise ValueError(header)
+    return first, last
+
+
+def read_range(path: str, first: int, length: int) -> Iterator[bytes]:
+    with open(path, 'rb') as handle:
+        handle.seek(first)
+        while length > 0:
+            block = handle.read(min(READ_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def resolve_file(root: Any, path: str) -> str:
+    """Return the filesystem path of ``path`` under ``root``.
+
+    Raises:
+        Http404: If the path escapes ``root`` or is not a file
+    """
+    try:
+        full_path = safe_join(root, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    return full_path
+
+
+def serve_file(request: HttpRequest, full_path: str, content_type: Optional[str] = None,
+               mode: str = 'django', accel_path: str = '') -> HttpResponse:
+    """Send a file, honouring ``Range`` and conditional requests.
+
+    With ``mode`` set to ``'x-sendfile'`` or ``'x-accel-redirect'`` only the
+    headers are built here and the front-end server sends the file.
+
+    Args:
+        request (HttpRequest): The HTTP request object
+        full_path (str): Filesystem path of the file
+        content_type (str, optional): Defaults to a guess from the file name
+        mode (str): ``'django'``, ``'x-sendfile'`` or ``'x-accel-redirect'``
+        accel_path (str): Internal URI handed to nginx in ``x-accel-redirect`` mode
+
+    Returns:
+        HttpResponse: The file, a 206 partial response, a 304 or a 416
+    """
+    stat = os.stat(full_path)
+    etag = quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        content_type = content_type or mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+        response = build_file_response(request, full_path, stat.st_size, etag, content_type, mode, accel_path)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
+
+
+def build_file_response(request: HttpRequest, full_path: str, size: int, etag: str, content_type: str,
+                        mode: str, accel_path: str) -> HttpResponse:
+    if mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = full_path
+        return response
+    if mode == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = accel_path
+        return response
+
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if 'Range' in request.headers and (if_range is None or if_range == etag):
+        try:
+            byte_range = parse_range(request.headers['Range'], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    if byte_range is None:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+    else:
+        first, last = byte_range
+        response = StreamingHttpResponse(read_range(full_path, first, last - first + 1),
+                                         status=206, content_type=content_type)
+        response['Content-Length'] = str(last - first + 1)
+        response['Content-Range'] = f'bytes {first}-{last}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
@@ -0,0 +1,195 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from .counters import Commitment, apply_commitments, lock_deals
+from .dashboard import schedule_dashboard_invalidation, users_showing_deals
+from .models import Deal, IndividualProfile, InvestorProfile, StartupProfile, User
+from .page_cache import schedule_page_invalidation
+from .search import kind_of
+from .tags import sync_tags
+from .tasks import (
+    invalidate_dashboards_showing, make_image_variants, refresh_stats, reindex_search, update_matches,
+)
+
+
+@receiver(post_save, sender=Deal)
+@receiver(post_save, sender=StartupProfile)
+@receiver(post_save, sender=InvestorProfile)
+@receiver(post_delete, sender=Deal)
+@receiver(post_delete, sender=StartupProfile)
+@receiver(post_delete, sender=InvestorProfile)
+def refresh_platform_stats_on_change(sender, **kwargs) -> None:
+    """Keep the cached homepage statistics in step with profile and deal changes."""
+    refresh_stats.defer()
+
+
+@receiver(post_save, sender=Deal)
+@receiver(post_save, sender=StartupProfile)
+@receiver(post_save, sender=InvestorProfile)
+@receiver(post_delete, sender=Deal)
+@receiver(post_delete, sender=StartupProfile)
+@receiver(post_delete, sender=InvestorProfile)
+def invalidate_cached_pages_on_change(sender, **kwargs) -> None:
+    """Drop the cached pages that display the changed model."""
+    schedule_page_invalidation(sender._meta.model_name)
+
+
+@receiver(post_save, sender=InvestorProfile)
+@receiver(post_delete, sender=InvestorProfile)
+def update_matches_on_investor_change(sender, instance, **kwargs) -> None:
+    """Re-encode the investor's preferences in the match index."""
+    update_matches.defer(investor_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Deal)
+@receiver(post_delete, sender=Deal)
+def update_matches_on_deal_change(sender, instance, **kwargs) -> None:
+    """Re-encode the deal in the match index."""
+    update_matches.defer(deal_ids=[instance.pk])
+
+
+@receiver(post_save, sender=StartupProfile)
+def update_matches_on_startup_change(sender, instance, created, **kwargs) -> None:
+    """Re-encode the startup's deals, which are matched on its stage."""
+    if not created:
+        update_matches.defer(startup_ids=[instance.pk])
+
+
+@receiver(post_save, sender=InvestorProfile)
+@receiver(post_save, sender=StartupProfile)
+@receiver(post_save, sender=IndividualProfile)
+def sync_profile_tags(sender, instance, **kwargs) -> None:
+    """Mirror the profile's industry/stage preferences into its tag rows."""
+    sync_tags(instance)
+
+
+@receiver(post_save, sender=StartupProfile)
+@receiver(post_save, sender=Deal)
+@receiver(post_delete, sender=StartupProfile)
+@receiver(post_delete, sender=Deal)
+def update_search_index(sender, instance, **kwargs) -> None:
+    """Reindex the saved or deleted startup or deal."""
+    reindex_search.defer(kind=kind_of(sender), pks=[instance.pk])
+
+
+@receiver(post_save, sender=User)
+def build_variants_on_profile_image_change(sender, instance, update_fields, **kwargs) -> None:
+    """Resize a new or removed profile image in the background."""
+    if update_fields is not None and 'profile_image' not in update_fields:
+        return
+    source = instance.profile_image_variants.get('source', '')
+    if (instance.profile_image.name or '') != source:
+        make_image_variants.defer(user_id=instance.pk)
+
+
+@receiver(m2m_changed, sender=Commitment)
+def update_progress_on_commitment(sender, instance, action, reverse, pk_set, using, **kwargs) -> None:
+    """Keep deal progress and investor totals in step with ``committed_investors``.
+
+    Before the rows change, the deals involved are locked and their
+    commitments re-read, so the counters move by exactly the rows this call
+    inserts or deletes. A concurrent identical add or remove waits for the
+    lock, then finds nothing left to change.
+    """
+    own, other = ('investorprofile_id', 'deal_id') if reverse else ('deal_id', 'investorprofile_id')
+    if action in ('pre_add', 'pre_remove', 'pre_clear'):
+        rows = sender.objects.using(using).filter(**{own: instance.pk})
+        if pk_set is not None:
+            rows = rows.filter(**{f'{other}__in': pk_set})
+        if reverse:
+            # A clear has no pk_set: it affects every deal the investor is linked to.
+            lock_deals(rows.values_list('deal_id', flat=True) if pk_set is None else pk_set, using)
+        else:
+            lock_deals([instance.pk], using)
+        existing = set(rows.values_list(other, flat=True))
+        instance._commitment_change = (pk_set - existing, 1) if action == 'pre_add' else (existing, -1)
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    ids, sign = instance.__dict__.pop('_commitment_change', ((), 1))
+    if not ids:
+        return
+    if reverse:
+        apply_commitments(ids, [instance.pk], sign)
+    else:
+        apply_commitments([instance.pk], ids, sign)
+    refresh_stats.defer()
+    schedule_page_invalidation('deal')
+    schedule_page_invalidation('investorprofile')
+
+
+@receiver(pre_delete, sender=Deal)
+def release_commitments_on_deal_delete(sender, instance, using, **kwargs) -> None:
+    """Take a deleted deal's commitments off its investors' totals, read under the deal's lock."""
+    lock_deals([instance.pk], using)
+    investor_ids = Commitment.objects.using(using).filter(deal_id=instance.pk).values_list('investorprofile_id', flat=True)
+    apply_commitments([instance.pk], investor_ids, -1)
+
+
+@receiver(pre_delete, sender=InvestorProfile)
+def release_commitments_on_investor_delete(sender, instance, using, **kwargs) -> None:
+    """Take a deleted investor's commitments off the deals' progress, read under the deals' locks."""
+    deal_ids = Commitment.objects.using(using).filter(investorprofile_id=instance.pk).values_list('deal_id', flat=True)
+    lock_deals(deal_ids, using)
+    apply_commitments(deal_ids, [instance.pk], -1)
+
+
+@receiver(post_save, sender=StartupProfile)
+@receiver(post_save, sender=InvestorProfile)
+@receiver(post_delete, sender=StartupProfile)
+@receiver(post_delete, sender=InvestorProfile)
+def invalidate_dashboard_on_profile_change(sender, instance, **kwargs) -> None:
+    """Drop the owner's dashboard now, and for a startup those listing its deals by company name after commit."""
+    schedule_dashboard_invalidation({instance.user_id})
+    if sender is StartupProfile:
+        invalidate_dashboards_showing.defer(startup_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Deal)
+def invalidate_dashboard_on_deal_save(sender, instance, **kwargs) -> None:
+    """Drop the dashboards listing the deal once the save commits."""
+    invalidate_dashboards_showing.defer(deal_ids=[instance.pk])
+
+
+@receiver(pre_delete, sender=Deal)
+def invalidate_dashboard_on_deal_delete(sender, instance, **kwargs) -> None:
+    """Drop the dashboards listing the deal, looked up while its investors are still linked."""
+    schedule_dashboard_invalidation(users_showing_deals([instance.pk]))
+
+
+@receiver(m2m_changed, sender=Deal.interested_investors.through)
+@receiver(m2m_changed, sender=Commitment)
+def invalidate_dashboard_on_interest_change(sender, instance, action, reverse, pk_set, **kwargs) -> None:
+    """Drop the dashboards listing deals that gained or lost investors.
+
+    Those of the deals and of the investors that came or went are dropped
+    after commit. A clear has no ``pk_set``, so the links it deletes are
+    looked up before they go. A commitment also changes the deal's
+    progress, which every dashboard listing it shows.
+    """
+    if action == 'pre_clear':
+        if reverse:
+            deal_ids = sender.objects.filter(investorprofile_id=instance.pk).values_list('deal_id', flat=True)
+            schedule_dashboard_invalidation(users_showing_deals(deal_ids) | {instance.user_id})
+        else:
+            schedule_dashboard_invalidation(users_showing_deals([instance.pk]))
+    elif action in ('post_add', 'post_remove') and pk_set:
+        if reverse:
+            schedule_dashboard_invalidation({instance.user_id})
+            invalidate_dashboards_showing.defer(deal_ids=sorted(pk_set))
+        else:
+            invalidate_dashboards_showing.defer(deal_ids=[instance.pk], investor_ids=sorted(pk_set))
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs) -> None:
+    """Apply ``SQLITE_PRAGMAS`` to each new SQLite connection.
+
+    Runs on the raw ``sqlite3`` connection, so the pragmas don't show up in
+    query logs or profiling counts.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    for pragma, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+        connection.connection.execute(f'PRAGMA {pragma} = {value}')
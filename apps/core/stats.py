@@ -0,0 +1,192 @@
+import asyncio
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from typing import Any, Awaitable, Callable, Dict
+from .models import Deal, InvestorProfile, StartupProfile
+
+
+STATS_CACHE_KEY = 'core:platform-stats:v1'
+HIGHLIGHTS_CACHE_KEY = 'core:homepage-highlights:v1'
+
+
+def compute_platform_stats() -> Dict[str, Any]:
+    """Run the platform-wide aggregate queries.
+
+    Returns:
+        Dict[str, Any]: Verified startup/investor counts, active deal count
+        and the total amount raised by closed deals
+    """
+    return {
+        'startups': StartupProfile.objects.filter(verified=True).count(),
+        'investors': InvestorProfile.objects.filter(verified=True).count(),
+        'deals': Deal.objects.filter(status='active').count(),
+        'total_investment': Deal.objects.filter(status='closed').aggregate(
+            total=models.Sum('amount_raised')
+        )['total'] or 0,
+    }
+
+
+def _highlight_querysets() -> Dict[str, Any]:
+    return {
+        'recent_deals': Deal.objects.filter(status='active')
+        .select_related('startup')
+        .only('title', 'description', 'amount', 'created_at', 'startup__company_name')
+        .order_by('-created_at')[:3],
+        'featured_startups': StartupProfile.objects.filter(verified=True)
+        .only('company_name', 'tagline', 'description', 'stage', 'location', 'total_funding_raised', 'verified')
+        .order_by('-total_funding_raised')[:3],
+        'top_investors': InvestorProfile.objects.filter(verified=True)
+        .only('company_name', 'description', 'location', 'total_investments', 'verified')
+        .order_by('-total_investments')[:3],
+    }
+
+
+def compute_homepage_highlights() -> Dict[str, list]:
+    """Run the top-N queries shown on the landing page.
+
+    Returns:
+        Dict[str, list]: Recent active deals, featured startups and top investors
+    """
+    return {name: list(queryset) for name, queryset in _highlight_querysets().items()}
+
+
+async def acompute_platform_stats() -> Dict[str, Any]:
+    """Async variant of ``compute_platform_stats`` issuing the queries concurrently.
+
+    Returns:
+        Dict[str, Any]: See ``compute_platform_stats``
+    """
+    startups, investors, deals, raised = await asyncio.gather(
+        StartupProfile.objects.filter(verified=True).acount(),
+        InvestorProfile.objects.filter(verified=True).acount(),
+        Deal.objects.filter(status='active').acount(),
+        Deal.objects.filter(status='closed').aaggregate(total=models.Sum('amount_raised')),
+    )
+    return {
+        'startups': startups,
+        'investors': investors,
+        'deals': deals,
+        'total_investment': raised['total'] or 0,
+    }
+
+
+async def acompute_homepage_highlights() -> Dict[str, list]:
+    """Async variant of ``compute_homepage_highlights`` issuing the queries concurrently.
+
+    Returns:
+        Dict[str, list]: See ``compute_homepage_highlights``
+    """
+    async def fetch(queryset):
+        return [obj async for obj in queryset]
+
+    querysets = _highlight_querysets()
+    results = await asyncio.gather(*(fetch(queryset) for queryset in querysets.values()))
+    return dict(zip(querysets, results))
+
+
+def _get_or_refresh(key: str, compute: Callable[[], Any]) -> Any:
+    """Return a cached value, recomputing it once per expiry across all workers.
+
+    Values are stored with a soft expiry alongside a much longer cache
+    timeout. After the soft expiry, the first caller to win ``cache.add``
+    on the lock key recomputes the value while every other caller keeps
+    serving the stale copy, so an expiry never fans out into one set of
+    aggregate queries per worker.
+
+    Args:
+        key (str): Cache key of the value
+        compute (Callable): Function producing a fresh value
+
+    Returns:
+        Any: The cached or freshly computed value
+    """
+    entry = cache.get(key)
+    now = time.time()
+    if entry is not None and entry['expires_at'] > now:
+        return entry['value']
+
+    lock_key = f'{key}:lock'
+    if not cache.add(lock_key, 1, timeout=settings.PLATFORM_STATS_LOCK_TIMEOUT):
+        if entry is not None:
+            return entry['value']
+        # Cold cache and another worker is already computing: compute for
+        # this request only rather than blocking on the lock holder.
+        return compute()
+
+    try:
+        return _store(key, compute())
+    finally:
+        cache.delete(lock_key)
+
+
+async def _aget_or_refresh(key: str, acompute: Callable[[], Awaitable[Any]]) -> Any:
+    """Async variant of ``_get_or_refresh``."""
+    entry = await cache.aget(key)
+    now = time.time()
+    if entry is not None and entry['expires_at'] > now:
+        return entry['value']
+
+    lock_key = f'{key}:lock'
+    if not await cache.aadd(lock_key, 1, timeout=settings.PLATFORM_STATS_LOCK_TIMEOUT):
+        if entry is not None:
+            return entry['value']
+        return await acompute()
+
+    try:
+        value = await acompute()
+        ttl = settings.PLATFORM_STATS_TTL
+        await cache.aset(key, {'value': value, 'expires_at': time.time() + ttl}, timeout=ttl * 10)
+        return value
+    finally:
+        await cache.adelete(lock_key)
+
+
+def _store(key: str, value: Any) -> Any:
+    """Store ``value`` under ``key`` with a fresh soft expiry."""
+    ttl = settings.PLATFORM_STATS_TTL
+    cache.set(key, {'value': value, 'expires_at': time.time() + ttl}, timeout=ttl * 10)
+    return value
+
+
+def get_platform_stats() -> Dict[str, Any]:
+    """Return the homepage statistics from cache.
+
+    Returns:
+        Dict[str, Any]: See ``compute_platform_stats``
+    """
+    return _get_or_refresh(STATS_CACHE_KEY, compute_platform_stats)
+
+
+def get_homepage_highlights() -> Dict[str, list]:
+    """Return the homepage top-N lists from cache.
+
+    Returns:
+        Dict[str, list]: See ``compute_homepage_highlights``
+    """
+    return _get_or_refresh(HIGHLIGHTS_CACHE_KEY, compute_homepage_highlights)
+
+
+async def aget_platform_stats() -> Dict[str, Any]:
+    """Async variant of ``get_platform_stats``.
+
+    Returns:
+        Dict[str, Any]: See ``compute_platform_stats``
+    """
+    return await _aget_or_refresh(STATS_CACHE_KEY, acompute_platform_stats)
+
+
+async def aget_homepage_highlights() -> Dict[str, list]:
+    """Async variant of ``get_homepage_highlights``.
+
+    Returns:
+        Dict[str, list]: See ``compute_homepage_highlights``
+    """
+    return await _aget_or_refresh(HIGHLIGHTS_CACHE_KEY, acompute_homepage_highlights)
+
+
+def refresh_platform_stats() -> None:
+    """Recompute and store the homepage statistics and top-N lists."""
+    _store(STATS_CACHE_KEY, compute_platform_stats())
+    _store(HIGHLIGHTS_CACHE_KEY, compute_homepage_highlights())
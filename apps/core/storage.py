@@ -0,0 +1,139 @@
+import gzip
+import hashlib
+import os
+import shutil
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+from typing import Optional
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Static files worth precompressing; fonts and images are compressed already.
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.xml', '.ico', '.map')
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of a file, read in fixed-size blocks.
+
+    Args:
+        path (str): Filesystem path of the file
+
+    Returns:
+        str: The hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Store each distinct file once, named after the SHA-256 of its content.
+
+    Files live at ``<prefix>/ab/cd/<digest><ext>`` under ``MEDIA_ROOT``.
+    Saving content that is already stored returns the existing name, so
+    the same deck uploaded twice takes the disk space of one. Names never
+    change meaning, which lets them be served with far-future cache headers.
+
+    Attributes:
+        prefix (str): Directory under the storage root holding the files
+    """
+
+    def __init__(self, prefix: str = 'documents', **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.prefix = prefix
+
+    def content_name(self, digest: str, name: str) -> str:
+        """Return the storage name for content with ``digest``, keeping the extension of ``name``.
+
+        Args:
+            digest (str): SHA-256 hex digest of the content
+            name (str): Original file name
+
+        Returns:
+            str: The content-addressed name
+        """
+        extension = os.path.splitext(name)[1].lower()
+        return f'{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+    def save(self, name: Optional[str], content, max_length: Optional[int] = None) -> str:
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        name = self.content_name(digest.hexdigest(), name)
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
+
+    def adopt(self, path: str, name: str, digest: Optional[str] = None) -> str:
+        """Move a complete local file into the store without copying it.
+
+        Args:
+            path (str): Filesystem path of the file; it is moved or removed
+            name (str): Original file name, for the extension
+            digest (str, optional): SHA-256 of the file if already known
+
+        Returns:
+            str: The content-addressed name
+        """
+        name = self.content_name(digest or file_digest(path), name)
+        target = self.path(name)
+        if os.path.exists(target):
+            os.remove(path)
+            return name
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.move(path, target)
+        if self.file_permissions_mode is not None:
+            os.chmod(target, self.file_permissions_mode)
+        return name
+
+
+document_storage = ContentAddressedStorage()
+image_storage = ContentAddressedStorage(prefix='images')
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Fingerprinted static files with precompressed ``.gz`` and ``.br`` siblings.
+
+    After ``collectstatic`` has written the hashed copies, each compressible
+    one gets a gzip sibling, plus a Brotli one when the ``brotli`` package
+    is installed, so the server never compresses static files per request.
+    A sibling is only kept if it is smaller than the original.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files.values())):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(name)
+
+    def compress(self, name: str) -> None:
+        """Write the compressed siblings of one stored file.
+
+        Args:
+            name (str): Storage name of the file
+        """
+        path = self.path(name)
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        encoded = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+        try:
+            import brotli
+        except ImportError:
+            pass
+        else:
+            encoded['.br'] = brotli.compress(data, quality=11)
+        for suffix, content in encoded.items():
+            if len(content) < len(data):
+                with open(path + suffix, 'wb') as handle:
+                    handle.write(content)
@@ -0,0 +1,116 @@
+from django.db import transaction
+from django.db.models import Exists, Model, OuterRef, QuerySet
+from typing import Iterable
+from .models import (
+    IndividualProfile, IndividualTag, InvestorProfile, InvestorTag, ProfileTag,
+    StartupProfile, StartupTag,
+)
+
+
+def normalize_tag(value) -> str:
+    """Normalize a free-text preference value into its indexed form."""
+    return str(value).strip().casefold()[:100]
+
+
+def investor_tags(investor: InvestorProfile) -> set[tuple[str, str]]:
+    industries = list(investor.preferred_industries or ()) + list(investor.sectors_of_interest or ())
+    return (
+        {(ProfileTag.INDUSTRY, normalize_tag(value)) for value in industries}
+        | {(ProfileTag.STAGE, normalize_tag(value)) for value in investor.preferred_stages or ()}
+    )
+
+
+def startup_tags(startup: StartupProfile) -> set[tuple[str, str]]:
+    return {
+        (ProfileTag.INDUSTRY, normalize_tag(startup.industry)),
+        (ProfileTag.STAGE, normalize_tag(startup.stage)),
+    }
+
+
+def individual_tags(individual: IndividualProfile) -> set[tuple[str, str]]:
+    return {(ProfileTag.INDUSTRY, normalize_tag(value)) for value in individual.interests or ()}
+
+
+# Profile model -> (tag model, foreign key name on the tag, tag extractor)
+TAG_SOURCES = {
+    InvestorProfile: (InvestorTag, 'investor', investor_tags),
+    StartupProfile: (StartupTag, 'startup', startup_tags),
+    IndividualProfile: (IndividualTag, 'individual', individual_tags),
+}
+
+
+def sync_tags(profile: Model) -> None:
+    """Bring a profile's tag rows in line with its current preference fields.
+
+    Only the difference is written: stale tags are deleted and missing
+    ones inserted.
+
+    Args:
+        profile (Model): An investor, startup or individual profile
+    """
+    tag_model, relation, extract = TAG_SOURCES[type(profile)]
+    wanted = {tag for tag in extract(profile) if tag[1]}
+    existing = {
+        (kind, value): pk for pk, kind, value in
+        tag_model.objects.filter(**{relation: profile}).values_list('pk', 'kind', 'value')
+    }
+    stale = [pk for tag, pk in existing.items() if tag not in wanted]
+    missing = [
+        tag_model(kind=kind, value=value, **{relation: profile})
+        for kind, value in wanted if (kind, value) not in existing
+    ]
+    if not stale and not missing:
+        return
+    with transaction.atomic():
+        if stale:
+            tag_model.objects.filter(pk__in=stale).delete()
+        if missing:
+            tag_model.objects.bulk_create(missing, ignore_conflicts=True)
+
+
+def rebuild_tags(profile_model: type, profiles: Iterable[Model], batch_size: int = 1000) -> int:
+    """Recreate the tag rows of many profiles in bulk.
+
+    Used after bulk inserts, which bypass the ``post_save`` sync.
+
+    Args:
+        profile_model (type): ``InvestorProfile``, ``StartupProfile`` or ``IndividualProfile``
+        profiles (Iterable[Model]): Profiles of that model, with primary keys set
+        batch_size (int): Rows per ``bulk_create`` batch
+
+    Returns:
+        int: Number of tag rows written
+    """
+    tag_model, relation, extract = TAG_SOURCES[profile_model]
+    profiles = list(profiles)
+    rows = [
+        tag_model(kind=kind, value=value, **{f'{relation}_id': profile.pk})
+        for profile in profiles for kind, value in extract(profile) if value
+    ]
+    with transaction.atomic():
+        tag_model.objects.filter(**{f'{relation}__in': [profile.pk for profile in profiles]}).delete()
+        tag_model.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+    return len(rows)
+
+
+def filter_by_tags(queryset: QuerySet, **tags: str) -> QuerySet:
+    """Filter profiles by indexed tags, e.g. ``filter_by_tags(qs, industry='Fintech')``.
+
+    Each tag becomes an ``EXISTS`` probe on the ``(kind, value, profile)``
+    index, so no JSON is scanned and no duplicate rows are produced.
+
+    Args:
+        queryset (QuerySet): Profiles to filter
+        **tags (str): Tag kind to raw value; empty values are ignored
+
+    Returns:
+        QuerySet: The filtered queryset
+    """
+    tag_model, relation, _ = TAG_SOURCES[queryset.model]
+    for kind, value in tags.items():
+        value = normalize_tag(value) if value else ''
+        if value:
+            queryset = queryset.filter(Exists(
+                tag_model.objects.filter(kind=kind, value=value, **{relation: OuterRef('pk')})
+            ))
+    return queryset
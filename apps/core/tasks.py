@@ -0,0 +1,163 @@
+import logging
+from django.apps import apps
+from django.conf import settings
+from django.core.mail import send_mail
+from django.utils import timezone, translation
+from django.utils.translation import gettext as _
+from .images import build_variants
+from .jobs import task
+from .dashboard import invalidate_dashboards, users_showing_deals
+from .matching import deals_changed, investors_changed
+from .models import Deal, InvestorProfile, User
+from .page_cache import invalidate_page_groups, schedule_page_invalidation
+from .search import reindex
+from .stats import refresh_platform_stats
+
+
+logger = logging.getLogger(__name__)
+
+PDF_MAGIC = b'%PDF-'
+
+
+@task(name='send_welcome_email')
+def send_welcome_email(user_id: int, language: str = 'en') -> None:
+    """Send the welcome email to a newly registered user.
+
+    Args:
+        user_id (int): The new user's primary key
+        language (str): Language the user signed up in
+    """
+    user = User.objects.filter(pk=user_id).only('email', 'username').first()
+    if user is None or not user.email:
+        return
+    with translation.override(language):
+        if language == 'ar':
+            subject = 'مرحباً بك في رايا'
+            body = 'تم إنشاء حسابك بنجاح. يمكنك الآن إكمال ملفك الشخصي واستكشاف الفرص الاستثمارية.'
+        else:
+            subject = _('Welcome to Raya')
+            body = _('Your account has been created. You can now complete your profile and explore investment deals.')
+        send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email])
+
+
+@task(name='scan_document')
+def scan_document(model: str, pk: int, field: str) -> None:
+    """Check an uploaded document and drop it if it isn't an acceptable PDF.
+
+    Documents must start with the PDF signature and stay under
+    ``DOCUMENT_MAX_SIZE``; anything else is deleted and the field cleared.
+
+    Args:
+        model (str): Model label, e.g. ``'core.Deal'``
+        pk (int): Primary key of the row holding the upload
+        field (str): Name of the ``FileField``
+    """
+    model_class = apps.get_model(model)
+    instance = model_class.objects.filter(pk=pk).only(field).first()
+    if instance is None:
+        return
+    document = getattr(instance, field)
+    if not document:
+        return
+    try:
+        size = document.size
+        with document.open('rb') as handle:
+            header = handle.read(len(PDF_MAGIC))
+    except FileNotFoundError:
+        return
+
+    if header == PDF_MAGIC and size <= settings.DOCUMENT_MAX_SIZE:
+        return
+    from .uploads import document_is_referenced
+
+    logger.warning('Rejected %s on %s %s: not a PDF or over the size limit', document.name, model, pk)
+    # A queryset update skips the save signals: only the file reference changes.
+    model_class.objects.filter(pk=pk).update(**{field: ''})
+    # Documents are stored once per content, so another row may share the file.
+    if not document_is_referenced(document.name):
+        document.storage.delete(document.name)
+
+
+@task(name='make_image_variants')
+def make_image_variants(user_id: int) -> None:
+    """Build the responsive variants of a user's profile image.
+
+    Args:
+        user_id (int): The user's primary key
+    """
+    user = User.objects.filter(pk=user_id).only('profile_image', 'profile_image_variants').first()
+    if user is None:
+        return
+    if not user.profile_image:
+        if user.profile_image_variants:
+            User.objects.filter(pk=user_id, profile_image='').update(
+                profile_image_variants={}, updated_at=timezone.now())
+            schedule_page_invalidation('user')
+        return
+    name = user.profile_image.name
+    if user.profile_image_variants.get('source') == name:
+        return
+    with user.profile_image.open('rb') as handle:
+        variants = build_variants(handle, name)
+    # Skip the write if the image was replaced meanwhile; its own job follows.
+    # ``updated_at`` versions the cached cards showing the image.
+    updated = User.objects.filter(pk=user_id, profile_image=name).update(
+        profile_image_variants=variants, updated_at=timezone.now())
+    if updated:
+        schedule_page_invalidation('user')
+
+
+@task(name='refresh_stats')
+def refresh_stats() -> None:
+    """Recompute the cached homepage statistics and top-N lists.
+
+    The home page is invalidated again afterwards: a copy cached since the
+    change committed still shows the old statistics.
+    """
+    refresh_platform_stats()
+    invalidate_page_groups(('home',))
+
+
+@task(name='update_matches')
+def update_matches(investor_ids: list = (), deal_ids: list = (), startup_ids: list = ()) -> None:
+    """Re-encode changed investors and deals in the match index.
+
+    Args:
+        investor_ids (list): Investors that changed
+        deal_ids (list): Deals that changed
+        startup_ids (list): Startups whose deals should all be re-encoded
+    """
+    if startup_ids:
+        deal_ids = [*deal_ids, *Deal.objects.filter(startup_id__in=startup_ids).values_list('pk', flat=True)]
+    if investor_ids:
+        investors_changed(investor_ids)
+    if deal_ids:
+        deals_changed(deal_ids)
+
+
+@task(name='reindex')
+def reindex_search(kind: str, pks: list) -> None:
+    """Reindex saved or deleted startups or deals.
+
+    Args:
+        kind (str): ``'startup'`` or ``'deal'``
+        pks (list): Primary keys of the objects
+    """
+    reindex(kind, pks)
+
+
+@task(name='invalidate_dashboards')
+def invalidate_dashboards_showing(deal_ids: list = (), startup_ids: list = (), investor_ids: list = ()) -> None:
+    """Drop the dashboards listing changed deals, and those of investors who left them.
+
+    Args:
+        deal_ids (list): Deals that changed
+        startup_ids (list): Startups whose deals all changed, e.g. on a new company name
+        investor_ids (list): Investors that gained or lost deals
+    """
+    if startup_ids:
+        deal_ids = [*deal_ids, *Deal.objects.filter(startup_id__in=startup_ids).values_list('pk', flat=True)]
+    user_ids = users_showing_deals(deal_ids)
+    if investor_ids:
+        user_ids |= set(InvestorProfile.objects.filter(pk__in=investor_ids).values_list('user_id', flat=True))
+    invalidate_dashboards(user_ids)
@@ -0,0 +1,10 @@
+from django import template
+from ..assets import vendor_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_asset(name: str) -> str:
+    """Return the URL of a vendored asset, e.g. ``{% vendor_asset 'bootstrap.css' %}``."""
+    return vendor_url(name)
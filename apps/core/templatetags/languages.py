@@ -0,0 +1,10 @@
+from django import template
+from django.urls import translate_url
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def translated_url(context: template.Context, language: str) -> str:
+    """Return the current page's URL in another language, e.g. ``{% translated_url 'ar' %}``."""
+    return translate_url(context['request'].get_full_path(), language)
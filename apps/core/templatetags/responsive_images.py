@@ -0,0 +1,46 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+from typing import Optional
+from ..images import pick_variant, variant_srcset
+from ..storage import image_storage
+
+register = template.Library()
+
+PLACEHOLDER = 'img/profile-placeholder.svg'
+
+
+@register.simple_tag
+def responsive_image(data: Optional[dict], variant: str = 'card', alt: str = '', css_class: str = '',
+                     sizes: str = '100vw', loading: str = 'lazy') -> str:
+    """Render a ``<picture>`` serving the precomputed variants of an image.
+
+    Browsers that support WebP pick from the WebP ``srcset``, others from
+    the JPEG one; ``variant`` sets the fallback ``src`` and the intrinsic
+    size. Without variants (no image, or not processed yet) a local
+    placeholder is shown.
+
+    Args:
+        data (dict): A ``profile_image_variants`` value
+        variant (str): Variant used for ``src``, ``width`` and ``height``
+        alt (str): Alternative text
+        css_class (str): Classes for the ``<img>``
+        sizes (str): The ``sizes`` attribute, i.e. the rendered width
+        loading (str): ``'lazy'`` or ``'eager'``
+
+    Returns:
+        str: The HTML
+    """
+    fallback = pick_variant(data, variant)
+    if fallback is None:
+        return format_html('<img src="{}" class="{}" alt="{}" loading="{}">',
+                           static(PLACEHOLDER), css_class, alt, loading)
+    variants = data['variants']
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" class="{}" alt="{}" '
+        'loading="{}" decoding="async"></picture>',
+        variant_srcset(variants, 'webp'), sizes,
+        image_storage.url(fallback['jpg']), variant_srcset(variants, 'jpg'), sizes,
+        fallback['width'], fallback['height'], css_class, alt, loading,
+    )
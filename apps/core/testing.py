@@ -0,0 +1,156 @@
+from contextlib import contextmanager
+from django.template.engine import Engine
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+from typing import Iterator, Optional
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block of code issues more queries than its budget allows."""
+
+
+class RedirectBudgetExceeded(AssertionError):
+    """Raised when a page takes more redirects to reach than its budget allows."""
+
+
+def _check_budget(captured: CaptureQueriesContext, budget: int, label: str = '') -> None:
+    """Raise ``QueryBudgetExceeded`` listing every query if ``captured`` is over budget."""
+    if len(captured) <= budget:
+        return
+    queries = '\n'.join(
+        f'{index}. {query["sql"]}' for index, query in enumerate(captured.captured_queries, start=1)
+    )
+    prefix = f'{label}: ' if label else ''
+    raise QueryBudgetExceeded(f'{prefix}{len(captured)} queries executed, budget is {budget}:\n{queries}')
+
+
+@contextmanager
+def assert_max_queries(budget: int, using: str = DEFAULT_DB_ALIAS) -> Iterator[CaptureQueriesContext]:
+    """Fail if the wrapped block issues more than ``budget`` queries.
+
+    Args:
+        budget (int): Maximum number of queries allowed
+        using (str): Database alias to watch
+
+    Yields:
+        CaptureQueriesContext: The captured queries, for further inspection
+
+    Raises:
+        QueryBudgetExceeded: If the block exceeds its budget
+    """
+    with CaptureQueriesContext(connections[using]) as captured:
+        yield captured
+    _check_budget(captured, budget)
+
+
+def assert_page_query_budget(client, path: str, budget: Optional[int] = None, **extra) -> HttpResponse:
+    """Fetch a page with the test client and check it stays within its query budget.
+
+    When ``budget`` is omitted, the budget declared by the view that
+    served the page is used (its ``get_query_budget()``, or else its
+    ``query_budget``), so templates and views can't drift apart silently.
+
+    Args:
+        client: A ``django.test.Client`` instance
+        path (str): URL path to fetch
+        budget (int, optional): Maximum number of queries allowed
+        **extra: Extra keyword arguments passed to ``client.get``
+
+    Returns:
+        HttpResponse: The rendered response
+
+    Raises:
+        QueryBudgetExceeded: If rendering the page exceeds its budget
+    """
+    with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as captured:
+        response = client.get(path, **extra)
+
+    if budget is None:
+        view = response.context.get('view') if response.context else None
+        if hasattr(view, 'get_query_budget'):
+            budget = view.get_query_budget()
+        else:
+            view_class = getattr(response.resolver_match.func, 'view_class', None)
+            budget = getattr(view_class, 'query_budget', None)
+        if budget is None:
+            raise ValueError(f'No query budget given and none declared by the view for {path}')
+
+    _check_budget(captured, budget, label=path)
+    return response
+
+
+def assert_no_session_queries(client, path: str, **extra) -> HttpResponse:
+    """Fetch a page with the test client and fail if any query touches the session table.
+
+    Public pages served to anonymous visitors should never need a session
+    row, whatever the session engine.
+
+    Args:
+        client: A ``django.test.Client`` instance
+        path (str): URL path to fetch
+        **extra: Extra keyword arguments passed to ``client.get``
+
+    Returns:
+        HttpResponse: The rendered response
+
+    Raises:
+        QueryBudgetExceeded: If a query reads or writes the session table
+    """
+    from django.contrib.sessions.models import Session
+
+    with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as captured:
+        response = client.get(path, **extra)
+    table = Session._meta.db_table
+    session_queries = [query['sql'] for query in captured.captured_queries if table in query['sql']]
+    if session_queries:
+        queries = '\n'.join(f'{index}. {sql}' for index, sql in enumerate(session_queries, start=1))
+        raise QueryBudgetExceeded(f'{path}: {len(session_queries)} session queries, budget is 0:\n{queries}')
+    return response
+
+
+def assert_max_redirects(client, path: str, budget: int, **extra) -> HttpResponse:
+    """Fetch a page with the test client, following redirects, and check how many it took.
+
+    Args:
+        client: A ``django.test.Client`` instance
+        path (str): URL path to fetch
+        budget (int): Maximum number of redirects allowed
+        **extra: Extra keyword arguments passed to ``client.get``
+
+    Returns:
+        HttpResponse: The final response, with its ``redirect_chain``
+
+    Raises:
+        RedirectBudgetExceeded: If reaching the page took more redirects
+    """
+    response = client.get(path, follow=True, **extra)
+    if len(response.redirect_chain) > budget:
+        hops = '\n'.join(f'{status} -> {url}' for url, status in response.redirect_chain)
+        raise RedirectBudgetExceeded(f'{path}: {len(response.redirect_chain)} redirects, budget is {budget}:\n{hops}')
+    return response
+
+
+@contextmanager
+def capture_template_lookups() -> Iterator[list[tuple[str, str]]]:
+    """Record every template the block looks up, including ``extends`` and ``include``.
+
+    Not thread-safe: it patches ``Engine.find_template`` while the block runs.
+
+    Yields:
+        list[tuple[str, str]]: ``(name asked for, name loaded)`` per lookup,
+        e.g. ``('core/deals_list.html', 'core/deals_list_ar.html')``
+    """
+    lookups = []
+    find_template = Engine.find_template
+
+    def recording_find_template(engine, name, dirs=None, skip=None):
+        template, origin = find_template(engine, name, dirs, skip)
+        lookups.append((name, origin.template_name))
+        return template, origin
+
+    Engine.find_template = recording_find_template
+    try:
+        yield lookups
+    finally:
+        Engine.find_template = find_template
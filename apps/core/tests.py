@@ -0,0 +1,790 @@
+import os
+import shutil
+import tempfile
+import threading
+from datetime import date
+from decimal import Decimal
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test import TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from functools import reduce
+from io import StringIO
+from operator import or_
+from unittest import mock
+from . import matching, search, stats
+from .counters import Commitment, count_drift
+from .jobs import run_pending
+from .models import Deal, InvestorProfile, Job, StartupProfile, UploadSession, User
+from .pagination import KeysetPaginator
+from .storage import document_storage
+from .tasks import refresh_stats, update_matches
+from .testing import (
+    assert_max_redirects, assert_no_session_queries, assert_page_query_budget, capture_template_lookups,
+)
+
+
+def make_startup(name: str, industry: str = 'Fintech', stage: str = 'seed', **fields) -> StartupProfile:
+    user = User.objects.create_user(name, f'{name}@example.com', 'password', user_type='startup')
+    fields = {
+        'company_name': name.title(), 'tagline': 'Tagline', 'description': 'Description', 'location': 'Riyadh',
+        **fields,
+    }
+    return StartupProfile.objects.create(
+        user=user, industry=industry, stage=stage, founding_date=date(2020, 1, 1), team_size=5,
+        current_funding_target=Decimal('500000'), min_ticket_size=Decimal('10000'), equity_offering=Decimal('10'),
+        **fields,
+    )
+
+
+def make_deal(startup: StartupProfile, title: str, min_investment: int = 20000, amount: int = 500000,
+              status: str = 'active', **fields) -> Deal:
+    fields.setdefault('industry', startup.industry)
+    fields.setdefault('description', 'Description')
+    return Deal.objects.create(
+        startup=startup, title=title, status=status, amount=Decimal(amount),
+        equity_offered=Decimal('10'), min_investment=Decimal(min_investment), target_close_date=date(2030, 1, 1),
+        **fields,
+    )
+
+
+def make_investor(name: str, industries: list = (), stages: list = (), low: int = 10000, high: int = 100000,
+                  **fields) -> InvestorProfile:
+    user = User.objects.create_user(name, f'{name}@example.com', 'password', user_type='investor')
+    return InvestorProfile.objects.create(
+        user=user, company_name=name.title(), location='Riyadh', founded_year=2015, team_size=5,
+        preferred_industries=list(industries), preferred_stages=list(stages), sectors_of_interest=[],
+        investment_range_min=Decimal(low), investment_range_max=Decimal(high), **fields,
+    )
+
+
+@override_settings(PAGE_CACHE_ENABLED=False, JOBS_MODE='immediate')
+class PublicPagesTestCase(TestCase):
+    """Public pages rendered against a small seeded data set, never from the page cache."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        call_command('populate_db', investors=40, startups=40, individuals=2, deals=80, seed=1, stdout=StringIO())
+
+    def setUp(self) -> None:
+        for cache in caches.all():
+            cache.clear()
+
+
+class QueryBudgetTests(PublicPagesTestCase):
+    """The home page and list views stay within the query budgets they declare."""
+
+    list_paths = ('/deals/', '/startups/', '/investors/')
+
+    def test_home_page(self) -> None:
+        response = assert_page_query_budget(self.client, '/')
+        self.assertEqual(response.status_code, 200)
+        # The statistics and top-N lists are cached after the first render.
+        assert_page_query_budget(self.client, '/', 0)
+
+    def test_list_views(self) -> None:
+        for mode in ('cursor', 'offset'):
+            with self.settings(LIST_PAGINATION_MODE=mode):
+                for path in self.list_paths:
+                    with self.subTest(mode=mode, path=path):
+                        response = assert_page_query_budget(self.client, path)
+                        self.assertEqual(response.status_code, 200)
+                        self.assertTrue(response.context['object_list'])
+                        assert_page_query_budget(self.client, f'{path}?industry=Fintech&stage=seed')
+
+    def test_list_views_next_page(self) -> None:
+        response = assert_page_query_budget(self.client, '/deals/')
+        next_cursor = response.context['page_obj'].next_cursor
+        self.assertIsNotNone(next_cursor)
+        response = assert_page_query_budget(self.client, f'/deals/?cursor={next_cursor}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['object_list'])
+        with self.settings(LIST_PAGINATION_MODE='offset'):
+            response = assert_page_query_budget(self.client, '/deals/?page=2')
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.context['object_list'])
+
+
+class CursorPaginationTests(PublicPagesTestCase):
+    """Cursor pages follow the list's ordering, and their tokens can't be forged or reused across lists."""
+
+    def walk(self, path: str) -> list[int]:
+        """Follow the next links from the first page; return the primary keys in page order."""
+        pks, cursor = [], None
+        while True:
+            response = self.client.get(path, {'cursor': cursor} if cursor else {})
+            self.assertEqual(response.status_code, 200)
+            pks += [obj.pk for obj in response.context['object_list']]
+            cursor = response.context['page_obj'].next_cursor
+            if cursor is None:
+                return pks
+
+    def test_cursor_pages_match_the_offset_pages(self) -> None:
+        for path in ('/deals/', '/startups/', '/investors/'):
+            with self.subTest(path=path):
+                pks = self.walk(path)
+                offset_pks, page = [], 1
+                with self.settings(LIST_PAGINATION_MODE='offset'):
+                    while True:
+                        response = self.client.get(path, {'page': page})
+                        offset_pks += [obj.pk for obj in response.context['object_list']]
+                        if not response.context['page_obj'].has_next():
+                            break
+                        page += 1
+                self.assertEqual(pks, offset_pks)
+                self.assertEqual(len(pks), len(set(pks)))
+
+    def test_previous_cursor_returns_the_page_before(self) -> None:
+        first = self.client.get('/deals/')
+        second = self.client.get('/deals/', {'cursor': first.context['page_obj'].next_cursor})
+        back = self.client.get('/deals/', {'cursor': second.context['page_obj'].previous_cursor})
+        self.assertEqual(list(back.context['object_list']), list(first.context['object_list']))
+        self.assertIsNone(back.context['page_obj'].previous_cursor)
+        # The template links to the neighbouring pages, without page numbers.
+        self.assertContains(second, '?cursor=')
+        self.assertNotContains(second, '?page=')
+
+    def test_ties_are_broken_by_primary_key(self) -> None:
+        Deal.objects.update(created_at=Deal.objects.first().created_at)
+        queryset = Deal.objects.filter(status='active')
+        paginator = KeysetPaginator(queryset, 4, '-created_at')
+        pks, page = [], paginator.page()
+        while True:
+            pks += [deal.pk for deal in page]
+            if not page.has_next():
+                break
+            page = paginator.page(page.next_cursor)
+        self.assertEqual(pks, list(queryset.order_by('-pk').values_list('pk', flat=True)))
+
+    def test_forged_and_foreign_cursors_are_rejected(self) -> None:
+        cursor = self.client.get('/investors/').context['page_obj'].next_cursor
+        self.assertEqual(self.client.get('/deals/', {'cursor': cursor}).status_code, 404)
+        self.assertEqual(self.client.get('/investors/', {'cursor': cursor[:-2] + 'xx'}).status_code, 404)
+        self.assertEqual(self.client.get('/investors/', {'cursor': 'not-a-cursor'}).status_code, 404)
+
+
+class PublicAPITests(PublicPagesTestCase):
+    """The JSON API pages by cursor, trims fields on request and answers unchanged polls with 304."""
+
+    def test_listings_follow_the_cursor_links(self) -> None:
+        for endpoint, queryset in (
+            ('/api/deals/', Deal.objects.filter(status='active')),
+            ('/api/startups/', StartupProfile.objects.filter(verified=True)),
+            ('/api/investors/', InvestorProfile.objects.filter(verified=True)),
+        ):
+            with self.subTest(endpoint=endpoint):
+                pks, url = [], f'{endpoint}?page_size=7'
+                while url:
+                    response = self.client.get(url)
+                    self.assertEqual(response.status_code, 200)
+                    pks += [item['id'] for item in response.json()['results']]
+                    url = response.json()['next']
+                self.assertEqual(sorted(pks), sorted(queryset.values_list('pk', flat=True)))
+                self.assertEqual(len(pks), len(set(pks)))
+
+    def test_fields_limit_the_keys_and_columns(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/deals/', {'fields': 'id,title,startup_name'})
+        self.assertEqual(response.status_code, 200)
+        for item in response.json()['results']:
+            self.assertEqual(set(item), {'id', 'title', 'startup_name'})
+        sql = queries[-1]['sql']
+        self.assertIn('company_name', sql)
+        self.assertNotIn('description', sql)
+        self.assertEqual(self.client.get('/api/deals/', {'fields': 'id,secret'}).status_code, 400)
+
+    def test_unchanged_listings_answer_with_not_modified(self) -> None:
+        response = self.client.get('/api/deals/')
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/deals/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        # Another page of the listing has its own ETag.
+        self.assertNotEqual(self.client.get('/api/deals/', {'page_size': 5})['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_deal(StartupProfile.objects.first(), 'Polled deal')
+        response = self.client.get('/api/deals/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['results'][0]['title'], 'Polled deal')
+
+
+@override_settings(PAGE_CACHE_ENABLED=True, JOBS_MODE='immediate')
+class PageCacheTests(TestCase):
+    """Anonymous pages come from the page cache until a write to what they show."""
+
+    paths = ('/', '/deals/', '/startups/', '/investors/', '/ar/deals/')
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.startup = make_startup('cached', verified=True)
+        make_deal(cls.startup, 'Cached deal')
+        cls.investor = make_investor('watcher', verified=True)
+
+    def setUp(self) -> None:
+        for cache in caches.all():
+            cache.clear()
+
+    def test_cached_pages_answer_conditional_requests(self) -> None:
+        for path in self.paths:
+            with self.subTest(path=path):
+                first = self.client.get(path)
+                self.assertEqual(first.status_code, 200)
+                with self.assertNumQueries(0):
+                    cached = self.client.get(path)
+                self.assertEqual(cached.content, first.content)
+                self.assertEqual(cached['ETag'], first['ETag'])
+                with self.assertNumQueries(0):
+                    response = self.client.get(path, headers={'If-None-Match': first['ETag']})
+                self.assertEqual(response.status_code, 304)
+        # Each language is cached separately.
+        self.assertNotEqual(self.client.get('/deals/').content, self.client.get('/ar/deals/').content)
+
+    def test_a_write_invalidates_only_the_pages_showing_it(self) -> None:
+        deals, investors = self.client.get('/deals/'), self.client.get('/investors/')
+        with self.captureOnCommitCallbacks(execute=True):
+            make_deal(self.startup, 'Fresh deal')
+
+        response = self.client.get('/deals/', headers={'If-None-Match': deals['ETag']})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Fresh deal')
+        self.assertNotEqual(response['ETag'], deals['ETag'])
+        with self.assertNumQueries(0):
+            response = self.client.get('/investors/', headers={'If-None-Match': investors['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_logged_in_users_skip_the_cache(self) -> None:
+        self.client.get('/deals/')
+        self.client.force_login(self.investor.user)
+        make_deal(self.startup, 'Uncommitted deal')
+        self.assertContains(self.client.get('/deals/'), 'Uncommitted deal')
+        self.assertNotIn('ETag', self.client.get('/deals/'))
+
+
+@override_settings(JOBS_MODE='immediate')
+class PlatformStatsTests(TestCase):
+    """The homepage statistics come from the cache, refreshed by writes and recomputed once per expiry."""
+
+    def setUp(self) -> None:
+        caches['default'].clear()
+
+    def test_a_write_refreshes_the_cached_statistics(self) -> None:
+        self.assertEqual(stats.get_platform_stats()['startups'], 0)
+        with self.assertNumQueries(0):
+            stats.get_platform_stats()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_startup('counted', verified=True)
+        with self.assertNumQueries(0):
+            self.assertEqual(stats.get_platform_stats()['startups'], 1)
+
+    def test_concurrent_refreshes_after_expiry_compute_once(self) -> None:
+        stats._store(stats.STATS_CACHE_KEY, {'deals': 1})
+        entry = caches['default'].get(stats.STATS_CACHE_KEY)
+        caches['default'].set(stats.STATS_CACHE_KEY, {**entry, 'expires_at': 0})
+
+        computing, release = threading.Event(), threading.Event()
+
+        def compute() -> dict:
+            computing.set()
+            release.wait(5)
+            return {'deals': 2}
+
+        with mock.patch.object(stats, 'compute_platform_stats', side_effect=compute) as compute_stats:
+            refreshed = []
+            refresher = threading.Thread(target=lambda: refreshed.append(stats.get_platform_stats()))
+            refresher.start()
+            self.assertTrue(computing.wait(5))
+            # While one caller recomputes, the others keep getting the stale copy.
+            others = []
+            threads = [threading.Thread(target=lambda: others.append(stats.get_platform_stats())) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+            release.set()
+            refresher.join(5)
+
+        compute_stats.assert_called_once_with()
+        self.assertEqual(others, [{'deals': 1}] * 5)
+        self.assertEqual(refreshed, [{'deals': 2}])
+        self.assertEqual(stats.get_platform_stats(), {'deals': 2})
+
+
+@override_settings(PAGE_CACHE_ENABLED=False, JOBS_MODE='immediate')
+class SearchTests(TestCase):
+    """The search index finds what the ``icontains`` filters found, and follows every save."""
+
+    # The columns the site and admin used to scan with ``icontains``.
+    icontains_fields = {
+        'startup': (StartupProfile, ('company_name', 'tagline', 'description', 'industry')),
+        'deal': (Deal, ('title', 'description', 'industry')),
+    }
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        # The index rows written by save signals are jobs run on commit.
+        with cls.captureOnCommitCallbacks(execute=True):
+            call_command('populate_db', investors=5, startups=40, individuals=1, deals=80, seed=1, stdout=StringIO())
+            cls.startup = make_startup('ledgerly', description='Quantum ledger for Gulf banks', verified=True)
+            cls.deal = make_deal(cls.startup, 'Quantum ledger round')
+            make_deal(cls.startup, 'Seed round', description='Scaling the quantum team')
+            cls.arabic = make_startup('arabic', company_name='المَدرسة الرقمية', description='منصّة تعليمية', verified=True)
+        # populate_db creates the superuser.
+        cls.admin = User.objects.get(username='admin')
+
+    def search_pks(self, query: str, kind: str, public_only: bool = True) -> set[int]:
+        return {pk for _, pk, _ in search.search_ids(query, [kind], public_only=public_only, limit=1000)}
+
+    def test_index_matches_the_icontains_filter(self) -> None:
+        for term in ('Fintech', 'SaaS', 'Edtech', 'Cleantech', 'AI', 'innovative', 'quantum'):
+            for kind, (model, fields) in self.icontains_fields.items():
+                with self.subTest(term=term, kind=kind):
+                    matches = model.objects.filter(reduce(or_, (Q(**{f'{field}__icontains': term}) for field in fields)))
+                    self.assertEqual(self.search_pks(term, kind, public_only=False),
+                                     set(matches.values_list('pk', flat=True)))
+                    public = matches.filter(search.SEARCH_SOURCES[kind][2])
+                    self.assertEqual(self.search_pks(term, kind), set(public.values_list('pk', flat=True)))
+
+    def test_arabic_spellings_match(self) -> None:
+        for query in ('مدرسة', 'المدرسه', 'مدرسه الرقميه', 'تعليمية', 'منصه'):
+            with self.subTest(query=query):
+                self.assertEqual(self.search_pks(query, 'startup'), {self.arabic.pk})
+
+    def test_titles_rank_above_descriptions(self) -> None:
+        response = self.client.get('/search/', {'q': 'quantum', 'type': 'deal'})
+        self.assertEqual([obj.title for _, obj in response.context['results']], ['Quantum ledger round', 'Seed round'])
+        titles = [result['title'] for result in self.client.get('/api/search/', {'q': 'quantum'}).json()['results']]
+        self.assertEqual(titles[0], 'Quantum ledger round')
+        self.assertEqual(set(titles), {'Quantum ledger round', 'Seed round', 'Ledgerly'})
+
+    def test_saves_and_deletes_update_the_index(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            self.deal.title = 'Orbital ledger round'
+            self.deal.save()
+        self.assertEqual(self.search_pks('orbital', 'deal'), {self.deal.pk})
+        self.assertNotIn(self.deal.pk, self.search_pks('quantum', 'deal'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.startup.verified = False
+            self.startup.save()
+        self.assertEqual(self.search_pks('ledgerly', 'startup'), set())
+        self.assertEqual(self.search_pks('ledgerly', 'startup', public_only=False), {self.startup.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.deal.delete()
+        self.assertEqual(self.search_pks('orbital', 'deal', public_only=False), set())
+
+    def test_admin_search_uses_the_index_and_search_fields(self) -> None:
+        self.client.force_login(self.admin)
+        for query, expected in (
+            ('quantum', {self.startup.pk}),  # description, from the index
+            ('ledgerl', {self.startup.pk}),  # prefix of the company name
+            ('ledgerly@exam', {self.startup.pk}),  # part of the e-mail, from search_fields
+        ):
+            with self.subTest(query=query):
+                response = self.client.get('/admin/core/startupprofile/', {'q': query})
+                self.assertEqual({obj.pk for obj in response.context['cl'].result_list}, expected)
+        # Unverified startups are searched too.
+        response = self.client.get('/admin/core/startupprofile/', {'q': 'Startup'})
+        startups = StartupProfile.objects.filter(company_name__startswith='Startup')
+        self.assertEqual(response.context['cl'].result_count, startups.count())
+        response = self.client.get('/admin/core/deal/', {'q': 'Ledgerly'})
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+
+class LanguageTests(PublicPagesTestCase):
+    """The URL picks the language, without redirects, and the loader picks its templates."""
+
+    paths = ('/', '/deals/', '/startups/', '/investors/')
+
+    def test_pages_and_language_switch_take_no_redirects(self) -> None:
+        for prefix, language in (('', 'en'), ('/ar', 'ar')):
+            for path in self.paths:
+                with self.subTest(path=prefix + path):
+                    response = assert_max_redirects(self.client, prefix + path, 0)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(response['Content-Language'], language)
+
+        response = assert_max_redirects(self.client, '/ar/deals/', 0)
+        self.assertContains(response, 'href="/deals/" hreflang="en"')
+        response = assert_max_redirects(self.client, '/deals/', 0)
+        self.assertContains(response, 'href="/ar/deals/" hreflang="ar"')
+
+    def test_set_language_redirects_once_to_the_translated_page(self) -> None:
+        for query, target in (
+            ('lang=en&next=/ar/deals/', '/deals/'),
+            ('lang=ar&next=/deals/', '/ar/deals/'),
+            ('lang=ar&next=/ar/deals/', '/ar/deals/'),
+            ('lang=en&next=https://example.com/', '/'),
+        ):
+            with self.subTest(query=query):
+                response = assert_max_redirects(self.client, f'/set-language/?{query}', 1)
+                self.assertEqual(response.redirect_chain[-1][0], target)
+                self.assertEqual(response.status_code, 200)
+
+    def test_loader_picks_the_arabic_variant(self) -> None:
+        pages = (
+            ('/', 'home.html', 'home_ar.html'),
+            ('/deals/', 'core/deals_list.html', 'core/deals_list_ar.html'),
+            ('/startups/', 'core/startups_list.html', 'core/startups_list_ar.html'),
+            ('/investors/', 'core/investors_list.html', 'core/investors_list_ar.html'),
+        )
+        for path, template, arabic_template in pages:
+            with self.subTest(path=path):
+                with capture_template_lookups() as lookups:
+                    self.client.get(path)
+                self.assertIn((template, template), lookups)
+                self.assertNotIn(arabic_template, [loaded for _, loaded in lookups])
+
+                with capture_template_lookups() as lookups:
+                    self.client.get(f'/ar{path}')
+                self.assertIn((template, arabic_template), lookups)
+                self.assertNotIn((template, template), lookups)
+
+    def test_loader_falls_back_without_a_variant(self) -> None:
+        with capture_template_lookups() as lookups:
+            response = self.client.get('/ar/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(('base.html', 'base.html'), lookups)
+
+
+class SessionTests(PublicPagesTestCase):
+    """Anonymous visits to the public pages leave the session table alone, with the configured ``SESSION_ENGINE``."""
+
+    paths = ('/', '/deals/', '/startups/', '/investors/')
+
+    def test_public_pages_without_a_session(self) -> None:
+        for path in self.paths:
+            with self.subTest(path=path):
+                response = assert_no_session_queries(self.client, path)
+                self.assertEqual(response.status_code, 200)
+
+    def test_public_pages_with_an_anonymous_session(self) -> None:
+        if settings.SESSION_ENGINE == 'django.contrib.sessions.backends.db':
+            self.skipTest('the db engine reads every session from the table')
+        session = self.client.session
+        session['seen'] = True
+        session.save()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+        for path in self.paths:
+            with self.subTest(path=path):
+                response = assert_no_session_queries(self.client, path)
+                self.assertEqual(response.status_code, 200)
+
+
+class UploadTests(TestCase):
+    """Chunked uploads into the document store, and serving stored media."""
+
+    document = b'%PDF-1.4\n' + bytes(range(256)) * 40
+
+    def setUp(self) -> None:
+        media_root, upload_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.addCleanup(shutil.rmtree, upload_dir)
+        overrides = self.settings(MEDIA_ROOT=media_root, UPLOAD_TEMP_DIR=upload_dir, JOBS_MODE='immediate')
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.owner = User.objects.create_user('founder', 'founder@example.com', 'password', user_type='startup')
+        self.client.force_login(self.owner)
+
+    def start_upload(self, data: bytes, filename: str = 'deck.pdf') -> str:
+        response = self.client.post('/uploads/', {'filename': filename, 'size': len(data)})
+        self.assertEqual(response.status_code, 201)
+        return f"/uploads/{response.json()['id']}/"
+
+    def put_chunk(self, url: str, chunk: bytes, offset: int):
+        return self.client.put(url, chunk, content_type='application/octet-stream',
+                               headers={'Upload-Offset': str(offset)})
+
+    def upload(self, data: bytes, chunk_size: int = 4096) -> UploadSession:
+        url = self.start_upload(data)
+        for offset in range(0, len(data), chunk_size):
+            self.assertEqual(self.put_chunk(url, data[offset:offset + chunk_size], offset).status_code, 200)
+        return UploadSession.objects.get(user=self.owner, name__gt='')
+
+    def test_chunked_upload_resumes_after_a_conflict(self) -> None:
+        url = self.start_upload(self.document)
+        self.assertEqual(self.put_chunk(url, self.document[:4096], 0).json()['offset'], 4096)
+
+        # The same chunk sent twice is refused, with the offset to resume from.
+        response = self.put_chunk(url, self.document[:4096], 0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 4096)
+        self.assertEqual(self.client.get(url).json()['offset'], 4096)
+
+        response = self.put_chunk(url, self.document[4096:], 4096)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['complete'])
+        upload = UploadSession.objects.get(user=self.owner)
+        self.assertEqual(upload.received, len(self.document))
+        with document_storage.open(upload.name) as stored:
+            self.assertEqual(stored.read(), self.document)
+
+    def test_rejects_documents_that_are_not_pdfs_or_too_large(self) -> None:
+        response = self.client.post('/uploads/', {'filename': 'deck.docx', 'size': 100})
+        self.assertEqual(response.status_code, 415)
+        response = self.client.post('/uploads/', {'filename': 'deck.pdf', 'size': settings.DOCUMENT_MAX_SIZE + 1})
+        self.assertEqual(response.status_code, 413)
+
+        url = self.start_upload(b'x' * 100)
+        with self.settings(UPLOAD_CHUNK_MAX_SIZE=10):
+            self.assertEqual(self.put_chunk(url, b'%PDF-' + b'x' * 95, 0).status_code, 413)
+        # The signature is checked with the first bytes and the upload is dropped.
+        self.assertEqual(self.put_chunk(url, b'MZ' + b'x' * 48, 0).status_code, 415)
+        self.assertFalse(UploadSession.objects.exists())
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_put_locks_the_upload(self) -> None:
+        url = self.start_upload(self.document)
+        with CaptureQueriesContext(connection) as queries:
+            self.put_chunk(url, self.document[:4096], 0)
+        lookup = next(query['sql'] for query in queries.captured_queries if 'core_uploadsession' in query['sql'])
+        self.assertIn('FOR UPDATE', lookup)
+
+    def test_serve_media_sends_byte_ranges(self) -> None:
+        url = '/media/' + self.upload(self.document).name
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.document)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('private', response['Cache-Control'])
+
+        response = self.client.get(url, headers={'Range': 'bytes=5-14'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 5-14/{len(self.document)}')
+        self.assertEqual(b''.join(response.streaming_content), self.document[5:15])
+        response = self.client.get(url, headers={'Range': 'bytes=-4'})
+        self.assertEqual(b''.join(response.streaming_content), self.document[-4:])
+
+        response = self.client.get(url, headers={'Range': f'bytes={len(self.document)}-'})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.document)}')
+
+    def test_documents_are_not_served_through_public_prefixes(self) -> None:
+        name = self.upload(self.document).name
+        image = os.path.join(settings.MEDIA_ROOT, 'images', 'logo.webp')
+        os.makedirs(os.path.dirname(image))
+        with open(image, 'wb') as handle:
+            handle.write(b'RIFF')
+
+        self.client.logout()
+        self.assertEqual(self.client.get('/media/images/logo.webp').status_code, 200)
+        for path in (name, f'images/../{name}', f'images/./../{name}', f'profiles/../{name}'):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(f'/media/{path}').status_code, 404)
+        # Not even the owner gets a document by a path other than its own.
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.get(f'/media/{name}').status_code, 200)
+        self.assertEqual(self.client.get(f'/media/images/../{name}').status_code, 404)
+
+
+class MatchingTests(TestCase):
+    """Ranking deals for investors, and keeping the cached rankings current."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        seed = make_startup('seedco', stage='seed')
+        later = make_startup('laterco', stage='series_b')
+        health_seed = make_startup('healthseed', industry='Health', stage='seed')
+        health_later = make_startup('healthlater', industry='Health', stage='series_b')
+        cls.full_match = make_deal(seed, 'Full match')
+        cls.big_ticket = make_deal(seed, 'Big ticket', min_investment=500000)
+        cls.industry_only = make_deal(later, 'Industry only')
+        cls.stage_only = make_deal(health_seed, 'Stage only')
+        cls.no_match = make_deal(health_later, 'No match')
+        make_deal(seed, 'Closed', status='closed')
+        cls.fintech = make_investor('fintech', ['Fintech'], ['seed'])
+        cls.health = make_investor('health', ['health'], ['series_c'], low=1, high=5)
+
+    def setUp(self) -> None:
+        caches['default'].clear()
+
+    def test_ranks_deals_by_industry_stage_and_ticket(self) -> None:
+        self.assertEqual(matching.rank_deals_for_investor(self.fintech.pk), [
+            (self.full_match.pk, 1.0),
+            (self.big_ticket.pk, 0.8),
+            (self.industry_only.pk, 0.7),
+            (self.stage_only.pk, 0.5),
+        ])
+        self.assertEqual(matching.rank_deals_for_investor(self.fintech.pk, 2),
+                         [(self.full_match.pk, 1.0), (self.big_ticket.pk, 0.8)])
+        self.assertEqual(matching.rank_investors_for_deal(self.full_match.pk), [(self.fintech.pk, 1.0)])
+
+    def test_a_change_drops_only_the_rankings_it_affects(self) -> None:
+        matching.rank_deals_for_investor(self.fintech.pk)
+        matching.rank_deals_for_investor(self.health.pk)
+        for deal in (self.full_match, self.industry_only):
+            matching.rank_investors_for_deal(deal.pk)
+
+        Deal.objects.filter(pk=self.industry_only.pk).update(status='closed')
+        matching.deals_changed([self.industry_only.pk])
+
+        def cached(key: str, pk: int) -> bool:
+            return caches['default'].get(key.format(matching._generation(), pk)) is not None
+
+        self.assertFalse(cached(matching.INVESTOR_RESULTS_KEY, self.fintech.pk))
+        self.assertFalse(cached(matching.DEAL_RESULTS_KEY, self.industry_only.pk))
+        self.assertTrue(cached(matching.INVESTOR_RESULTS_KEY, self.health.pk))
+        self.assertTrue(cached(matching.DEAL_RESULTS_KEY, self.full_match.pk))
+        self.assertNotIn(self.industry_only.pk, dict(matching.rank_deals_for_investor(self.fintech.pk)))
+
+    def test_a_change_without_a_cached_index_costs_no_queries(self) -> None:
+        matching.rank_deals_for_investor(self.fintech.pk)
+        caches['default'].delete(matching.INDEX_CACHE_KEY)
+
+        Deal.objects.filter(pk=self.industry_only.pk).update(status='closed')
+        with self.assertNumQueries(0):
+            matching.deals_changed([self.industry_only.pk])
+        # The rankings cached from the old index are no longer used.
+        self.assertNotIn(self.industry_only.pk, dict(matching.rank_deals_for_investor(self.fintech.pk)))
+
+    def test_dashboard_recommends_matching_deals(self) -> None:
+        self.client.force_login(self.fintech.user)
+        response = self.client.get('/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [deal.pk for deal in response.context['recommended_deals']],
+            [self.full_match.pk, self.big_ticket.pk, self.industry_only.pk, self.stage_only.pk],
+        )
+        self.assertContains(response, 'Recommended Deals')
+        self.assertContains(response, '<td>100%</td>', html=True)
+
+
+class CommitmentCounterTests(TestCase):
+    """Deal progress and investor totals follow ``committed_investors`` whichever side changes it."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        startup = make_startup('counted')
+        cls.deal = make_deal(startup, 'First', min_investment=20000)
+        cls.other_deal = make_deal(startup, 'Second', min_investment=50000)
+        cls.investor = make_investor('first')
+        cls.other_investor = make_investor('second')
+
+    def assert_counters_match_recount(self, deal_investors: dict) -> None:
+        """Check the counters against the commitment rows and the expected number of investors per deal."""
+        self.assertEqual(count_drift(), {'deals': 0, 'investors': 0})
+        for deal, investors in deal_investors.items():
+            deal.refresh_from_db()
+            self.assertEqual(Commitment.objects.filter(deal=deal).count(), investors)
+            self.assertEqual(deal.number_of_investors, investors)
+            self.assertEqual(deal.amount_raised, investors * deal.min_investment)
+
+    def test_add_remove_and_clear(self) -> None:
+        self.deal.committed_investors.add(self.investor, self.other_investor)
+        self.assert_counters_match_recount({self.deal: 2})
+
+        # Removing an investor twice, or one that never committed, changes nothing more.
+        for _ in range(2):
+            self.deal.committed_investors.remove(self.investor)
+            self.assert_counters_match_recount({self.deal: 1})
+        self.other_deal.committed_investors.remove(self.investor)
+        self.assert_counters_match_recount({self.other_deal: 0})
+
+        self.deal.committed_investors.clear()
+        self.assert_counters_match_recount({self.deal: 0})
+
+    def test_duplicate_add(self) -> None:
+        self.deal.committed_investors.add(self.investor)
+        self.deal.committed_investors.add(self.investor)
+        self.assert_counters_match_recount({self.deal: 1})
+
+        # A concurrent add read the commitments before this one inserted its row.
+        manager = type(self.deal.committed_investors)
+        with mock.patch.object(manager, '_get_missing_target_ids', lambda self, *args: set(args[-1])):
+            self.deal.committed_investors.add(self.investor)
+        self.assert_counters_match_recount({self.deal: 1})
+
+    def test_reverse_side(self) -> None:
+        self.investor.committed_deals.add(self.deal, self.other_deal)
+        self.other_investor.committed_deals.add(self.deal)
+        self.assert_counters_match_recount({self.deal: 2, self.other_deal: 1})
+
+        self.investor.committed_deals.remove(self.deal)
+        self.assert_counters_match_recount({self.deal: 1, self.other_deal: 1})
+        self.investor.committed_deals.clear()
+        self.assert_counters_match_recount({self.deal: 1, self.other_deal: 0})
+
+    def test_deleting_a_deal_or_an_investor(self) -> None:
+        self.deal.committed_investors.add(self.investor, self.other_investor)
+        self.other_deal.committed_investors.add(self.investor)
+
+        self.other_deal.delete()
+        self.assert_counters_match_recount({self.deal: 2})
+        self.investor.refresh_from_db()
+        self.assertEqual(self.investor.total_investments, 1)
+        self.assertEqual(self.investor.total_capital_deployed, self.deal.min_investment)
+
+        self.other_investor.delete()
+        self.assert_counters_match_recount({self.deal: 1})
+
+
+@override_settings(JOBS_MODE='worker')
+class DeferredJobTests(TransactionTestCase):
+    """Calls deferred in a transaction are queued as one job once it commits, and dropped if it rolls back."""
+
+    def setUp(self) -> None:
+        patcher = mock.patch.object(update_matches, 'func')
+        self.update_matches = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_calls_are_merged_into_one_job_on_commit(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                update_matches.defer(investor_ids=[1])
+                update_matches.defer(investor_ids=[2, 1])
+                update_matches.defer(deal_ids=[3])
+                refresh_stats.defer()
+                self.assertFalse(Job.objects.exists())
+        inserts = [query for query in queries.captured_queries if query['sql'].startswith('INSERT INTO "core_job"')]
+        self.assertEqual(len(inserts), 1)
+        job = Job.objects.get()
+        self.assertEqual(job.name, 'run_batch')
+        self.assertEqual(job.kwargs, {'calls': [
+            ['update_matches', {'investor_ids': [1, 2], 'deal_ids': [3]}],
+            ['refresh_stats', {}],
+        ]})
+
+        with mock.patch.object(refresh_stats, 'func') as refresh:
+            self.assertEqual(run_pending(), 1)
+        self.update_matches.assert_called_once_with(investor_ids=[1, 2], deal_ids=[3])
+        refresh.assert_called_once_with()
+        self.assertFalse(Job.objects.exists())
+
+    def test_rollback_drops_the_calls(self) -> None:
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                update_matches.defer(investor_ids=[1])
+                raise ValueError
+        self.assertFalse(Job.objects.exists())
+
+        # A savepoint rolled back on its own takes the calls made in it along.
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    update_matches.defer(investor_ids=[2])
+                    raise ValueError
+            except ValueError:
+                pass
+            update_matches.defer(investor_ids=[3])
+        job = Job.objects.get()
+        self.assertEqual((job.name, job.kwargs), ('update_matches', {'investor_ids': [3]}))
+
+    def test_outside_a_transaction_the_call_is_queued_at_once(self) -> None:
+        update_matches.defer(investor_ids=[1])
+        job = Job.objects.get()
+        self.assertEqual((job.name, job.kwargs), ('update_matches', {'investor_ids': [1]}))
+
+    @override_settings(JOBS_MODE='immediate')
+    def test_immediate_mode_runs_the_calls_after_commit(self) -> None:
+        with transaction.atomic():
+            update_matches.defer(investor_ids=[1])
+            update_matches.defer(investor_ids=[2])
+            self.update_matches.assert_not_called()
+        self.update_matches.assert_called_once_with(investor_ids=[1, 2])
+        self.assertFalse(Job.objects.exists())
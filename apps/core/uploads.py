@@ -0,0 +1,325 @@
+"""Resumable chunked uploads and media serving.
+
+A client creates an upload with ``POST /uploads/`` (``filename`` and
+``size``), then sends the file in order with ``PUT /uploads/<id>/``, one
+chunk per request, each carrying its starting byte in ``Upload-Offset``.
+``GET /uploads/<id>/`` reports how much has arrived, so an interrupted
+upload resumes from there. Chunks are streamed to a partial file in
+``UPLOAD_TEMP_DIR``, so memory use stays bounded by a read block whatever
+the document size. The PDF signature is checked as soon as the first
+bytes arrive. The finished file is moved into the content-addressed
+document store, and the upload id is then submitted with the form in
+place of the file.
+"""
+import os
+import posixpath
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.urls import path
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils import timezone
+from django.views import View
+from typing import Any, Optional
+from .models import Deal, InvestorProfile, StartupProfile, UploadSession, User
+from .serving import IMMUTABLE_CACHE_CONTROL, READ_BLOCK_SIZE, resolve_file, serve_file
+from .storage import document_storage, file_digest, image_storage
+from .tasks import scan_document
+
+PDF_MAGIC = b'%PDF-'
+# Content-addressed files never change under the same name
+IMMUTABLE_PREFIXES = tuple(f'{storage.prefix}/' for storage in (document_storage, image_storage))
+# Media anyone may fetch: image variants and the profile images they're built from.
+# Everything else, such as pitch decks and deal documents, needs can_download_document.
+PUBLIC_MEDIA_PREFIXES = (f'{image_storage.prefix}/', User._meta.get_field('profile_image').upload_to)
+
+
+def partial_path(upload: UploadSession) -> str:
+    """Return the path of the partial file an upload's chunks are appended to."""
+    return os.path.join(settings.UPLOAD_TEMP_DIR, f'{upload.pk}.part')
+
+
+def upload_state(upload: UploadSession, status: int = 200) -> JsonResponse:
+    return JsonResponse({
+        'id': str(upload.pk),
+        'offset': upload.received,
+        'size': upload.size,
+        'complete': upload.complete,
+    }, status=status)
+
+
+def upload_error(message: str, status: int, **extra: Any) -> JsonResponse:
+    return JsonResponse({'error': message, **extra}, status=status)
+
+
+def discard_upload(upload: UploadSession) -> None:
+    """Delete an upload and its partial file."""
+    try:
+        os.remove(partial_path(upload))
+    except FileNotFoundError:
+        pass
+    upload.delete()
+
+
+def finish_upload(upload: UploadSession) -> None:
+    """Hash the complete partial file and move it into the document store.
+
+    Args:
+        upload (UploadSession): An upload whose chunks have all arrived
+    """
+    path = partial_path(upload)
+    upload.sha256 = file_digest(path)
+    upload.name = document_storage.adopt(path, upload.filename, upload.sha256)
+    upload.save(update_fields=['sha256', 'name', 'updated_at'])
+
+
+def document_is_referenced(name: str, ignore_upload: Optional[UploadSession] = None) -> bool:
+    """Return whether any startup, deal or upload still points at a stored document.
+
+    Uploads count while they are being attached to a form: the document
+    store holds each content once, so a new upload may resolve to a file
+    about to be cleaned up.
+
+    Args:
+        name (str): Storage name of the document
+        ignore_upload (UploadSession, optional): An upload being discarded itself
+
+    Returns:
+        bool: True if the file must be kept
+    """
+    uploads = UploadSession.objects.filter(name=name)
+    if ignore_upload is not None:
+        uploads = uploads.exclude(pk=ignore_upload.pk)
+    return (
+        StartupProfile.objects.filter(pitch_deck=name).exists()
+        or Deal.objects.filter(deal_documents=name).exists()
+        or uploads.exists()
+    )
+
+
+def can_download_document(user: Any, name: str) -> bool:
+    """Return whether a user may download a stored document.
+
+    Staff may download any document. Otherwise the user must own the
+    startup, deal or upload that references it, or be an investor looking
+    at the document of a verified startup or an active deal.
+
+    Args:
+        user (User): The requesting user
+        name (str): Storage name of the document
+
+    Returns:
+        bool: True if the document may be sent
+    """
+    if not user.is_authenticated:
+        return False
+    if user.is_staff:
+        return True
+    startups = StartupProfile.objects.filter(pitch_deck=name)
+    deals = Deal.objects.filter(deal_documents=name)
+    if (
+        startups.filter(user=user).exists()
+        or deals.filter(startup__user=user).exists()
+        or UploadSession.objects.filter(name=name, user=user).exists()
+    ):
+        return True
+    return InvestorProfile.objects.filter(user=user).exists() and (
+        startups.filter(verified=True).exists() or deals.filter(status='active').exists()
+    )
+
+
+def purge_stale_uploads(max_age: Optional[timedelta] = None) -> int:
+    """Delete uploads that were abandoned or never attached to a form.
+
+    Args:
+        max_age (timedelta, optional): Age past which an upload is stale;
+            defaults to ``UPLOAD_SESSION_TTL`` seconds
+
+    Returns:
+        int: Number of uploads deleted
+    """
+    cutoff = timezone.now() - (max_age or timedelta(seconds=settings.UPLOAD_SESSION_TTL))
+    stale = list(UploadSession.objects.filter(updated_at__lt=cutoff))
+    for upload in stale:
+        if upload.name and not document_is_referenced(upload.name, ignore_upload=upload):
+            document_storage.delete(upload.name)
+        discard_upload(upload)
+    return len(stale)
+
+
+def attach_uploads(form: Any, instance: Any, model: str) -> None:
+    """Finish the document fields of a saved ``ChunkedUploadFormMixin`` form.
+
+    Chunked uploads were checked as they arrived, so their sessions are
+    simply released. Files posted through the plain file input are queued
+    for a background check.
+
+    Args:
+        form (ChunkedUploadFormMixin): The saved form
+        instance (Model): The saved startup or deal
+        model (str): Model label, e.g. ``'core.Deal'``
+    """
+    for name in form.chunked_upload_fields:
+        if name in form.uploads:
+            form.uploads[name].delete()
+        elif getattr(instance, name):
+            scan_document.defer(model=model, pk=instance.pk, field=name)
+
+
+class UploadCreateView(LoginRequiredMixin, View):
+    """Start a resumable upload: ``POST /uploads/`` with ``filename`` and ``size``."""
+    raise_exception = True
+
+    def post(self, request: HttpRequest) -> JsonResponse:
+        filename = os.path.basename(request.POST.get('filename', '').strip())[:255]
+        try:
+            size = int(request.POST.get('size', ''))
+        except ValueError:
+            return upload_error('size must be an integer.', 400)
+        if not filename.lower().endswith('.pdf'):
+            return upload_error('Only PDF documents are accepted.', 415)
+        if not 0 < size <= settings.DOCUMENT_MAX_SIZE:
+            return upload_error('File is empty or too large.', 413, max_size=settings.DOCUMENT_MAX_SIZE)
+
+        os.makedirs(settings.UPLOAD_TEMP_DIR, exist_ok=True)
+        upload = UploadSession.objects.create(user=request.user, filename=filename, size=size)
+        open(partial_path(upload), 'wb').close()
+        return upload_state(upload, status=201)
+
+
+class UploadChunkView(LoginRequiredMixin, View):
+    """Report (``GET``) or extend (``PUT``) one of the user's uploads."""
+    raise_exception = True
+
+    def get_upload(self, request: HttpRequest, upload_id: Any, lock: bool = False) -> UploadSession:
+        uploads = UploadSession.objects.select_for_update() if lock else UploadSession.objects
+        try:
+            return uploads.get(pk=upload_id, user=request.user)
+        except UploadSession.DoesNotExist:
+            raise Http404('Unknown upload.')
+
+    def get(self, request: HttpRequest, upload_id: Any) -> JsonResponse:
+        upload = self.get_upload(request, upload_id)
+        if not upload.complete and os.path.exists(partial_path(upload)):
+            upload.received = os.path.getsize(partial_path(upload))
+        return upload_state(upload)
+
+    def delete(self, request: HttpRequest, upload_id: Any) -> HttpResponse:
+        discard_upload(self.get_upload(request, upload_id))
+        return HttpResponse(status=204)
+
+    def put(self, request: HttpRequest, upload_id: Any) -> JsonResponse:
+        """Append the request body at ``Upload-Offset``.
+
+        The body is read straight from the socket in ``READ_BLOCK_SIZE``
+        blocks and written out as it arrives; it is never held in memory.
+        The upload's row stays locked from the offset check to the end of
+        the write, so two requests sending the same chunk at once can't
+        both append it.
+        """
+        with transaction.atomic():
+            return self.append_chunk(request, self.get_upload(request, upload_id, lock=True))
+
+    def append_chunk(self, request: HttpRequest, upload: UploadSession) -> JsonResponse:
+        if upload.complete:
+            return upload_state(upload)
+        path = partial_path(upload)
+        # The partial file is the source of truth: the bytes of a chunk cut
+        # off mid-write are kept and the client resumes after them.
+        try:
+            offset = os.path.getsize(path)
+        except FileNotFoundError:
+            discard_upload(upload)
+            return upload_error('Unknown upload.', 404)
+        try:
+            start = int(request.headers['Upload-Offset'])
+            length = int(request.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return upload_error('Upload-Offset and Content-Length are required.', 400)
+        if start != offset:
+            return upload_error('Upload-Offset does not match the data received.', 409, offset=offset)
+        if length > settings.UPLOAD_CHUNK_MAX_SIZE:
+            return upload_error('Chunk is too large.', 413, max_chunk_size=settings.UPLOAD_CHUNK_MAX_SIZE)
+        if offset + length > upload.size:
+            return upload_error('Chunk goes past the declared size.', 400)
+
+        remaining = length
+        with open(path, 'ab') as partial:
+            while remaining:
+                block = request.read(min(READ_BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                partial.write(block)
+                remaining -= len(block)
+            received = partial.tell()
+
+        if offset < len(PDF_MAGIC) <= received or received == upload.size:
+            with open(path, 'rb') as partial:
+                if partial.read(len(PDF_MAGIC)) != PDF_MAGIC:
+                    discard_upload(upload)
+                    return upload_error('Only PDF documents are accepted.', 415)
+
+        upload.received = received
+        upload.save(update_fields=['received', 'updated_at'])
+        if received == upload.size:
+            finish_upload(upload)
+        return upload_state(upload)
+
+
+def clean_media_path(path: str) -> str:
+    """Return a media path in the normal form its access checks apply to.
+
+    The prefix checks in ``serve_media`` must see the file that will be
+    sent, so ``images/../documents/...`` can't pass for an image.
+
+    Args:
+        path (str): Path of the file relative to ``MEDIA_ROOT``, as requested
+
+    Returns:
+        str: The path with empty and ``.`` segments removed
+
+    Raises:
+        Http404: If the path has a ``..`` segment or is absolute
+    """
+    if '..' in path.replace('\\', '/').split('/') or path.startswith(('/', '\\')):
+        raise Http404
+    return posixpath.normpath(path)
+
+
+def serve_media(request: HttpRequest, path: str) -> HttpResponse:
+    """Serve a file under ``MEDIA_ROOT`` according to ``MEDIA_SERVE_MODE``.
+
+    Images are public. Any other file is only sent to users allowed by
+    ``can_download_document``, and everyone else gets a 404 that doesn't
+    reveal whether it exists. Content-addressed files never change, so they
+    are cached for a year, privately unless public.
+
+    Args:
+        request (HttpRequest): The HTTP request object
+        path (str): Path of the file relative to ``MEDIA_ROOT``
+
+    Returns:
+        HttpResponse: See ``serve_file``
+    """
+    path = clean_media_path(path)
+    public = path.startswith(PUBLIC_MEDIA_PREFIXES)
+    if not public and not can_download_document(request.user, path):
+        raise Http404
+    full_path = resolve_file(settings.MEDIA_ROOT, path)
+    response = serve_file(request, full_path, mode=settings.MEDIA_SERVE_MODE,
+                          accel_path=settings.MEDIA_ACCEL_REDIRECT_PREFIX + path)
+    if path.startswith(IMMUTABLE_PREFIXES):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    if not public:
+        patch_cache_control(response, private=True)
+        patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+app_name = 'uploads'
+urlpatterns = [
+    path('', UploadCreateView.as_view(), name='create'),
+    path('<uuid:upload_id>/', UploadChunkView.as_view(), name='chunk'),
+]
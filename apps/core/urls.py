@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
@@ -6,9 +7,15 @@ app_name = 'core'
 from .views import (
     HomeView, DealsListView, StartupsListView, InvestorsListView,
     CreateDealView, CreateStartupView, CreateInvestorView,
-    SignupView, LoginView, set_language, dashboard
+    SignupView, LoginView, SearchView, set_language, dashboard
 )
 
+if settings.ASYNC_VIEWS:
+    from .views import (  # noqa: F811
+        AsyncHomeView as HomeView, AsyncDealsListView as DealsListView,
+        AsyncStartupsListView as StartupsListView, AsyncInvestorsListView as InvestorsListView,
+    )
+
 urlpatterns = [
     path('', HomeView.as_view(), name='home'),
     path('login/', LoginView.as_view(), name='login'),
@@ -18,6 +25,7 @@ urlpatterns = [
     path('deals/', DealsListView.as_view(), name='deals_list'),
     path('startups/', StartupsListView.as_view(), name='startups_list'),
     path('investors/', InvestorsListView.as_view(), name='investors_list'),
+    path('search/', SearchView.as_view(), name='search'),
     path('deals/create/', CreateDealView.as_view(), name='create_deal'),
     path('startups/create/', CreateStartupView.as_view(), name='create_startup'),
     path('investors/create/', CreateInvestorView.as_view(), name='create_investor'),
@@ -1,46 +1,78 @@
+import asyncio
+from urllib.parse import urlsplit
 from django.views.generic import TemplateView, FormView, CreateView, ListView
-from django.utils import translation
 from django.shortcuts import redirect, render
-from django.urls import reverse, reverse_lazy
+from django.urls import reverse, reverse_lazy, translate_url
 from django.conf import settings
 from django.http import HttpRequest, HttpResponse
+from django.utils import translation
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.db.models import QuerySet
 from typing import Any, Dict, Optional
 from . import forms
 from .forms import DealForm, StartupForm, InvestorForm
 from .models import Deal, StartupProfile, User, InvestorProfile
+from .dashboard import load_dashboard, load_recommended_deals
+from .mixins import AsyncListMixin, CursorPaginationMixin, QueryShapingMixin, TagFilterMixin, aresolve_user
+from .page_cache import PageCacheMixin
+from .profiling import timings
+from .ratelimit import RateLimitMixin
+from .search import KINDS, search
+from .stats import aget_homepage_highlights, aget_platform_stats, get_homepage_highlights, get_platform_stats
+from .tasks import send_welcome_email
+from .uploads import attach_uploads
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import redirect_to_login
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import views as auth_views
-from django.utils.translation import get_language
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 
 
-class HomeView(TemplateView):
+class HomeView(PageCacheMixin, TemplateView):
     """Landing page view for the application.
     
     Shows different content based on user type and language:
     - Admins see the admin dashboard
     - Non-admins see the public landing page with platform features
     - Arabic users see the RTL version with Arabic content
+    
+    Attributes:
+        page_cache_group (str): Page cache group invalidated by any profile or deal change
+        query_budget (int): Queries of an anonymous render with cold statistics and top-N caches
+        homepage_data (dict): Statistics and top-N lists preloaded by an async handler
     """
+    page_cache_group: str = 'home'
+    query_budget: int = 7  # Four statistics and three top-N lists; none once cached
+    homepage_data: Optional[Dict[str, Any]] = None
+
+    def show_admin_dashboard(self) -> bool:
+        """Return whether the admin dashboard replaces the public landing page.
+
+        Returns:
+            bool: True for staff users
+        """
+        return self.request.user.is_authenticated and self.request.user.is_staff
+
+    def get_homepage_data(self) -> Dict[str, Any]:
+        """Return the statistics and top-N lists for the landing page.
+
+        Returns:
+            Dict[str, Any]: ``stats`` plus the lists from ``get_homepage_highlights``
+        """
+        if self.homepage_data is not None:
+            return self.homepage_data
+        return {'stats': get_platform_stats(), **get_homepage_highlights()}
     
     def get_template_names(self) -> list[str]:
-        """Return different templates based on user type and language.
+        """Return the admin dashboard for staff, otherwise the landing page.
         
         Returns:
             list[str]: List containing the appropriate template name
         """
-        if self.request.user.is_authenticated and self.request.user.is_staff:
+        if self.show_admin_dashboard():
             return ['home_admin.html']
-        
-        # Use Arabic template if language is Arabic
-        if translation.get_language() == 'ar':
-            return ['home_ar.html']
         return ['home.html']
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
@@ -53,10 +85,14 @@ class HomeView(TemplateView):
             Dict[str, Any]: The enhanced template context
         """
         context = super().get_context_data(**kwargs)
-        
+
+        if self.show_admin_dashboard():
+            context['profiling_enabled'] = settings.PROFILING_ENABLED
+            context['request_timings'] = timings.summary()
+
         # Only add these stats for non-admin view
-        if not (self.request.user.is_authenticated and self.request.user.is_staff):
-            is_arabic = translation.get_language() == 'ar'
+        if not self.show_admin_dashboard():
+            is_arabic = self.request.LANGUAGE_CODE == 'ar'
             
             features = [
                 {
@@ -82,34 +118,14 @@ class HomeView(TemplateView):
             ]
             
             context.update({
-                'stats': {
-                    'startups': StartupProfile.objects.filter(verified=True).count(),
-                    'investors': InvestorProfile.objects.filter(verified=True).count(),
-                    'deals': Deal.objects.filter(status='active').count(),
-                    'total_investment': Deal.objects.filter(status='closed').aggregate(
-                        total=models.Sum('amount_raised')
-                    )['total'] or 0,
-                },
                 'features': features,
-                'recent_deals': Deal.objects.filter(
-                    status='active'
-                ).select_related('startup').order_by('-created_at')[:3],
-                'featured_startups': StartupProfile.objects.filter(
-                    verified=True
-                ).order_by('-total_funding_raised')[:3],
-                'top_investors': InvestorProfile.objects.filter(
-                    verified=True
-                ).order_by('-total_investments')[:3],
+                **self.get_homepage_data(),
             })
-            
-            # Add language switcher context
-            context['languages'] = settings.LANGUAGES
-            context['current_language'] = translation.get_language()
         
         return context
 
 
-class DealsListView(ListView):
+class DealsListView(PageCacheMixin, CursorPaginationMixin, QueryShapingMixin, ListView):
     """View for displaying a paginated list of active investment deals.
     
     Displays investment opportunities in a grid layout with pagination.
@@ -118,24 +134,26 @@ class DealsListView(ListView):
     
     Attributes:
         model (type): The Deal model class
+        template_name (str): Template, in its Arabic variant for Arabic requests
+        page_cache_group (str): Page cache group invalidated by deal and startup changes
         context_object_name (str): Name of the deals list in template context
         paginate_by (int): Number of deals to display per page
         ordering (list): Field(s) to order the deals by
+        select_related (tuple): The startup is joined in for the card subtitle
+        only_fields (tuple): Columns read by the deal cards and their cache keys
     """
     model = Deal
+    template_name: str = 'core/deals_list.html'
+    page_cache_group: str = 'deals'
     context_object_name: str = 'deals'
     paginate_by: int = 9  # Show 9 deals per page (3x3 grid)
     ordering: list[str] = ['-created_at']  # Show newest deals first
-
-    def get_template_names(self) -> list[str]:
-        """Return different templates based on language.
-        
-        Returns:
-            list[str]: List containing the appropriate template name
-        """
-        if translation.get_language() == 'ar':
-            return ['core/deals_list_ar.html']
-        return ['core/deals_list.html']
+    select_related: tuple = ('startup',)
+    only_fields: tuple = (
+        'title', 'description', 'amount', 'amount_raised', 'status', 'created_at', 'updated_at',
+        'startup__company_name', 'startup__updated_at',
+    )
+    query_budget: int = 1  # One page of deals; offset pagination adds a COUNT(*)
 
     def get_queryset(self) -> QuerySet[Deal]:
         """Filter and return the queryset of deals.
@@ -156,41 +174,43 @@ class DealsListView(ListView):
             Dict[str, Any]: The enhanced template context
         """
         context = super().get_context_data(**kwargs)
-        context.update({
-            'current_language': translation.get_language(),
-            'languages': settings.LANGUAGES,
-            'can_create_deal': self.request.user.is_authenticated
-        })
+        context['can_create_deal'] = self.request.user.is_authenticated
         return context
 
 
-class StartupsListView(ListView):
+class StartupsListView(PageCacheMixin, CursorPaginationMixin, TagFilterMixin, QueryShapingMixin, ListView):
     """View for displaying a paginated list of verified startups.
     
     Displays startup profiles in a grid layout with pagination.
     Only shows verified startups and orders them by founding date.
+    Can be narrowed with ``?industry=`` and ``?stage=``.
     Supports both English and Arabic interfaces.
     
     Attributes:
         model (type): The StartupProfile model class
+        template_name (str): Template, in its Arabic variant for Arabic requests
+        page_cache_group (str): Page cache group invalidated by startup changes
         context_object_name (str): Name of the startups list in template context
         paginate_by (int): Number of startups to display per page
         ordering (list): Field(s) to order the startups by
+        select_related (tuple): The user is joined in for the card image
+        only_fields (tuple): Columns read by the startup cards and their cache keys
+        stage_choices (list): Stage options offered by the filter form
     """
     model = StartupProfile
+    template_name: str = 'core/startups_list.html'
+    page_cache_group: str = 'startups'
     context_object_name: str = 'startups'
     paginate_by: int = 9  # Show 9 startups per page (3x3 grid)
     ordering: list[str] = ['-founding_date']  # Show newest startups first
-
-    def get_template_names(self) -> list[str]:
-        """Return different templates based on language.
-        
-        Returns:
-            list[str]: List containing the appropriate template name
-        """
-        if translation.get_language() == 'ar':
-            return ['core/startups_list_ar.html']
-        return ['core/startups_list.html']
+    select_related: tuple = ('user',)
+    only_fields: tuple = (
+        'company_name', 'description', 'industry', 'stage', 'founding_date', 'location',
+        'team_size', 'total_funding_raised', 'website', 'linkedin_url', 'crunchbase_url',
+        'verified', 'updated_at', 'user__profile_image_variants', 'user__updated_at',
+    )
+    query_budget: int = 1  # One page of startups; offset pagination adds a COUNT(*)
+    stage_choices: list = StartupProfile.STAGES
 
     def get_queryset(self) -> QuerySet[StartupProfile]:
         """Filter and return the queryset of startups.
@@ -201,48 +221,41 @@ class StartupsListView(ListView):
         queryset = super().get_queryset()
         return queryset.filter(verified=True)
 
-    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
-        """Enhance the template context with additional data.
-        
-        Args:
-            **kwargs: Additional keyword arguments from the parent class
-            
-        Returns:
-            Dict[str, Any]: The enhanced template context
-        """
-        context = super().get_context_data(**kwargs)
-        context['current_language'] = translation.get_language()
-        context['languages'] = settings.LANGUAGES
-        return context
-
 
-class InvestorsListView(ListView):
+class InvestorsListView(PageCacheMixin, CursorPaginationMixin, TagFilterMixin, QueryShapingMixin, ListView):
     """View for displaying a paginated list of verified investors.
     
     Displays investor profiles and their investment preferences in a grid layout.
     Only shows verified investors and orders them by total investments.
+    Can be narrowed with ``?industry=`` and ``?stage=`` preferences.
     Supports both English and Arabic interfaces.
     
     Attributes:
         model (type): The InvestorProfile model class
+        template_name (str): Template, in its Arabic variant for Arabic requests
+        page_cache_group (str): Page cache group invalidated by investor changes
         context_object_name (str): Name of the investors list in template context
         paginate_by (int): Number of investors to display per page
         ordering (list): Field(s) to order the investors by
+        select_related (tuple): The user is joined in for the card image
+        only_fields (tuple): Columns read by the investor cards and their cache keys
+        stage_choices (list): Stage options offered by the filter form
     """
     model = InvestorProfile
+    template_name: str = 'core/investors_list.html'
+    page_cache_group: str = 'investors'
     context_object_name: str = 'investors'
     paginate_by: int = 9  # Show 9 investors per page (3x3 grid)
     ordering: list[str] = ['-total_investments']  # Show most active investors first
-
-    def get_template_names(self) -> list[str]:
-        """Return different templates based on language.
-        
-        Returns:
-            list[str]: List containing the appropriate template name
-        """
-        if translation.get_language() == 'ar':
-            return ['core/investors_list_ar.html']
-        return ['core/investors_list.html']
+    select_related: tuple = ('user',)
+    only_fields: tuple = (
+        'company_name', 'description', 'location', 'preferred_industries', 'preferred_stages',
+        'investment_range_min', 'investment_range_max', 'total_investments', 'website',
+        'linkedin_url', 'crunchbase_url', 'verified', 'updated_at', 'user__profile_image_variants',
+        'user__updated_at',
+    )
+    query_budget: int = 1  # One page of investors; offset pagination adds a COUNT(*)
+    stage_choices: list = InvestorProfile.INVESTMENT_STAGES
 
     def get_queryset(self) -> QuerySet[InvestorProfile]:
         """Filter and return the queryset of investors.
@@ -253,80 +266,124 @@ class InvestorsListView(ListView):
         queryset = super().get_queryset()
         return queryset.filter(verified=True)
 
+
+class SearchView(TemplateView):
+    """Full-text search over verified startups and active deals.
+
+    Matches ``?q=`` in Arabic or English against the search index and shows
+    the results best match first. ``?type=startup`` or ``?type=deal``
+    restricts the search to one kind.
+
+    Attributes:
+        template_name (str): Template, in its Arabic variant for Arabic requests
+        results_limit (int): Maximum number of results shown
+    """
+    template_name: str = 'core/search.html'
+    results_limit: int = 50
+
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
-        """Enhance the template context with additional data.
-        
+        """Run the search and add the ranked results to the context.
+
         Args:
             **kwargs: Additional keyword arguments from the parent class
-            
+
         Returns:
             Dict[str, Any]: The enhanced template context
         """
         context = super().get_context_data(**kwargs)
-        context['current_language'] = translation.get_language()
-        context['languages'] = settings.LANGUAGES
+        query = self.request.GET.get('q', '').strip()[:200]
+        kind = self.request.GET.get('type', '')
+        kinds = [kind] if kind in KINDS else None
+        context.update({
+            'query': query,
+            'search_type': kind if kinds else '',
+            'results': search(query, kinds, limit=self.results_limit) if query else [],
+        })
         return context
 
 
+class AsyncHomeView(HomeView):
+    """``HomeView`` with an async handler for the ASGI deployment.
+
+    The statistics and top-N lists are loaded with the async ORM, their
+    queries gathered concurrently when the cache needs refilling.
+    """
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        """Load the landing page data asynchronously, then render it.
+
+        Args:
+            request (HttpRequest): The HTTP request object
+            *args: Positional arguments from the URL
+            **kwargs: Keyword arguments from the URL
+
+        Returns:
+            HttpResponse: The rendered landing page
+        """
+        await aresolve_user(request)
+        if not self.show_admin_dashboard():
+            stats, highlights = await asyncio.gather(aget_platform_stats(), aget_homepage_highlights())
+            self.homepage_data = {'stats': stats, **highlights}
+        return self.render_to_response(self.get_context_data(**kwargs))
+
+
+class AsyncDealsListView(AsyncListMixin, DealsListView):
+    """``DealsListView`` with an async handler for the ASGI deployment."""
+
+
+class AsyncStartupsListView(AsyncListMixin, StartupsListView):
+    """``StartupsListView`` with an async handler for the ASGI deployment."""
+
+
+class AsyncInvestorsListView(AsyncListMixin, InvestorsListView):
+    """``InvestorsListView`` with an async handler for the ASGI deployment."""
+
+
 def set_language(request: HttpRequest) -> HttpResponse:
-    """Handle language switching for internationalization.
+    """Redirect to the previous page in another language.
     
-    Sets the user's preferred language and redirects back to the previous page.
-    Supports switching between English and Arabic interfaces.
+    The language switcher links to the translated URL directly; this view
+    serves older links. It redirects once, straight to ``next`` (or the
+    referring page) under the ``lang`` prefix, and never off-site.
     
     Args:
         request (HttpRequest): The HTTP request object
         
     Returns:
-        HttpResponse: Redirect response to the previous page or home
+        HttpResponse: Redirect response to the translated page
     """
     lang = request.GET.get('lang', settings.LANGUAGE_CODE)
     next_url = request.GET.get('next', request.META.get('HTTP_REFERER', '/'))
-    
-    if lang in dict(settings.LANGUAGES):
-        if next_url == '/':
-            next_url = '/{}/'.format(lang)
-            
-        translation.activate(lang)
-        response = redirect(next_url)
-        response.set_cookie(
-            settings.LANGUAGE_COOKIE_NAME, 
-            lang,
-            max_age=settings.LANGUAGE_COOKIE_AGE,
-            path=settings.LANGUAGE_COOKIE_PATH,
-            domain=settings.LANGUAGE_COOKIE_DOMAIN,
-            secure=settings.LANGUAGE_COOKIE_SECURE or None,
-            httponly=settings.LANGUAGE_COOKIE_HTTPONLY,
-            samesite=settings.LANGUAGE_COOKIE_SAMESITE,
-        )
-        return response
-        
-    return redirect('/')
-
-
-class SignupView(FormView):
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()},
+                                           require_https=request.is_secure()):
+        next_url = '/'
+    if lang not in dict(settings.LANGUAGES):
+        lang = settings.LANGUAGE_CODE
+    # translate_url resolves next_url in the active language, which has to
+    # be next_url's own for its prefix (or lack of one) to resolve.
+    with translation.override(translation.get_language_from_path(urlsplit(next_url).path) or settings.LANGUAGE_CODE):
+        return redirect(translate_url(next_url, lang))
+
+
+class SignupView(RateLimitMixin, FormView):
     """View for handling user registration.
     
     Manages the signup process for new users with different account types
     (investor, startup, individual). Supports both English and Arabic interfaces.
+    Signup attempts are throttled per IP and email (``RATE_LIMITS['signup']``).
     
     Attributes:
         form_class (type): The form class for user registration
+        template_name (str): Template, in its Arabic variant for Arabic requests
         success_url (str): URL to redirect to after successful registration
+        rate_limit_scope (str): Key into ``RATE_LIMITS``
     """
     form_class = forms.SignupForm
+    template_name: str = 'core/signup.html'
+    rate_limit_scope: str = 'signup'
     success_url: str = reverse_lazy('core:dashboard')
 
-    def get_template_names(self) -> list[str]:
-        """Return different templates based on language.
-        
-        Returns:
-            list[str]: List containing the appropriate template name
-        """
-        if translation.get_language() == 'ar':
-            return ['core/signup_ar.html']
-        return ['core/signup.html']
-
+    @transaction.atomic
     def form_valid(self, form: forms.SignupForm) -> HttpResponse:
         """Process the valid form submission.
         
@@ -346,15 +403,16 @@ class SignupView(FormView):
         # Log the user in
         from django.contrib.auth import login
         login(self.request, user)
+        send_welcome_email.defer(user_id=user.pk, language=self.request.LANGUAGE_CODE)
         
         messages.success(
             self.request,
-            _('تم إنشاء حسابك بنجاح!') if translation.get_language() == 'ar' else _('Your account has been created successfully!')
+            _('تم إنشاء حسابك بنجاح!') if self.request.LANGUAGE_CODE == 'ar' else _('Your account has been created successfully!')
         )
         return super().form_valid(form)
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
-        """Enhance the template context with user type and language information.
+        """Enhance the template context with the account type being signed up.
         
         Args:
             **kwargs: Additional keyword arguments from the parent class
@@ -364,19 +422,18 @@ class SignupView(FormView):
         """
         context = super().get_context_data(**kwargs)
         user_type = self.request.GET.get('type', 'investor')
-        context.update({
-            'user_type': user_type,
-            'current_language': translation.get_language(),
-            'languages': settings.LANGUAGES
-        })
+        context['user_type'] = user_type
         return context
 
 
 @login_required(login_url='admin:login')
 def dashboard(request: HttpRequest) -> HttpResponse:
-    """View for user dashboard displaying associated companies.
+    """View for the user's dashboard.
     
-    Shows companies (startups/investment firms) associated with the logged-in user.
+    Shows the user's startup with its deals and their progress, or their
+    investment firm with the deals they are interested in and committed to,
+    and the active deals matching its preferences best. The data comes from
+    ``load_dashboard``, cached per user, and ``load_recommended_deals``.
     Supports both English and Arabic interfaces.
     
     Args:
@@ -385,36 +442,10 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     Returns:
         HttpResponse: Rendered dashboard template with context
     """
-    user_companies: list[dict] = []
-    
-    try:
-        if hasattr(request.user, 'startup'):
-            user_companies.append({
-                'name': request.user.startup.company_name,
-                'type': 'startup',
-                'id': request.user.startup.id
-            })
-    except:
-        pass
-    
-    try:
-        if hasattr(request.user, 'investor'):
-            user_companies.append({
-                'name': request.user.investor.company_name,
-                'type': 'investor',
-                'id': request.user.investor.id
-            })
-    except:
-        pass
-    
-    context = {
-        'user_companies': user_companies,
-        'current_language': translation.get_language(),
-        'languages': settings.LANGUAGES
-    }
-    
-    template_name = 'core/dashboard_ar.html' if translation.get_language() == 'ar' else 'core/dashboard.html'
-    return render(request, template_name, context)
+    context = load_dashboard(request.user)
+    if context['investor']:
+        context = {**context, 'recommended_deals': load_recommended_deals(context['investor'])}
+    return render(request, 'core/dashboard.html', context)
 
 
 class CreateDealView(LoginRequiredMixin, CreateView):
@@ -426,20 +457,12 @@ class CreateDealView(LoginRequiredMixin, CreateView):
     Attributes:
         login_url (str): URL to redirect to if user is not authenticated
         form_class (type): The form class for deal creation
+        template_name (str): Template, in its Arabic variant for Arabic requests
     """
     login_url: str = 'core:signup'
     form_class = DealForm
+    template_name: str = 'core/create_deal.html'
     
-    def get_template_names(self) -> list[str]:
-        """Return different templates based on language.
-        
-        Returns:
-            list[str]: List containing the appropriate template name
-        """
-        if translation.get_language() == 'ar':
-            return ['core/create_deal_ar.html']
-        return ['core/create_deal.html']
-
     def get_success_url(self) -> str:
         """Get the URL to redirect to after successful deal creation.
         
@@ -448,6 +471,17 @@ class CreateDealView(LoginRequiredMixin, CreateView):
         """
         return reverse_lazy('core:deals_list')
 
+    def get_form_kwargs(self) -> Dict[str, Any]:
+        """Pass the current user to the form, which may only attach their own uploads.
+        
+        Returns:
+            Dict[str, Any]: Keyword arguments for the form
+        """
+        kwargs = super().get_form_kwargs()
+        kwargs['user'] = self.request.user
+        return kwargs
+
+    @transaction.atomic
     def form_valid(self, form: DealForm) -> HttpResponse:
         """Process the valid form submission.
         
@@ -461,33 +495,21 @@ class CreateDealView(LoginRequiredMixin, CreateView):
         """
         form.instance.creator = self.request.user
         try:
-            form.instance.startup = self.request.user.startup
+            form.instance.startup = self.request.user.startup_profile
         except StartupProfile.DoesNotExist:
             messages.error(
                 self.request,
-                _('يجب عليك إنشاء ملف شركتك الناشئة أولاً.') if translation.get_language() == 'ar' else _('You need to create your startup profile first.')
+                _('يجب عليك إنشاء ملف شركتك الناشئة أولاً.') if self.request.LANGUAGE_CODE == 'ar' else _('You need to create your startup profile first.')
             )
             return redirect('core:create_startup')
             
         messages.success(
             self.request, 
-            _('تم إنشاء الفرصة الاستثمارية بنجاح!') if translation.get_language() == 'ar' else _('Deal created successfully!')
+            _('تم إنشاء الفرصة الاستثمارية بنجاح!') if self.request.LANGUAGE_CODE == 'ar' else _('Deal created successfully!')
         )
-        return super().form_valid(form)
-
-    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
-        """Enhance the template context with language information.
-        
-        Args:
-            **kwargs: Additional keyword arguments from the parent class
-            
-        Returns:
-            Dict[str, Any]: The enhanced template context
-        """
-        context = super().get_context_data(**kwargs)
-        context['current_language'] = translation.get_language()
-        context['languages'] = settings.LANGUAGES
-        return context
+        response = super().form_valid(form)
+        attach_uploads(form, self.object, 'core.Deal')
+        return response
 
 
 class CreateStartupView(LoginRequiredMixin, CreateView):
@@ -499,8 +521,10 @@ class CreateStartupView(LoginRequiredMixin, CreateView):
     Attributes:
         login_url (str): URL to redirect to if user is not authenticated
         form_class (type): The form class for startup profile creation
+        template_name (str): Template, in its Arabic variant for Arabic requests
     """
     form_class = StartupForm
+    template_name: str = 'core/create_startup.html'
     
     def get_login_url(self) -> str:
         """Get the URL to redirect to when user is not authenticated.
@@ -510,16 +534,6 @@ class CreateStartupView(LoginRequiredMixin, CreateView):
         """
         return reverse_lazy('core:signup') + '?type=startup'
 
-    def get_template_names(self) -> list[str]:
-        """Return different templates based on language.
-        
-        Returns:
-            list[str]: List containing the appropriate template name
-        """
-        if translation.get_language() == 'ar':
-            return ['core/create_startup_ar.html']
-        return ['core/create_startup.html']
-
     def get_success_url(self) -> str:
         """Get the URL to redirect to after successful profile creation.
         
@@ -528,6 +542,17 @@ class CreateStartupView(LoginRequiredMixin, CreateView):
         """
         return reverse_lazy('core:dashboard')
 
+    def get_form_kwargs(self) -> Dict[str, Any]:
+        """Pass the current user to the form, which may only attach their own uploads.
+        
+        Returns:
+            Dict[str, Any]: Keyword arguments for the form
+        """
+        kwargs = super().get_form_kwargs()
+        kwargs['user'] = self.request.user
+        return kwargs
+
+    @transaction.atomic
     def form_valid(self, form: StartupForm) -> HttpResponse:
         """Process the valid form submission.
         
@@ -542,23 +567,11 @@ class CreateStartupView(LoginRequiredMixin, CreateView):
         form.instance.user = self.request.user
         messages.success(
             self.request, 
-            _('تم تسجيل الشركة الناشئة بنجاح!') if translation.get_language() == 'ar' else _('Startup registered successfully!')
+            _('تم تسجيل الشركة الناشئة بنجاح!') if self.request.LANGUAGE_CODE == 'ar' else _('Startup registered successfully!')
         )
-        return super().form_valid(form)
-
-    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
-        """Enhance the template context with language information.
-        
-        Args:
-            **kwargs: Additional keyword arguments from the parent class
-            
-        Returns:
-            Dict[str, Any]: The enhanced template context
-        """
-        context = super().get_context_data(**kwargs)
-        context['current_language'] = translation.get_language()
-        context['languages'] = settings.LANGUAGES
-        return context
+        response = super().form_valid(form)
+        attach_uploads(form, self.object, 'core.StartupProfile')
+        return response
 
 
 class CreateInvestorView(LoginRequiredMixin, CreateView):
@@ -570,8 +583,10 @@ class CreateInvestorView(LoginRequiredMixin, CreateView):
     Attributes:
         login_url (str): URL to redirect to if user is not authenticated
         form_class (type): The form class for investor profile creation
+        template_name (str): Template, in its Arabic variant for Arabic requests
     """
     form_class = InvestorForm
+    template_name: str = 'core/create_investor.html'
     
     def get_login_url(self) -> str:
         """Get the URL to redirect to when user is not authenticated.
@@ -581,16 +596,6 @@ class CreateInvestorView(LoginRequiredMixin, CreateView):
         """
         return reverse_lazy('core:signup') + '?type=investor'
 
-    def get_template_names(self) -> list[str]:
-        """Return different templates based on language.
-        
-        Returns:
-            list[str]: List containing the appropriate template name
-        """
-        if translation.get_language() == 'ar':
-            return ['core/create_investor_ar.html']
-        return ['core/create_investor.html']
-
     def get_success_url(self) -> str:
         """Get the URL to redirect to after successful profile creation.
         
@@ -599,6 +604,7 @@ class CreateInvestorView(LoginRequiredMixin, CreateView):
         """
         return reverse_lazy('core:dashboard')
 
+    @transaction.atomic
     def form_valid(self, form: InvestorForm) -> HttpResponse:
         """Process the valid form submission.
         
@@ -613,32 +619,18 @@ class CreateInvestorView(LoginRequiredMixin, CreateView):
         form.instance.user = self.request.user
         messages.success(
             self.request, 
-            _('تم تسجيل المستثمر بنجاح!') if translation.get_language() == 'ar' else _('Investment firm registered successfully!')
+            _('تم تسجيل المستثمر بنجاح!') if self.request.LANGUAGE_CODE == 'ar' else _('Investment firm registered successfully!')
         )
         return super().form_valid(form)
 
-    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
-        """Enhance the template context with language information.
-        
-        Args:
-            **kwargs: Additional keyword arguments from the parent class
-            
-        Returns:
-            Dict[str, Any]: The enhanced template context
-        """
-        context = super().get_context_data(**kwargs)
-        context['current_language'] = translation.get_language()
-        context['languages'] = settings.LANGUAGES
-        return context 
-
 
-class LoginView(auth_views.LoginView):
+class LoginView(RateLimitMixin, auth_views.LoginView):
     """
     Custom login view that extends Django's built-in LoginView.
     Handles user authentication and provides language-specific templates.
+    Login attempts are throttled per IP and email (``RATE_LIMITS['login']``)
+    before the password is checked.
     """
-    def get_template_names(self):
-        """Return the appropriate template based on the current language."""
-        if get_language() == 'ar':
-            return ['core/login_ar.html']
-        return ['core/login.html'] 
\ No newline at end of file
+    template_name: str = 'core/login.html'
+    rate_limit_scope: str = 'login'
+    rate_limit_email_field: str = 'username'
@@ -1,15 +1,22 @@
+import importlib.util
 import os
+from dotenv import load_dotenv
 from pathlib import Path
 from django.utils.translation import gettext_lazy as _
+from .database import SQLITE_PRAGMAS, database_config, replica_databases
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Environment variables may also come from a .env file in the project root;
+# variables already set in the environment win.
+load_dotenv(BASE_DIR / '.env')
+
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-your-secret-key-here'
+SECRET_KEY = os.environ.get('SECRET_KEY', 'django-insecure-your-secret-key-here')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get('DEBUG', 'True').lower() in ('1', 'true', 'yes')
 
 ALLOWED_HOSTS = []
 
@@ -34,15 +41,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.core.profiling.ProfilingMiddleware',
+    'apps.core.routers.ReplicaPinningMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'apps.core.i18n.LanguageMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'django.middleware.locale.LocaleMiddleware',
 ]
 
 ROOT_URLCONF = 'raya.urls'
@@ -51,13 +60,24 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compile each template once per process. In development
+            # runserver's autoreloader clears the cache when a template
+            # changes; elsewhere a deploy restarts the workers. The loader
+            # also swaps in the active language's variant of a template
+            # (name_ar.html for name.html), see apps/core/i18n.py.
+            'loaders': [
+                ('apps.core.i18n.VariantLoader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'apps.core.i18n.language',
             ],
         },
     },
@@ -65,13 +85,22 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'raya.wsgi.application'
 
+# Database: DATABASE_URL plus the DB_* variables, see raya/database.py.
+# Defaults to SQLite in the project directory, whose connections get the
+# SQLITE_PRAGMAS imported above.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3'), BASE_DIR),
+    **replica_databases(os.environ.get('DATABASE_REPLICA_URLS', ''), BASE_DIR),
 }
 
+# Read replicas (apps/core/routers.py): reads in GET/HEAD requests go to the
+# replicas except for the models below and for clients that wrote in the
+# last REPLICA_STICKY_SECONDS; everything else goes to the primary.
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['apps.core.routers.ReplicaRouter']
+PRIMARY_ONLY_MODELS = ('sessions.session', 'core.user', 'core.job', 'core.uploadsession')
+REPLICA_STICKY_SECONDS = 15
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -87,6 +116,35 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing (apps/core/hashers.py). PASSWORD_HASHER picks the
+# algorithm for new passwords: argon2 (needs argon2-cffi), scrypt or
+# pbkdf2. The others stay listed so existing hashes still verify, and are
+# replaced with the preferred algorithm and costs on the next login.
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'argon2' if importlib.util.find_spec('argon2') else 'scrypt')
+_PASSWORD_HASHERS = {
+    'argon2': 'apps.core.hashers.Argon2PasswordHasher',
+    'scrypt': 'apps.core.hashers.ScryptPasswordHasher',
+    'pbkdf2': 'apps.core.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHERS[PASSWORD_HASHER],
+    *(path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER),
+]
+# About 20-70 ms per hash instead of PBKDF2's 300 ms: OWASP's minimums for
+# Argon2id (19 MiB, 2 passes) and scrypt (N=2^14, r=8, 16 MiB).
+PASSWORD_HASHER_PARAMS = {
+    'argon2': {'time_cost': 2, 'memory_cost': 19 * 1024, 'parallelism': 1},
+    'scrypt': {'work_factor': 2 ** 14, 'block_size': 8, 'parallelism': 1},
+}
+
+# Login and signup throttling (apps/core/ratelimit.py): (attempts, window in
+# seconds) per client IP and per submitted email, counted in the default
+# cache, which has to be shared between workers in production.
+RATE_LIMITS = {
+    'login': {'ip': (20, 60), 'email': (10, 5 * 60)},
+    'signup': {'ip': (10, 60), 'email': (3, 60 * 60)},
+}
+
 LANGUAGE_CODE = 'en'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -96,11 +154,139 @@ STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 
+# `manage.py build_assets` vendors Bootstrap, Font Awesome and Tajawal into
+# static/vendor; collectstatic then writes content-hashed copies with
+# .gz/.br siblings. SERVE_STATIC makes Django serve STATIC_ROOT itself,
+# with far-future caching, when no front-end server does.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+        else 'apps.core.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+SERVE_STATIC = os.environ.get('SERVE_STATIC', '0') == '1'
+
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Caching. Local memory is per process; point this at a shared backend
+# (Redis/Memcached) in production so all workers see the same entries.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'raya-default',
+    },
+    # Rendered list cards ({% cache %} fragments). Keys embed the objects'
+    # updated_at, so edits never need invalidating; old entries are culled.
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'raya-fragments',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    # Session data for the cache-backed session engines below. Local memory
+    # is private to each process; SESSION_CACHE_DIR switches to a file cache
+    # that worker processes on one host share.
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ['SESSION_CACHE_DIR'],
+    } if os.environ.get('SESSION_CACHE_DIR') else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'raya-sessions',
+    },
+}
+
+# Sessions: SESSION_BACKEND picks the engine. 'cached_db' reads sessions
+# from the 'sessions' cache and only falls back to the database on a miss,
+# 'signed_cookies' keeps them in the client's cookie with no server-side
+# storage, 'cache' and 'db' use one of the two alone ('cache' loses sessions
+# with a local-memory cache across processes). Expired database rows are
+# removed by `manage.py purge_sessions`.
+_SESSION_ENGINES = {
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'db': 'django.contrib.sessions.backends.db',
+}
+SESSION_ENGINE = _SESSION_ENGINES[os.environ.get('SESSION_BACKEND', 'cached_db')]
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Homepage statistics: seconds before a cached value is recomputed, and how
+# long a single worker may hold the recompute lock.
+PLATFORM_STATS_TTL = 60
+PLATFORM_STATS_LOCK_TIMEOUT = 30
+
+# Full-page cache for anonymous visitors to the home and list pages
+PAGE_CACHE_ENABLED = True
+PAGE_CACHE_TIMEOUT = 300
+
+# Per-user dashboard data (apps/core/dashboard.py): seconds to keep it
+# cached, and the most deals shown per list.
+DASHBOARD_CACHE_TIMEOUT = 10 * 60
+DASHBOARD_LIST_LIMIT = 20
+
+# Per-request profiling (apps/core/profiling.py): Server-Timing headers, a
+# JSON log line per request, and percentiles of the last PROFILING_WINDOW
+# requests per URL name on the admin home page and at /profiling/.
+PROFILING_ENABLED = os.environ.get('PROFILING', '0') == '1'
+PROFILING_WINDOW = 1000
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'apps.core.profiling': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Investor/deal matching: results kept per investor/deal, and how long the
+# encoded match index lives before a full rebuild from the database.
+MATCHING_RESULTS_LIMIT = 20
+MATCHING_INDEX_TTL = 60 * 60
+MATCHING_LOCK_TIMEOUT = 30
+
+# List pagination: 'cursor' (keyset, no COUNT/OFFSET) or 'offset' (numbered pages)
+LIST_PAGINATION_MODE = 'cursor'
+
+# Serve the home page and listings with async views. raya/asgi.py turns
+# this on; keep it off under WSGI, where each async view adds a thread hop.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', '0') == '1'
+
+# Background jobs (apps.core.jobs). 'thread' runs queued jobs in a daemon
+# thread of the web process, 'worker' leaves them to `manage.py run_jobs`
+# and 'immediate' runs them inline after commit (tests). A separate worker
+# process needs the shared cache above to refresh what the web serves.
+JOBS_MODE = os.environ.get('JOBS_MODE', 'thread')
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_DELAY = 10  # seconds before the first retry, doubled per attempt
+JOBS_MAX_RETRY_DELAY = 60 * 60
+JOBS_LOCK_TIMEOUT = 10 * 60  # running jobs older than this are requeued
+JOBS_POLL_INTERVAL = 5
+
+# Uploaded documents must be PDFs under this size; checked in the background
+DOCUMENT_MAX_SIZE = 20 * 1024 * 1024
+
+# Chunked uploads (apps.core.uploads): partial files live outside MEDIA_ROOT
+# and uploads not finished or attached within UPLOAD_SESSION_TTL seconds are
+# removed by `manage.py purge_uploads`.
+UPLOAD_TEMP_DIR = BASE_DIR / 'uploads_tmp'
+UPLOAD_CHUNK_MAX_SIZE = 8 * 1024 * 1024
+UPLOAD_SESSION_TTL = 24 * 60 * 60
+
+# How /media/ files are sent: 'django' streams them (with Range support),
+# 'x-sendfile' (Apache/Lighttpd) or 'x-accel-redirect' (nginx, internal
+# location at MEDIA_ACCEL_REDIRECT_PREFIX) hand the file to the web server.
+MEDIA_SERVE_MODE = os.environ.get('MEDIA_SERVE_MODE', 'django')
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'Raya <no-reply@raya.local>')
+
 # Crispy Forms
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
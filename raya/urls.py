@@ -1,15 +1,22 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns
+from apps.core.assets import serve_static
+from apps.core.profiling import profiling_stats
+from apps.core.uploads import serve_media
 
 # Non-prefixed URLs
 urlpatterns = [
-    path('i18n/', include('django.conf.urls.i18n')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path('api/', include('apps.core.api')),
+    path('uploads/', include('apps.core.uploads')),
+    path(f'{settings.MEDIA_URL.strip("/")}/<path:path>', serve_media, name='media'),
+    path('profiling/', profiling_stats, name='profiling'),
+]
+if settings.SERVE_STATIC:
+    urlpatterns.append(path(f'{settings.STATIC_URL.strip("/")}/<path:path>', serve_static, name='static'))
 
-# URLs with language prefix
+# URLs with a language prefix, except for LANGUAGE_CODE (see apps/core/i18n.py)
 urlpatterns += i18n_patterns(
     path('admin/', admin.site.urls),
     path('', include('apps.core.urls')),
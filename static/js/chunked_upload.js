@@ -0,0 +1,112 @@
+/*
+ * Resumable chunked uploads for document fields.
+ *
+ * File inputs marked with data-chunked-upload are sent to the upload
+ * endpoint in chunks before the form is submitted; the form then carries
+ * only the upload id in the hidden "<field>_upload" input. A failed chunk
+ * is retried from the offset the server reports.
+ */
+(function () {
+    'use strict';
+
+    var CHUNK_SIZE = 4 * 1024 * 1024;
+    var MAX_RETRIES = 5;
+
+    function csrfToken(form) {
+        var input = form.querySelector('[name=csrfmiddlewaretoken]');
+        return input ? input.value : '';
+    }
+
+    function request(method, url, token, body, headers) {
+        headers = Object.assign({'X-CSRFToken': token}, headers || {});
+        return fetch(url, {method: method, body: body, headers: headers, credentials: 'same-origin'})
+            .then(function (response) {
+                return response.json().then(function (data) {
+                    data.status = response.status;
+                    return data;
+                });
+            });
+    }
+
+    function sendChunks(upload, file, url, token, progress, retries) {
+        if (upload.complete) {
+            return Promise.resolve(upload);
+        }
+        var chunk = file.slice(upload.offset, upload.offset + CHUNK_SIZE);
+        return request('PUT', url, token, chunk, {
+            'Content-Type': 'application/octet-stream',
+            'Upload-Offset': String(upload.offset)
+        }).then(function (state) {
+            if (state.status === 409) {
+                upload.offset = state.offset;
+            } else if (state.status !== 200) {
+                throw new Error(state.error || 'Upload failed');
+            } else {
+                upload = state;
+                retries = 0;
+            }
+            progress(upload.offset / file.size);
+            return sendChunks(upload, file, url, token, progress, retries);
+        }, function () {
+            if (retries >= MAX_RETRIES) {
+                throw new Error('Upload interrupted');
+            }
+            // Ask the server how far the upload got, then carry on from there.
+            return new Promise(function (resolve) { setTimeout(resolve, 1000 * Math.pow(2, retries)); })
+                .then(function () { return request('GET', url, token); })
+                .then(function (state) {
+                    return sendChunks(state, file, url, token, progress, retries + 1);
+                }, function () {
+                    return sendChunks(upload, file, url, token, progress, retries + 1);
+                });
+        });
+    }
+
+    function uploadFile(input, token) {
+        var file = input.files[0];
+        var status = input.parentNode.querySelector('.chunked-upload-status');
+        if (!status) {
+            status = document.createElement('div');
+            status.className = 'chunked-upload-status form-text';
+            input.parentNode.appendChild(status);
+        }
+        var body = new FormData();
+        body.append('filename', file.name);
+        body.append('size', file.size);
+        return request('POST', input.dataset.chunkedUpload, token, body).then(function (upload) {
+            if (upload.status !== 201) {
+                throw new Error(upload.error || 'Upload failed');
+            }
+            var url = input.dataset.chunkedUpload + upload.id + '/';
+            return sendChunks(upload, file, url, token, function (done) {
+                status.textContent = Math.floor(done * 100) + '%';
+            }, 0);
+        }).then(function (upload) {
+            input.form.querySelector('[name="' + input.name + '_upload"]').value = upload.id;
+            input.value = '';
+        }, function (error) {
+            status.textContent = error.message;
+            status.classList.add('text-danger');
+            throw error;
+        });
+    }
+
+    document.querySelectorAll('form').forEach(function (form) {
+        var inputs = form.querySelectorAll('input[type=file][data-chunked-upload]');
+        if (!inputs.length) {
+            return;
+        }
+        form.addEventListener('submit', function (event) {
+            var pending = Array.prototype.filter.call(inputs, function (input) {
+                return input.files.length;
+            });
+            if (!pending.length) {
+                return;
+            }
+            event.preventDefault();
+            var token = csrfToken(form);
+            Promise.all(pending.map(function (input) { return uploadFile(input, token); }))
+                .then(function () { form.submit(); }, function () {});
+        });
+    });
+})();